@@ -0,0 +1,278 @@
+import asyncio
+import logging
+import time
+import uuid
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import AsyncIterator, Hashable
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, status_code: int, detail: str, retry_after: int):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+class _KeySlot:
+    __slots__ = ("semaphore", "users")
+
+    def __init__(self, limit: int):
+        self.semaphore = asyncio.Semaphore(limit)
+        self.users = 0
+
+
+class RedisConcurrencyLimiter:
+    """Caps concurrent holders of a key across API processes.
+
+    Each holder adds a lease to a sorted set scored by its expiry, so leases
+    of crashed processes age out instead of blocking the key forever.
+    """
+
+    _ACQUIRE = """
+    redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[1])
+    if redis.call('ZCARD', KEYS[1]) >= tonumber(ARGV[3]) then
+        return 0
+    end
+    redis.call('ZADD', KEYS[1], ARGV[2], ARGV[4])
+    redis.call('PEXPIRE', KEYS[1], ARGV[5])
+    return 1
+    """
+
+    def __init__(
+        self, url: str, limit: int, lease_ttl: float, prefix: str = "admission"
+    ):
+        self.url = url
+        self.limit = limit
+        self.lease_ttl = lease_ttl
+        self.prefix = prefix
+        self._client = None
+        self._script = None
+
+    def _redis(self):
+        if self._client is None:
+            # Imported lazily: redis is not a dependency of the API otherwise
+            import redis.asyncio as redis
+
+            self._client = redis.Redis.from_url(self.url)
+            self._script = self._client.register_script(self._ACQUIRE)
+        return self._client
+
+    def _key(self, key: Hashable) -> str:
+        return f"{self.prefix}:{key}"
+
+    async def acquire(self, key: Hashable) -> str | None:
+        self._redis()
+        now = time.time()
+        token = uuid.uuid4().hex
+        acquired = await self._script(
+            keys=[self._key(key)],
+            args=[
+                now,
+                now + self.lease_ttl,
+                self.limit,
+                token,
+                int(self.lease_ttl * 1000),
+            ],
+        )
+        return token if acquired else None
+
+    async def release(self, key: Hashable, token: str) -> None:
+        await self._redis().zrem(self._key(key), token)
+
+
+class AdmissionController:
+    """Admits write requests before they take a database connection.
+
+    Requests for the same key (a property) queue on a per-key semaphore with
+    a bounded number of waiters, then on a global cap of concurrent write
+    transactions. Whatever cannot get in within ``queue_timeout`` is turned
+    away so a single hot key cannot drain the connection pool.
+    """
+
+    def __init__(
+        self,
+        per_key_limit: int,
+        max_waiters: int,
+        global_limit: int,
+        queue_timeout: float,
+        retry_after: int = 1,
+        limiter: RedisConcurrencyLimiter | None = None,
+    ):
+        self.per_key_limit = per_key_limit
+        self.max_waiters = max_waiters
+        self.global_limit = global_limit
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self.limiter = limiter
+
+        self._keys: dict[Hashable, _KeySlot] = {}
+        self._global: asyncio.Semaphore | None = None
+        self._active = 0
+        self._admitted = 0
+        self._rejected_key = 0
+        self._rejected_global = 0
+        self._rejected_distributed = 0
+
+    def _global_semaphore(self) -> asyncio.Semaphore:
+        if self._global is None:
+            self._global = asyncio.Semaphore(self.global_limit)
+        return self._global
+
+    def _reject(self, status_code: int, detail: str) -> AdmissionRejected:
+        return AdmissionRejected(status_code, detail, self.retry_after)
+
+    async def _acquire(self, semaphore: asyncio.Semaphore) -> bool:
+        if not semaphore.locked():
+            await semaphore.acquire()
+            return True
+        try:
+            await asyncio.wait_for(semaphore.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    @asynccontextmanager
+    async def _key_slot(self, key: Hashable | None) -> AsyncIterator[None]:
+        if key is None:
+            yield
+            return
+
+        slot = self._keys.get(key)
+        if slot is None:
+            slot = self._keys[key] = _KeySlot(self.per_key_limit)
+        if slot.users >= self.per_key_limit + self.max_waiters:
+            self._rejected_key += 1
+            raise self._reject(429, "Too many concurrent requests for this property")
+
+        slot.users += 1
+        try:
+            if not await self._acquire(slot.semaphore):
+                self._rejected_key += 1
+                raise self._reject(
+                    429, "Too many concurrent requests for this property"
+                )
+            try:
+                yield
+            finally:
+                slot.semaphore.release()
+        finally:
+            slot.users -= 1
+            if slot.users == 0:
+                self._keys.pop(key, None)
+
+    @asynccontextmanager
+    async def _distributed_slot(self, key: Hashable | None) -> AsyncIterator[None]:
+        if key is None or self.limiter is None:
+            yield
+            return
+
+        try:
+            token = await self.limiter.acquire(key)
+        except Exception as e:
+            # Fail open: the in-process limits still protect this instance
+            logger.warning(f"Distributed admission limiter unavailable: {e}")
+            yield
+            return
+
+        if token is None:
+            self._rejected_distributed += 1
+            raise self._reject(429, "Too many concurrent requests for this property")
+        try:
+            yield
+        finally:
+            try:
+                await self.limiter.release(key, token)
+            except Exception as e:
+                logger.warning(f"Failed to release admission lease: {e}")
+
+    @asynccontextmanager
+    async def _slots(self, key: Hashable | None) -> AsyncIterator[None]:
+        async with self._key_slot(key), self._distributed_slot(key):
+            semaphore = self._global_semaphore()
+            if not await self._acquire(semaphore):
+                self._rejected_global += 1
+                raise self._reject(503, "Server is busy, retry later")
+
+            self._active += 1
+            self._admitted += 1
+            try:
+                yield
+            finally:
+                self._active -= 1
+                semaphore.release()
+
+    @asynccontextmanager
+    async def admit(self, key: Hashable | None = None) -> AsyncIterator["Admission"]:
+        admission = Admission(self, key)
+        await admission.reacquire()
+        try:
+            yield admission
+        finally:
+            await admission.release()
+
+    def metrics(self) -> dict:
+        return {
+            "active": self._active,
+            "global_limit": self.global_limit,
+            "hot_keys": len(self._keys),
+            "queued": sum(
+                max(slot.users - self.per_key_limit, 0) for slot in self._keys.values()
+            ),
+            "admitted": self._admitted,
+            "rejected_key": self._rejected_key,
+            "rejected_global": self._rejected_global,
+            "rejected_distributed": self._rejected_distributed,
+        }
+
+
+class Admission:
+    """The slots held by an admitted request.
+
+    A request that only waits for another one, such as a retry of an
+    in-flight ``Idempotency-Key``, releases them so it does not crowd out
+    requests that actually write.
+    """
+
+    def __init__(self, controller: AdmissionController, key: Hashable | None):
+        self._controller = controller
+        self._key = key
+        self._slots: AsyncExitStack | None = None
+
+    @property
+    def held(self) -> bool:
+        return self._slots is not None
+
+    async def reacquire(self) -> None:
+        if self._slots is not None:
+            return
+        slots = AsyncExitStack()
+        await slots.enter_async_context(self._controller._slots(self._key))
+        self._slots = slots
+
+    async def release(self) -> None:
+        if self._slots is not None:
+            slots, self._slots = self._slots, None
+            await slots.aclose()
+
+
+admission = AdmissionController(
+    per_key_limit=settings.ADMISSION_PER_PROPERTY_LIMIT,
+    max_waiters=settings.ADMISSION_PER_PROPERTY_QUEUE,
+    global_limit=settings.ADMISSION_GLOBAL_LIMIT,
+    queue_timeout=settings.ADMISSION_QUEUE_TIMEOUT,
+    retry_after=settings.ADMISSION_RETRY_AFTER,
+    limiter=(
+        RedisConcurrencyLimiter(
+            settings.ADMISSION_REDIS_URL,
+            settings.ADMISSION_PER_PROPERTY_LIMIT,
+            settings.ADMISSION_LEASE_TTL,
+        )
+        if settings.ADMISSION_REDIS_URL
+        else None
+    ),
+)
@@ -0,0 +1,63 @@
+from calendar import monthrange
+from datetime import date, timedelta
+
+from app.cache import TTLCache
+from app.changes import ChangeEvent, change_bus
+from app.config import settings
+
+calendar_cache = TTLCache(ttl=settings.CALENDAR_CACHE_TTL)
+
+
+def months_between(start: date, end: date) -> list[tuple[int, int]]:
+    months = []
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        months.append((year, month))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+def month_bounds(year: int, month: int) -> tuple[date, date]:
+    return date(year, month, 1), date(year, month, monthrange(year, month)[1])
+
+
+def month_blocks(year: int, month: int, ranges: list[tuple[date, date]]) -> str:
+    """Bitstring with one character per day of the month, ``1`` when the night
+    of that day is taken by a booking.
+    """
+    first, last = month_bounds(year, month)
+    days = bytearray(b"0" * last.day)
+    for check_in, check_out in ranges:
+        start = max(check_in, first)
+        end = min(check_out - timedelta(days=1), last)
+        if start <= end:
+            days[start.day - 1 : end.day] = b"1" * (end.day - start.day + 1)
+    return days.decode()
+
+
+def blocked_runs(start: date, days: str) -> list[tuple[date, date]]:
+    runs = []
+    run_start = None
+    for offset, flag in enumerate(days + "0"):
+        if flag == "1" and run_start is None:
+            run_start = offset
+        elif flag == "0" and run_start is not None:
+            runs.append(
+                (start + timedelta(days=run_start), start + timedelta(days=offset - 1))
+            )
+            run_start = None
+    return runs
+
+
+def invalidate_calendar(property_id: int, check_in: date, check_out: date) -> None:
+    for month in months_between(check_in, check_out):
+        calendar_cache.delete((property_id, *month))
+
+
+def _evict_calendar(change: ChangeEvent) -> None:
+    if change.check_in is not None and change.check_out is not None:
+        invalidate_calendar(change.property_id, change.check_in, change.check_out)
+
+
+change_bus.subscribe(_evict_calendar)
+change_bus.on_resync(calendar_cache.clear)
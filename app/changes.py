@@ -0,0 +1,248 @@
+import asyncio
+import json
+import logging
+import uuid
+from collections.abc import Callable, Iterable
+from dataclasses import asdict, dataclass
+from datetime import date
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+PENDING_KEY = "pending_changes"
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    """A committed change other processes may have cached state for."""
+
+    kind: str
+    property_id: int
+    booking_id: int | None = None
+    check_in: date | None = None
+    check_out: date | None = None
+    status: str | None = None
+
+    def to_dict(self) -> dict:
+        data = {key: value for key, value in asdict(self).items() if value is not None}
+        for key in ("check_in", "check_out"):
+            if key in data:
+                data[key] = data[key].isoformat()
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ChangeEvent":
+        data = dict(data)
+        for key in ("check_in", "check_out"):
+            if data.get(key) is not None:
+                data[key] = date.fromisoformat(data[key])
+        return cls(**data)
+
+
+def booking_change(kind: str, booking) -> ChangeEvent:
+    return ChangeEvent(
+        kind=kind,
+        property_id=booking.property_id,
+        booking_id=booking.id,
+        check_in=booking.check_in,
+        check_out=booking.check_out,
+    )
+
+
+def property_change(kind: str, property) -> ChangeEvent:
+    return ChangeEvent(kind=kind, property_id=property.id, status=property.status.value)
+
+
+class ChangeBus:
+    """Delivers committed changes to subscribers in this process.
+
+    Handlers are plain callables run synchronously, so a process evicts its
+    own caches before the committing request returns. This base class is the
+    stand-in used in tests and single-process deployments.
+    """
+
+    def __init__(self):
+        self._handlers: list[Callable[[ChangeEvent], None]] = []
+        self._resync_handlers: list[Callable[[], None]] = []
+
+    def subscribe(self, handler: Callable[[ChangeEvent], None]) -> Callable[[], None]:
+        self._handlers.append(handler)
+        return lambda: self._handlers.remove(handler)
+
+    def on_resync(self, handler: Callable[[], None]) -> None:
+        """Register a handler for when changes may have been missed."""
+        self._resync_handlers.append(handler)
+
+    def dispatch(self, events: Iterable[ChangeEvent]) -> None:
+        for change in events:
+            for handler in list(self._handlers):
+                try:
+                    handler(change)
+                except Exception:
+                    logger.exception(f"Change handler failed for {change.kind}")
+
+    def resync(self) -> None:
+        for handler in self._resync_handlers:
+            try:
+                handler()
+            except Exception:
+                logger.exception("Change resync handler failed")
+
+    def emit(self, events: list[ChangeEvent]) -> None:
+        self.dispatch(events)
+        self._forward(events)
+
+    def _forward(self, events: list[ChangeEvent]) -> None:
+        pass
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+
+class RedisChangeBus(ChangeBus):
+    """Shares changes between processes over a Redis pub/sub channel.
+
+    Pub/sub does not buffer for disconnected subscribers, so every
+    (re)subscription triggers a resync: caches are dropped rather than
+    trusted. Processes skip their own messages, having applied them locally.
+    Changes published from Celery workers use a blocking client.
+    """
+
+    RECONNECT_DELAY = 0.5
+    RECONNECT_MAX_DELAY = 30.0
+
+    def __init__(self, url: str, channel: str):
+        super().__init__()
+        self.url = url
+        self.channel = channel
+        self.origin = uuid.uuid4().hex
+        self._client = None
+        self._sync_client = None
+        self._listener: asyncio.Task | None = None
+        self._sends: set[asyncio.Task] = set()
+
+    def _redis(self):
+        if self._client is None:
+            # Imported lazily: redis is not a dependency of the API otherwise
+            import redis.asyncio as redis
+
+            self._client = redis.Redis.from_url(self.url)
+        return self._client
+
+    def _redis_sync(self):
+        if self._sync_client is None:
+            import redis
+
+            self._sync_client = redis.Redis.from_url(self.url)
+        return self._sync_client
+
+    def _payload(self, events: list[ChangeEvent]) -> str:
+        return json.dumps(
+            {"origin": self.origin, "events": [change.to_dict() for change in events]}
+        )
+
+    def _forward(self, events: list[ChangeEvent]) -> None:
+        payload = self._payload(events)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            try:
+                self._redis_sync().publish(self.channel, payload)
+            except Exception as e:
+                logger.warning(f"Failed to publish changes: {e}")
+            return
+        task = loop.create_task(self._publish(payload))
+        self._sends.add(task)
+        task.add_done_callback(self._sends.discard)
+
+    async def _publish(self, payload: str) -> None:
+        try:
+            await self._redis().publish(self.channel, payload)
+        except Exception as e:
+            logger.warning(f"Failed to publish changes: {e}")
+
+    def receive(self, data: str | bytes) -> None:
+        message = json.loads(data)
+        if message.get("origin") == self.origin:
+            return
+        self.dispatch(ChangeEvent.from_dict(item) for item in message["events"])
+
+    async def _listen(self) -> None:
+        delay = self.RECONNECT_DELAY
+        while True:
+            pubsub = self._redis().pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self.channel)
+                self.resync()
+                delay = self.RECONNECT_DELAY
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        try:
+                            self.receive(message["data"])
+                        except (ValueError, KeyError, TypeError) as e:
+                            logger.warning(f"Dropping malformed change message: {e}")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Change bus disconnected, retrying in {delay}s: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.RECONNECT_MAX_DELAY)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+    async def start(self) -> None:
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        if self._sends:
+            await asyncio.gather(*self._sends, return_exceptions=True)
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+def create_change_bus(url: str) -> ChangeBus:
+    if url == "memory://":
+        return ChangeBus()
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisChangeBus(url, settings.CHANGE_BUS_CHANNEL)
+    raise ValueError(f"Unsupported change bus: {url}")
+
+
+change_bus = create_change_bus(settings.CHANGE_BUS_URL)
+
+
+def record_change(db, change: ChangeEvent) -> None:
+    """Queue ``change`` on a sync or async session until it commits."""
+    db.info.setdefault(PENDING_KEY, []).append(change)
+
+
+@event.listens_for(Session, "after_commit")
+def _emit_committed(session: Session) -> None:
+    events = session.info.pop(PENDING_KEY, None)
+    if events:
+        change_bus.emit(events)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_rolled_back(session: Session, previous_transaction) -> None:
+    if previous_transaction.parent is None:
+        session.info.pop(PENDING_KEY, None)
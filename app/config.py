@@ -16,12 +16,95 @@ class Settings(BaseSettings):
     CELERY_BROKER_URL: str = "redis://127.0.0.1:6379/0"
     CELERY_RESULT_BACKEND: str = "redis://127.0.0.1:6379/0"
 
+    CALENDAR_CACHE_TTL: float = 300.0
+    CALENDAR_MAX_DAYS: int = 366
+    QUOTE_MAX_SPAN_DAYS: int = 2 * 366
+    LOOKUP_MAX_IDS: int = 100
+
+    CHANGE_BUS_URL: str = "memory://"
+    CHANGE_BUS_CHANNEL: str = "booking-service:changes"
+    EVENT_STREAM_HEARTBEAT: float = 15.0
+    EVENT_STREAM_QUEUE_SIZE: int = 100
+
+    ADMISSION_PER_PROPERTY_LIMIT: int = 2
+    ADMISSION_PER_PROPERTY_QUEUE: int = 16
+    ADMISSION_GLOBAL_LIMIT: int = 10
+    ADMISSION_QUEUE_TIMEOUT: float = 2.0
+    ADMISSION_RETRY_AFTER: int = 1
+    ADMISSION_REDIS_URL: str | None = None
+    ADMISSION_LEASE_TTL: float = 30.0
+
+    # Unset means REDIS_URL: holds must be shared by every API worker
+    HOLD_STORE_URL: str | None = None
+    HOLD_TTL_SECONDS: int = 600
+
+    IDEMPOTENCY_KEY_TTL: int = 86400
+    IDEMPOTENCY_LEASE: int = 60
+    IDEMPOTENCY_WAIT_TIMEOUT: float = 10.0
+    IDEMPOTENCY_POLL_INTERVAL: float = 0.1
+    IDEMPOTENCY_PURGE_INTERVAL: float = 3600.0
+
+    OUTBOX_BATCH_SIZE: int = 100
+    OUTBOX_MAX_BATCHES: int = 10
+    OUTBOX_RELAY_INTERVAL: float = 1.0
+
+    WEBHOOK_DELIVERY_INTERVAL: float = 10.0
+    WEBHOOK_BATCH_SIZE: int = 200
+    WEBHOOK_MAX_BATCHES: int = 10
+    WEBHOOK_MAX_ATTEMPTS: int = 8
+    WEBHOOK_RETRY_BASE: float = 30.0
+    WEBHOOK_RETRY_MAX: float = 3600.0
+    WEBHOOK_TIMEOUT: float = 10.0
+    # How long claimed deliveries stay reserved per round of requests; must
+    # exceed a whole request, which WEBHOOK_TIMEOUT only bounds per operation
+    WEBHOOK_LEASE: float = 120.0
+    WEBHOOK_POOL_SIZE: int = 20
+    # Only for local development: allows endpoints on private addresses
+    WEBHOOK_ALLOW_PRIVATE_HOSTS: bool = False
+
+    BOOKING_SWEEP_INTERVAL: float = 300.0
+    BOOKING_SWEEP_BATCH_SIZE: int = 500
+    BOOKING_SWEEP_MAX_BATCHES: int = 20
+    PENDING_BOOKING_TTL: int = 1800
+    MAX_STAY_NIGHTS: int = 365
+
+    BOOKING_PARTITION_INTERVAL: float = 86400.0
+    BOOKING_PARTITIONS_AHEAD: int = 3
+    BOOKING_RETENTION_MONTHS: int = 24
+    BOOKING_ARCHIVE_URL: str = "file:///tmp/booking-service/archive"
+
+    TASK_PUBLISHER_QUEUE_SIZE: int = 1000
+    TASK_PUBLISHER_BATCH_SIZE: int = 50
+    TASK_PUBLISHER_TIMEOUT: float = 0.5
+
+    ARTIFACT_STORE_URL: str = "file:///tmp/booking-service/artifacts"
+    ARTIFACT_TTL_SECONDS: int = 24 * 60 * 60
+    ARTIFACT_PURGE_INTERVAL: float = 60 * 60
+
+    PDF_RENDER_PROCESSES: int | None = None
+
+    # Per-queue worker options, read by `python -m app.worker.run <queue>`
+    DEFAULT_WORKER_CONCURRENCY: int = 2
+    PDF_WORKER_CONCURRENCY: int = 2
+    PDF_WORKER_PREFETCH: int = 1
+    EMAIL_WORKER_POOL: str = "threads"
+    EMAIL_WORKER_CONCURRENCY: int = 20
+    EMAIL_WORKER_PREFETCH: int = 4
+
     SMTP_HOST: str = "smtp.gmail.com"
     SMTP_PORT: int = 587
     SMTP_USER: str = "your-email@gmail.com"
     SMTP_PASSWORD: str = "your-app-password"
     EMAIL_FROM: str = "your-email@gmail.com"
     EMAIL_FROM_NAME: str = "Booking Service"
+    SMTP_USE_TLS: bool = True
+    SMTP_POOL_SIZE: int = 4
+    SMTP_POOL_MAX_IDLE: float = 60.0
+
+    EMAIL_BATCH_ENABLED: bool = False
+    EMAIL_BATCH_SIZE: int = 50
+    EMAIL_BATCH_MAX_ATTEMPTS: int = 3
+    EMAIL_BATCH_INTERVAL: float = 5.0
 
     class Config:
         env_file = ".env"
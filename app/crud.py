@@ -1,13 +1,46 @@
-from sqlalchemy import func, select, and_, or_
+from sqlalchemy import Row, delete, exists, func, select, update, and_, or_
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload, Session, joinedload
 
-from datetime import date
+from datetime import date, datetime, timedelta
+import math
+import secrets
 
-from app.models import Booking, Property, User, PropertyStatus, BookingStatus, UserRole
+from app.config import settings
+from app.availability import (
+    calendar_cache,
+    month_blocks,
+    month_bounds,
+    months_between,
+)
+from app.changes import booking_change, property_change, record_change
+from app.geo import (
+    KM_PER_DEGREE,
+    bounding_box,
+    covering_cells,
+    encode_geohash,
+    prefix_upper_bound,
+)
+from app.models import (
+    Booking,
+    IdempotencyKey,
+    OutboxMessage,
+    PricingRule,
+    Property,
+    User,
+    PropertyStatus,
+    BookingStatus,
+    UserRole,
+    WebhookDeadLetter,
+    WebhookDelivery,
+    WebhookSubscription,
+)
 from app.schemas import (
     BookingCreate,
     BookingResponse,
+    BookingSnapshot,
+    PricingRuleCreate,
     PaginatedProperties,
     PropertyCreate,
     PropertyResponse,
@@ -15,8 +48,14 @@ from app.schemas import (
     UserCreate,
     UserResponse,
     PropertyFilter,
+    WebhookSubscriptionCreate,
 )
+from app.holds import Hold, get_hold_store, new_hold
+from app.loaders import loaders_for
+from app.pricing import quote_stay
+from app.search import document_vector, fts_delete, fts_insert, property_search
 from app.security import get_password_hash
+from app.webhooks import new_secret
 
 
 async def get_user(db: AsyncSession, user_id: int) -> User | None:
@@ -58,34 +97,103 @@ async def create_property(
         beds=property.beds,
         city=property.city,
         price=property.price,
+        latitude=property.latitude,
+        longitude=property.longitude,
+        geohash=_geohash_for(property.latitude, property.longitude),
         host_id=user_id,
     )
 
     db.add(db_property)
-    await db.flush()
+    await _index_property_text(db, db_property)
     await db.refresh(db_property)
     return db_property
 
 
+def _dialect(db: AsyncSession) -> str:
+    return db.bind.dialect.name
+
+
+async def _index_property_text(db: AsyncSession, db_property: Property) -> None:
+    """Flush the property together with its full-text search document."""
+    if _dialect(db) == "postgresql":
+        db_property.search_vector = document_vector(
+            db_property.title, db_property.description
+        )
+        await db.flush()
+        return
+
+    await db.flush()
+    await db.execute(fts_delete(db_property.id))
+    await db.execute(
+        fts_insert(db_property.id, db_property.title, db_property.description)
+    )
+
+
+def _geohash_for(lat: float | None, lon: float | None) -> str | None:
+    if lat is None or lon is None:
+        return None
+    return encode_geohash(lat, lon)
+
+
+def _geo_conditions(filters: PropertyFilter) -> list:
+    """Index-friendly conditions for radius and bounding-box filters.
+
+    Geohash prefix ranges narrow the scan through the index on
+    ``properties.geohash``; the exact box and distance checks then run on
+    the few rows left. Distance uses the equirectangular approximation,
+    which is accurate to well under a percent at search-radius scales.
+    """
+    if filters.radius_km is not None:
+        box = bounding_box(filters.lat, filters.lon, filters.radius_km)
+    elif filters.min_lat is not None:
+        box = (filters.min_lat, filters.max_lat, filters.min_lon, filters.max_lon)
+    else:
+        return []
+
+    min_lat, max_lat, min_lon, max_lon = box
+    conditions = [
+        Property.latitude.between(min_lat, max_lat),
+        Property.longitude.between(min_lon, max_lon),
+    ]
+
+    cells = covering_cells(*box)
+    if cells:
+        ranges = []
+        for cell in cells:
+            upper = prefix_upper_bound(cell)
+            if upper is None:
+                ranges.append(Property.geohash >= cell)
+            else:
+                ranges.append(and_(Property.geohash >= cell, Property.geohash < upper))
+        conditions.append(or_(*ranges))
+
+    if filters.radius_km is not None:
+        scale = math.cos(math.radians(filters.lat))
+        dx = (Property.longitude - filters.lon) * scale
+        dy = Property.latitude - filters.lat
+        conditions.append(dx * dx + dy * dy <= (filters.radius_km / KM_PER_DEGREE) ** 2)
+    return conditions
+
+
 async def get_properties(
     db: AsyncSession,
     skip: int = 0,
     limit: int = 100,
     host_id: int | None = None,
     filters: PropertyFilter | None = None,
-) -> tuple[list[Property], int]:
+    fields: tuple[str, ...] | None = None,
+) -> tuple[list[Property] | list[Row], int]:
 
-    query = select(Property)
-    count_query = select(func.count(Property.id))
-
-    if host_id:
-        query = query.options(selectinload(Property.user)).where(
-            Property.host_id == host_id
-        )
-        count_query = count_query.where(Property.host_id == host_id)
+    if fields:
+        query = select(*(getattr(Property, field) for field in fields))
+    else:
+        query = select(Property)
 
     conditions = []
 
+    if host_id:
+        conditions.append(Property.host_id == host_id)
+
     if filters:
         if filters.min_price is not None:
             conditions.append(Property.price >= filters.min_price)
@@ -95,21 +203,40 @@ async def get_properties(
             conditions.append(Property.city.ilike(f"%{filters.city}%"))
         if filters.beds is not None:
             conditions.append(Property.beds >= filters.beds)
+        conditions.extend(_geo_conditions(filters))
+
+    count_query = select(func.count()).select_from(Property).where(*conditions)
+    query = query.where(*conditions)
 
-    if conditions:
-        count_query = select(func.count()).select_from(Property).where(*conditions)
-        query = select(Property).where(*conditions).order_by(Property.created_at.desc())
+    search = property_search(_dialect(db), filters.q) if filters and filters.q else None
+    if search:
+        count_query = search.apply(count_query, ranked=False)
+        query = search.apply(query)
+    query = query.order_by(Property.created_at.desc())
 
     total_result = await db.execute(count_query)
     total = total_result.scalar_one()
 
     result = await db.execute(query.offset(skip).limit(limit))
+    if fields:
+        return list(result.all()), total
     return list(result.scalars().all()), total
 
 
 async def get_property(db: AsyncSession, property_id: int) -> Property | None:
-    result = await db.execute(select(Property).where(Property.id == property_id))
-    return result.scalar_one_or_none()
+    return await loaders_for(db).properties.load(property_id)
+
+
+async def get_properties_by_ids(
+    db: AsyncSession, property_ids: list[int]
+) -> list[Property | None]:
+    """Properties in the order of ``property_ids``, None for missing ones."""
+    return await loaders_for(db).properties.load_many(property_ids)
+
+
+async def property_exists(db: AsyncSession, property_id: int) -> bool:
+    result = await db.execute(select(Property.id).where(Property.id == property_id))
+    return result.scalar_one_or_none() is not None
 
 
 async def update_property(
@@ -122,9 +249,15 @@ async def update_property(
     update_data = property_update.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(db_property, field, value)
+    if "latitude" in update_data:
+        db_property.geohash = _geohash_for(db_property.latitude, db_property.longitude)
 
-    await db.flush()
+    if "title" in update_data or "description" in update_data:
+        await _index_property_text(db, db_property)
+    else:
+        await db.flush()
     await db.refresh(db_property)
+    record_change(db, property_change("property.updated", db_property))
     return db_property
 
 
@@ -132,11 +265,60 @@ async def delete_property(db: AsyncSession, property_id: int) -> bool:
     db_property = await get_property(db, property_id)
     if not db_property:
         return False
+    record_change(db, property_change("property.deleted", db_property))
     await db.delete(db_property)
+    if _dialect(db) != "postgresql":
+        await db.execute(fts_delete(property_id))
     await db.flush()
+    loaders_for(db).properties.clear(property_id)
     return True
 
 
+async def property_has_bookings(db: AsyncSession, property_id: int) -> bool:
+    result = await db.execute(
+        select(exists().where(Booking.property_id == property_id))
+    )
+    return bool(result.scalar())
+
+
+async def archive_property(db: AsyncSession, property: Property) -> list[int]:
+    """Archive a property and cancel its future active bookings.
+
+    The bookings are cancelled by one ``UPDATE ... RETURNING`` and their
+    guests are notified by a single outbox job. Returns the cancelled
+    booking ids.
+    """
+    now = datetime.now()
+    property.status = PropertyStatus.ARCHIVED
+    result = await db.execute(
+        update(Booking)
+        .where(
+            Booking.property_id == property.id,
+            Booking.status.in_([BookingStatus.PENDING, BookingStatus.CONFIRMED]),
+            Booking.check_in >= now.date(),
+        )
+        .values(status=BookingStatus.CANCELLED, cancelled_at=now, updated_at=now)
+        .returning(
+            Booking.id, Booking.property_id, Booking.check_in, Booking.check_out
+        ),
+        # Bookings already loaded in this session pick up the new status
+        execution_options={"synchronize_session": "fetch"},
+    )
+    rows = result.all()
+    for row in rows:
+        record_change(db, booking_change("booking.cancelled", row))
+    record_change(db, property_change("property.updated", property))
+
+    booking_ids = sorted(row.id for row in rows)
+    if booking_ids:
+        await enqueue_outbox_message(
+            db,
+            "app.celery.tasks.notify_cancelled_bookings",
+            {"booking_ids": booking_ids},
+        )
+    return booking_ids
+
+
 async def get_property_for_update(
     db: AsyncSession, property_id: int
 ) -> Property | None:
@@ -144,30 +326,44 @@ async def get_property_for_update(
     result = await db.execute(
         select(Property).where(Property.id == property_id).with_for_update()
     )
-    return result.scalar_one_or_none()
+    property = result.scalar_one_or_none()
+    if property is not None:
+        loaders_for(db).properties.prime(property_id, property)
+    return property
 
 
 async def check_property_owner(
     db: AsyncSession, property_id: int, user_id: int
 ) -> bool:
-    property = await get_property(db, property_id)
-    if not property:
-        return False
-    if property.host_id != user_id:
-        return False
-    return True
+    property = await loaders_for(db).properties.load(property_id)
+    return property is not None and property.host_id == user_id
 
 
 async def check_booking_owner(db: AsyncSession, booking_id: int, user_id: int) -> bool:
-    booking = await get_booking(db, booking_id)
-    if not booking:
-        return False
-    if booking.guest_id != user_id:
-        return False
-    return True
+    booking = await loaders_for(db).bookings.load(booking_id)
+    return booking is not None and booking.guest_id == user_id
+
+
+def _check_in_lower_bound(day: date):
+    """Bound check_in from below for queries that overlap ``day``.
 
+    A booking ending after ``day`` cannot start more than MAX_STAY_NIGHTS
+    before it. The redundant predicate lets Postgres prune older partitions.
+    """
+    return Booking.check_in > day - timedelta(days=settings.MAX_STAY_NIGHTS)
+
+
+async def check_availability(
+    db: AsyncSession,
+    booking_data: BookingCreate,
+    guest_id: int | None = None,
+    include_holds: bool = True,
+) -> bool:
+    """Whether the dates are free of active bookings and of live holds.
 
-async def check_availability(db: AsyncSession, booking_data: BookingCreate) -> bool:
+    Holds placed by ``guest_id`` are the caller's own and don't count as a
+    conflict, so a guest can book over their hold with or without confirming.
+    """
     query = select(Booking).where(
         and_(
             Booking.property_id == booking_data.property_id,
@@ -183,13 +379,94 @@ async def check_availability(db: AsyncSession, booking_data: BookingCreate) -> b
                     Booking.check_out > booking_data.check_in,
                 )
             ),
+            _check_in_lower_bound(booking_data.check_in),
         )
     )
 
     result = await db.execute(query)
     conflicting_bookings = result.scalars().all()
+    if conflicting_bookings:
+        return False
 
-    return len(conflicting_bookings) == 0
+    if not include_holds:
+        return True
+    return not await get_hold_store().conflicts(
+        booking_data.property_id,
+        booking_data.check_in,
+        booking_data.check_out,
+        guest_id=guest_id,
+    )
+
+
+async def get_pricing_rules(db: AsyncSession, property_id: int) -> list[PricingRule]:
+    result = await db.execute(
+        select(PricingRule)
+        .where(PricingRule.property_id == property_id)
+        .order_by(PricingRule.id)
+    )
+    return list(result.scalars().all())
+
+
+async def create_pricing_rule(
+    db: AsyncSession, property_id: int, rule: PricingRuleCreate
+) -> PricingRule:
+    db_rule = PricingRule(property_id=property_id, **rule.model_dump())
+    db.add(db_rule)
+    await db.flush()
+    await db.refresh(db_rule)
+    return db_rule
+
+
+async def delete_pricing_rule(db: AsyncSession, property_id: int, rule_id: int) -> bool:
+    result = await db.execute(
+        select(PricingRule).where(
+            PricingRule.id == rule_id, PricingRule.property_id == property_id
+        )
+    )
+    db_rule = result.scalar_one_or_none()
+    if not db_rule:
+        return False
+    await db.delete(db_rule)
+    await db.flush()
+    return True
+
+
+async def get_blocked_ranges(
+    db: AsyncSession, property_id: int, start: date, end: date
+) -> list[tuple[date, date]]:
+    result = await db.execute(
+        select(Booking.check_in, Booking.check_out).where(
+            Booking.property_id == property_id,
+            Booking.status.in_([BookingStatus.CONFIRMED, BookingStatus.PENDING]),
+            Booking.check_in < end,
+            Booking.check_out > start,
+            _check_in_lower_bound(start),
+        )
+    )
+    return [(row.check_in, row.check_out) for row in result]
+
+
+async def get_property_calendar(
+    db: AsyncSession, property_id: int, start: date, end: date
+) -> str:
+    months = months_between(start, end)
+    blocks = {month: calendar_cache.get((property_id, *month)) for month in months}
+
+    missing = [month for month, block in blocks.items() if block is None]
+    if missing:
+        ranges = await get_blocked_ranges(
+            db,
+            property_id,
+            month_bounds(*missing[0])[0],
+            month_bounds(*missing[-1])[1] + timedelta(days=1),
+        )
+        for month in missing:
+            blocks[month] = month_blocks(*month, ranges)
+            calendar_cache.set((property_id, *month), blocks[month])
+
+    days = "".join(blocks[month] for month in months)
+    offset = start.day - 1
+    return days[offset : offset + (end - start).days + 1]
 
 
 async def create_booking(
@@ -202,7 +479,7 @@ async def create_booking(
     if property.status != PropertyStatus.AVAILABLE:
         raise ValueError("Property is not available")
 
-    if not await check_availability(db, booking_data):
+    if not await check_availability(db, booking_data, guest_id=guest_id):
         raise ValueError("Property is not available for the selected dates")
 
     booking = Booking(
@@ -211,22 +488,69 @@ async def create_booking(
         guests=booking_data.guests,
         check_in=booking_data.check_in,
         check_out=booking_data.check_out,
-        total_price=property.price
-        * booking_data.guests
-        * (booking_data.check_out - booking_data.check_in).days,
+        total_price=quote_stay(
+            property.price,
+            await get_pricing_rules(db, property.id),
+            booking_data.check_in,
+            booking_data.check_out,
+            booking_data.guests,
+        ),
     )
     db.add(booking)
     await db.flush()
     await db.refresh(booking)
+    record_change(db, booking_change("booking.created", booking))
     return booking
 
 
+async def create_hold(
+    db: AsyncSession, guest_id: int, booking_data: BookingCreate
+) -> Hold | None:
+    """Hold the dates for a guest; None when another live hold overlaps."""
+    property = await get_property(db, booking_data.property_id)
+    if not property:
+        raise ValueError("Property not found")
+
+    if property.status != PropertyStatus.AVAILABLE:
+        raise ValueError("Property is not available")
+
+    if not await check_availability(db, booking_data, include_holds=False):
+        raise ValueError("Property is not available for the selected dates")
+
+    hold = new_hold(
+        property_id=booking_data.property_id,
+        guest_id=guest_id,
+        check_in=booking_data.check_in,
+        check_out=booking_data.check_out,
+        guests=booking_data.guests,
+        ttl=settings.HOLD_TTL_SECONDS,
+    )
+    if not await get_hold_store().place(hold):
+        return None
+    return hold
+
+
 async def get_booking(db: AsyncSession, booking_id: int) -> Booking | None:
-    result = await db.execute(select(Booking).where(Booking.id == booking_id))
-    return result.scalar_one_or_none()
+    return await loaders_for(db).bookings.load(booking_id)
+
+
+async def get_bookings_by_ids(
+    db: AsyncSession, booking_ids: list[int]
+) -> list[Booking | None]:
+    """Bookings with their properties in the order of ``booking_ids``."""
+    return await loaders_for(db).bookings.load_many(booking_ids)
 
 
-async def get_bookings(db: AsyncSession, user_id: int) -> list[Booking]:
+async def get_bookings(
+    db: AsyncSession, user_id: int, fields: tuple[str, ...] | None = None
+) -> list[Booking] | list[Row]:
+    if fields:
+        result = await db.execute(
+            select(*(getattr(Booking, field) for field in fields)).where(
+                Booking.guest_id == user_id
+            )
+        )
+        return list(result.all())
     result = await db.execute(select(Booking).where(Booking.guest_id == user_id))
     return list(result.scalars().all())
 
@@ -239,6 +563,7 @@ async def cancel_booking(db: AsyncSession, booking_id: int) -> Booking:
         raise ValueError("Booking not found")
     db_booking.cancelled_at = datetime.now()
     db_booking.status = BookingStatus.CANCELLED
+    record_change(db, booking_change("booking.cancelled", db_booking))
     await db.commit()
     await db.refresh(db_booking)
     return db_booking
@@ -252,20 +577,312 @@ async def confirm_booking(db: AsyncSession, booking_id: int) -> Booking:
         raise ValueError("Booking not found")
     db_booking.updated_at = datetime.now()
     db_booking.status = BookingStatus.CONFIRMED
+    record_change(db, booking_change("booking.confirmed", db_booking))
     await db.commit()
     await db.refresh(db_booking)
     return db_booking
 
 
-def get_user_sync(db: Session, user_id: int) -> User | None:
-    result = db.execute(select(User).where(User.id == user_id))
-    return result.scalar_one_or_none()
+async def enqueue_outbox_message(
+    db: AsyncSession, task_name: str, payload: dict
+) -> OutboxMessage:
+    message = OutboxMessage(task_name=task_name, payload=payload)
+    db.add(message)
+    await db.flush()
+    return message
+
+
+async def enqueue_booking_confirmation(
+    db: AsyncSession, booking: Booking, guest: User
+) -> OutboxMessage:
+    property = await db.get(Property, booking.property_id)
+    snapshot = BookingSnapshot.from_booking(booking, guest, property)
+    return await enqueue_outbox_message(
+        db,
+        "app.celery.tasks.process_booking_confirmation",
+        {
+            "booking_id": booking.id,
+            "user_email": guest.email,
+            "booking_data": snapshot.model_dump(mode="json"),
+        },
+    )
+
+
+def claim_outbox_batch_sync(db: Session, limit: int) -> list[OutboxMessage]:
+    result = db.execute(
+        select(OutboxMessage)
+        .where(OutboxMessage.published_at.is_(None))
+        .order_by(OutboxMessage.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    return list(result.scalars().all())
 
 
-def get_booking_sync(db: Session, booking_id: int) -> Booking | None:
+def get_bookings_with_details_sync(
+    db: Session, booking_ids: list[int]
+) -> list[Booking]:
     result = db.execute(
         select(Booking)
-        .where(Booking.id == booking_id)
-        .options(joinedload(Booking.property))
+        .where(Booking.id.in_(booking_ids))
+        .options(
+            joinedload(Booking.property).lazyload("*"),
+            joinedload(Booking.user).lazyload("*"),
+        )
+    )
+    return list(result.unique().scalars().all())
+
+
+async def get_idempotency_key(
+    db: AsyncSession, user_id: int, key: str
+) -> IdempotencyKey | None:
+    result = await db.execute(
+        select(IdempotencyKey)
+        .where(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key)
+        .execution_options(populate_existing=True)
     )
     return result.scalar_one_or_none()
+
+
+async def claim_idempotency_key(
+    db: AsyncSession, user_id: int, key: str, request_hash: str, expires_at: datetime
+) -> str | None:
+    """Commit an in-flight record for the key and return its claim token.
+
+    Returns None if another request holds the key. Expired records are
+    replaced, so a claim whose owner died before committing anything is
+    taken over once its lease runs out.
+    """
+    await db.execute(
+        delete(IdempotencyKey).where(
+            IdempotencyKey.user_id == user_id,
+            IdempotencyKey.key == key,
+            IdempotencyKey.expires_at <= datetime.now(),
+        )
+    )
+    token = secrets.token_hex(16)
+    try:
+        async with db.begin_nested():
+            db.add(
+                IdempotencyKey(
+                    user_id=user_id,
+                    key=key,
+                    request_hash=request_hash,
+                    claim_token=token,
+                    expires_at=expires_at,
+                )
+            )
+    except IntegrityError:
+        return None
+
+    # Duplicates must see the claim before the handler runs, but the request
+    # keeps using objects it has already loaded, so they must not be expired
+    session = db.sync_session
+    expire_on_commit, session.expire_on_commit = session.expire_on_commit, False
+    try:
+        await db.commit()
+    finally:
+        session.expire_on_commit = expire_on_commit
+    return token
+
+
+def mark_idempotency_key_executed_sync(
+    db: Session, user_id: int, key: str, token: str, expires_at: datetime
+) -> bool:
+    """Mark the claim as executed; False if the claim was taken over."""
+    result = db.execute(
+        update(IdempotencyKey)
+        .where(
+            IdempotencyKey.user_id == user_id,
+            IdempotencyKey.key == key,
+            IdempotencyKey.claim_token == token,
+        )
+        .values(executed=True, expires_at=expires_at)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+
+async def complete_idempotency_key(
+    db: AsyncSession,
+    user_id: int,
+    key: str,
+    token: str,
+    status_code: int,
+    response_body: str,
+    expires_at: datetime,
+) -> None:
+    await db.execute(
+        update(IdempotencyKey)
+        .where(
+            IdempotencyKey.user_id == user_id,
+            IdempotencyKey.key == key,
+            IdempotencyKey.claim_token == token,
+        )
+        .values(
+            status_code=status_code,
+            response_body=response_body,
+            expires_at=expires_at,
+        )
+    )
+    await db.commit()
+
+
+async def release_idempotency_key(
+    db: AsyncSession, user_id: int, key: str, token: str
+) -> None:
+    # An executed key is never released: its writes are already committed
+    await db.execute(
+        delete(IdempotencyKey).where(
+            IdempotencyKey.user_id == user_id,
+            IdempotencyKey.key == key,
+            IdempotencyKey.claim_token == token,
+            IdempotencyKey.executed.is_(False),
+            IdempotencyKey.status_code.is_(None),
+        )
+    )
+    await db.commit()
+
+
+def purge_expired_idempotency_keys_sync(db: Session, now: datetime) -> int:
+    result = db.execute(delete(IdempotencyKey).where(IdempotencyKey.expires_at <= now))
+    return result.rowcount
+
+
+async def create_webhook_subscription(
+    db: AsyncSession, host_id: int, subscription: WebhookSubscriptionCreate
+) -> WebhookSubscription:
+    db_subscription = WebhookSubscription(
+        host_id=host_id,
+        url=str(subscription.url),
+        secret=new_secret(),
+        events=list(dict.fromkeys(subscription.events)),
+    )
+    db.add(db_subscription)
+    await db.flush()
+    await db.refresh(db_subscription)
+    return db_subscription
+
+
+async def get_webhook_subscriptions(
+    db: AsyncSession, host_id: int
+) -> list[WebhookSubscription]:
+    result = await db.execute(
+        select(WebhookSubscription)
+        .where(WebhookSubscription.host_id == host_id)
+        .order_by(WebhookSubscription.id)
+    )
+    return list(result.scalars().all())
+
+
+async def delete_webhook_subscription(
+    db: AsyncSession, subscription_id: int, host_id: int
+) -> bool:
+    result = await db.execute(
+        delete(WebhookSubscription).where(
+            WebhookSubscription.id == subscription_id,
+            WebhookSubscription.host_id == host_id,
+        )
+    )
+    return result.rowcount > 0
+
+
+def claim_webhook_deliveries_sync(
+    db: Session, now: datetime, limit: int
+) -> list[WebhookDelivery]:
+    result = db.execute(
+        select(WebhookDelivery)
+        .where(WebhookDelivery.next_attempt_at <= now)
+        .order_by(WebhookDelivery.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .options(selectinload(WebhookDelivery.subscription))
+    )
+    return list(result.scalars().all())
+
+
+def get_webhook_deliveries_sync(
+    db: Session, delivery_ids: list[int]
+) -> list[WebhookDelivery]:
+    result = db.execute(
+        select(WebhookDelivery)
+        .where(WebhookDelivery.id.in_(delivery_ids))
+        .order_by(WebhookDelivery.id)
+    )
+    return list(result.scalars().all())
+
+
+def dead_letter_webhook_delivery_sync(
+    db: Session, delivery: WebhookDelivery, now: datetime
+) -> WebhookDeadLetter:
+    dead_letter = WebhookDeadLetter(
+        subscription_id=delivery.subscription_id,
+        event=delivery.event,
+        payload=delivery.payload,
+        attempts=delivery.attempts,
+        last_error=delivery.last_error,
+        created_at=delivery.created_at,
+        failed_at=now,
+    )
+    db.add(dead_letter)
+    db.delete(delivery)
+    return dead_letter
+
+
+def _transition_bookings_sync(
+    db: Session, condition, limit: int, kind: str, **values
+) -> list[int]:
+    claimed = (
+        select(Booking.id)
+        .where(condition)
+        .order_by(Booking.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    result = db.execute(
+        update(Booking)
+        .where(Booking.id.in_(claimed))
+        .values(**values)
+        .returning(
+            Booking.id, Booking.property_id, Booking.check_in, Booking.check_out
+        ),
+        execution_options={"synchronize_session": False},
+    )
+    rows = result.all()
+    for row in rows:
+        record_change(db, booking_change(kind, row))
+    return [row.id for row in rows]
+
+
+def complete_past_bookings_sync(db: Session, today: date, limit: int) -> list[int]:
+    return _transition_bookings_sync(
+        db,
+        and_(
+            Booking.status == BookingStatus.CONFIRMED,
+            Booking.check_in < today,
+            Booking.check_out <= today,
+        ),
+        limit,
+        "booking.completed",
+        status=BookingStatus.COMPLETED,
+        updated_at=datetime.now(),
+    )
+
+
+def expire_pending_bookings_sync(
+    db: Session, created_before: datetime, limit: int
+) -> list[int]:
+    now = datetime.now()
+    return _transition_bookings_sync(
+        db,
+        and_(
+            Booking.status == BookingStatus.PENDING,
+            Booking.created_at < created_before,
+        ),
+        limit,
+        "booking.cancelled",
+        status=BookingStatus.CANCELLED,
+        cancelled_at=now,
+        updated_at=now,
+    )
@@ -1,8 +1,9 @@
 from collections.abc import AsyncGenerator
+from functools import lru_cache
 
 from sqlalchemy import create_engine
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy.orm import DeclarativeBase, sessionmaker
+from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
 
 from app.config import settings
 
@@ -13,8 +14,17 @@ SYNC_DATABASE_URL = settings.DATABASE_URL.replace(
     "postgresql+asyncpg", "postgresql+psycopg2"
 )
 
-sync_engine = create_engine(SYNC_DATABASE_URL, echo=False)
-sync_session = sessionmaker(bind=sync_engine)
+
+@lru_cache
+def _sync_sessionmaker() -> sessionmaker[Session]:
+    # The sync engine is only used by Celery workers; creating it lazily keeps
+    # psycopg2 out of the API process.
+    sync_engine = create_engine(SYNC_DATABASE_URL, echo=False)
+    return sessionmaker(bind=sync_engine)
+
+
+def sync_session() -> Session:
+    return _sync_sessionmaker()()
 
 
 class Base(DeclarativeBase):
@@ -1,10 +1,15 @@
+from collections.abc import AsyncIterator
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.admission import Admission, AdmissionRejected, admission
 from app.crud import get_user
 from app.database import get_db
+from app.loaders import Loaders
 from app.models import User, UserRole
+from app.schemas import BookingCreate
 from app.security import decode_token
 
 security = HTTPBearer()
@@ -37,9 +42,46 @@ async def get_current_user(
     return user
 
 
+async def get_loaders(db: AsyncSession = Depends(get_db)) -> AsyncIterator[Loaders]:
+    """Request-scoped loaders that ``app.crud`` lookups go through."""
+    loaders = Loaders(db)
+    loaders.attach()
+    try:
+        yield loaders
+    finally:
+        loaders.detach()
+
+
 async def get_admin_user(current_user: User = Depends(get_current_user)) -> User:
     if current_user.role != UserRole.ADMIN:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions"
         )
     return current_user
+
+
+def _rejected(e: AdmissionRejected) -> HTTPException:
+    return HTTPException(
+        status_code=e.status_code,
+        detail=e.detail,
+        headers={"Retry-After": str(e.retry_after)},
+    )
+
+
+async def admit_write() -> AsyncIterator[None]:
+    try:
+        async with admission.admit():
+            yield
+    except AdmissionRejected as e:
+        raise _rejected(e)
+
+
+async def admit_booking(booking: BookingCreate) -> AsyncIterator[Admission]:
+    # Declared before get_db/get_current_user so that rejected requests never
+    # check out a database connection. The route may release the slots while
+    # it waits and take them again, which can also be rejected
+    try:
+        async with admission.admit(booking.property_id) as admitted:
+            yield admitted
+    except AdmissionRejected as e:
+        raise _rejected(e)
@@ -0,0 +1,96 @@
+import math
+
+GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+GEOHASH_PRECISION = 9
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+# Approximate cell size (height, width) in degrees for each geohash length
+_CELL_SIZES = {
+    length: (
+        180 / 2 ** ((5 * length) // 2),
+        360 / 2 ** ((5 * length + 1) // 2),
+    )
+    for length in range(1, GEOHASH_PRECISION + 1)
+}
+
+
+def encode_geohash(lat: float, lon: float, precision: int = GEOHASH_PRECISION) -> str:
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    value = 0
+    even = True
+    while len(chars) < precision:
+        interval, coordinate = (lon_range, lon) if even else (lat_range, lat)
+        mid = (interval[0] + interval[1]) / 2
+        value <<= 1
+        if coordinate >= mid:
+            value |= 1
+            interval[0] = mid
+        else:
+            interval[1] = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(GEOHASH_ALPHABET[value])
+            bits = 0
+            value = 0
+    return "".join(chars)
+
+
+def bounding_box(
+    lat: float, lon: float, radius_km: float
+) -> tuple[float, float, float, float]:
+    lat_delta = radius_km / KM_PER_DEGREE
+    cos_lat = max(math.cos(math.radians(lat)), 1e-6)
+    lon_delta = min(radius_km / (KM_PER_DEGREE * cos_lat), 180.0)
+    return (
+        max(lat - lat_delta, -90.0),
+        min(lat + lat_delta, 90.0),
+        max(lon - lon_delta, -180.0),
+        min(lon + lon_delta, 180.0),
+    )
+
+
+def covering_cells(
+    min_lat: float, max_lat: float, min_lon: float, max_lon: float, max_cells: int = 32
+) -> list[str]:
+    """Geohash prefixes whose cells together cover the bounding box.
+
+    Picks the longest prefix length that needs at most ``max_cells`` cells,
+    so the index range scan stays narrow without an explosion of OR terms.
+    """
+    for length in range(GEOHASH_PRECISION, 0, -1):
+        height, width = _CELL_SIZES[length]
+        rows = math.floor(max_lat / height) - math.floor(min_lat / height) + 1
+        cols = math.floor(max_lon / width) - math.floor(min_lon / width) + 1
+        if rows * cols <= max_cells:
+            break
+    else:
+        return []
+
+    cells = set()
+    lat = min_lat
+    while True:
+        lon = min_lon
+        while True:
+            cells.add(encode_geohash(lat, lon, length))
+            if lon >= max_lon:
+                break
+            lon = min(lon + width, max_lon)
+        if lat >= max_lat:
+            break
+        lat = min(lat + height, max_lat)
+    return sorted(cells)
+
+
+def prefix_upper_bound(prefix: str) -> str | None:
+    """Smallest string greater than every geohash starting with ``prefix``."""
+    while prefix:
+        last = GEOHASH_ALPHABET.index(prefix[-1])
+        if last + 1 < len(GEOHASH_ALPHABET):
+            return prefix[:-1] + GEOHASH_ALPHABET[last + 1]
+        prefix = prefix[:-1]
+    return None
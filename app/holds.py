@@ -0,0 +1,271 @@
+import json
+import time
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass
+from datetime import date, datetime
+from functools import lru_cache
+
+from app.config import settings
+
+
+@dataclass
+class Hold:
+    id: str
+    property_id: int
+    guest_id: int
+    check_in: date
+    check_out: date
+    guests: int
+    expires_at: datetime
+
+    def overlaps(self, check_in: date, check_out: date) -> bool:
+        return self.check_in < check_out and self.check_out > check_in
+
+    def to_json(self) -> str:
+        data = asdict(self)
+        data["check_in"] = self.check_in.isoformat()
+        data["check_out"] = self.check_out.isoformat()
+        data["expires_at"] = self.expires_at.isoformat()
+        return json.dumps(data)
+
+    @classmethod
+    def from_json(cls, raw: str | bytes) -> "Hold":
+        data = json.loads(raw)
+        data["check_in"] = date.fromisoformat(data["check_in"])
+        data["check_out"] = date.fromisoformat(data["check_out"])
+        data["expires_at"] = datetime.fromisoformat(data["expires_at"])
+        return cls(**data)
+
+
+def new_hold(
+    property_id: int,
+    guest_id: int,
+    check_in: date,
+    check_out: date,
+    guests: int,
+    ttl: float,
+) -> Hold:
+    return Hold(
+        id=uuid.uuid4().hex,
+        property_id=property_id,
+        guest_id=guest_id,
+        check_in=check_in,
+        check_out=check_out,
+        guests=guests,
+        expires_at=datetime.fromtimestamp(time.time() + ttl),
+    )
+
+
+class HoldStore(ABC):
+    """Short-lived date reservations kept outside the database.
+
+    ``place`` checks for overlapping live holds and stores the new one as a
+    single atomic step; expired holds simply stop counting.
+    """
+
+    @abstractmethod
+    async def place(self, hold: Hold) -> bool: ...
+
+    @abstractmethod
+    async def get(self, hold_id: str) -> Hold | None: ...
+
+    @abstractmethod
+    async def release(self, hold_id: str) -> None: ...
+
+    @abstractmethod
+    async def conflicts(
+        self,
+        property_id: int,
+        check_in: date,
+        check_out: date,
+        guest_id: int | None = None,
+    ) -> bool:
+        """Whether a live hold overlaps the dates; ``guest_id``'s own don't count."""
+
+
+class MemoryHoldStore(HoldStore):
+    """Per-process store for tests and single-instance deployments.
+
+    Methods never await between reading and writing, so each call is atomic
+    on the event loop.
+    """
+
+    def __init__(self):
+        self._holds: dict[str, Hold] = {}
+        self._by_property: dict[int, set[str]] = {}
+
+    def _live(self, property_id: int) -> list[Hold]:
+        now = datetime.now()
+        live = []
+        for hold_id in list(self._by_property.get(property_id, ())):
+            hold = self._holds[hold_id]
+            if hold.expires_at <= now:
+                self._forget(hold)
+            else:
+                live.append(hold)
+        return live
+
+    def _forget(self, hold: Hold) -> None:
+        self._holds.pop(hold.id, None)
+        ids = self._by_property.get(hold.property_id)
+        if ids is not None:
+            ids.discard(hold.id)
+            if not ids:
+                del self._by_property[hold.property_id]
+
+    async def place(self, hold: Hold) -> bool:
+        for other in self._live(hold.property_id):
+            if other.overlaps(hold.check_in, hold.check_out):
+                return False
+        self._holds[hold.id] = hold
+        self._by_property.setdefault(hold.property_id, set()).add(hold.id)
+        return True
+
+    async def get(self, hold_id: str) -> Hold | None:
+        hold = self._holds.get(hold_id)
+        if hold is None:
+            return None
+        if hold.expires_at <= datetime.now():
+            self._forget(hold)
+            return None
+        return hold
+
+    async def release(self, hold_id: str) -> None:
+        hold = self._holds.get(hold_id)
+        if hold is not None:
+            self._forget(hold)
+
+    async def conflicts(
+        self,
+        property_id: int,
+        check_in: date,
+        check_out: date,
+        guest_id: int | None = None,
+    ) -> bool:
+        return any(
+            hold.guest_id != guest_id and hold.overlaps(check_in, check_out)
+            for hold in self._live(property_id)
+        )
+
+    def clear(self) -> None:
+        self._holds.clear()
+        self._by_property.clear()
+
+
+class RedisHoldStore(HoldStore):
+    """Holds shared by all API processes.
+
+    Each property has a sorted set of ``id|guest_id|check_in|check_out``
+    members scored by expiry time, and each hold's details live in their own
+    key with a TTL. Placement runs as one Lua script, so the overlap check and
+    the insert are atomic across processes. ISO dates compare correctly as
+    strings.
+    """
+
+    _PLACE = """
+    local now = tonumber(ARGV[1])
+    redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now)
+    for _, member in ipairs(redis.call('ZRANGE', KEYS[1], 0, -1)) do
+        local _, _, check_in, check_out = string.find(member, '([^|]+)|([^|]+)$')
+        if check_in < ARGV[5] and check_out > ARGV[4] then
+            return 0
+        end
+    end
+    redis.call('ZADD', KEYS[1], ARGV[2], ARGV[3])
+    local last = redis.call('ZRANGE', KEYS[1], -1, -1, 'WITHSCORES')
+    redis.call('PEXPIREAT', KEYS[1], last[2])
+    redis.call('SET', KEYS[2], ARGV[6], 'PXAT', ARGV[2])
+    return 1
+    """
+
+    def __init__(self, url: str, prefix: str = "holds"):
+        self.url = url
+        self.prefix = prefix
+        self._client = None
+
+    def _redis(self):
+        if self._client is None:
+            # Imported lazily: redis is not a dependency of the API otherwise
+            import redis.asyncio as redis
+
+            self._client = redis.Redis.from_url(self.url)
+            self._place = self._client.register_script(self._PLACE)
+        return self._client
+
+    def _property_key(self, property_id: int) -> str:
+        return f"{self.prefix}:property:{property_id}"
+
+    def _hold_key(self, hold_id: str) -> str:
+        return f"{self.prefix}:hold:{hold_id}"
+
+    @staticmethod
+    def _member(hold: Hold) -> str:
+        return (
+            f"{hold.id}|{hold.guest_id}|"
+            f"{hold.check_in.isoformat()}|{hold.check_out.isoformat()}"
+        )
+
+    async def place(self, hold: Hold) -> bool:
+        self._redis()
+        expires_ms = int(hold.expires_at.timestamp() * 1000)
+        placed = await self._place(
+            keys=[self._property_key(hold.property_id), self._hold_key(hold.id)],
+            args=[
+                int(time.time() * 1000),
+                expires_ms,
+                self._member(hold),
+                hold.check_in.isoformat(),
+                hold.check_out.isoformat(),
+                hold.to_json(),
+            ],
+        )
+        return bool(placed)
+
+    async def get(self, hold_id: str) -> Hold | None:
+        raw = await self._redis().get(self._hold_key(hold_id))
+        return Hold.from_json(raw) if raw else None
+
+    async def release(self, hold_id: str) -> None:
+        hold = await self.get(hold_id)
+        if hold is None:
+            return
+        async with self._redis().pipeline(transaction=True) as pipe:
+            pipe.zrem(
+                self._property_key(hold.property_id),
+                self._member(hold),
+            )
+            pipe.delete(self._hold_key(hold.id))
+            await pipe.execute()
+
+    async def conflicts(
+        self,
+        property_id: int,
+        check_in: date,
+        check_out: date,
+        guest_id: int | None = None,
+    ) -> bool:
+        members = await self._redis().zrangebyscore(
+            self._property_key(property_id), int(time.time() * 1000), "+inf"
+        )
+        for member in members:
+            fields = member.decode().split("|")
+            start, end = fields[-2:]
+            if guest_id is not None and fields[1:-2] == [str(guest_id)]:
+                continue
+            if start < check_out.isoformat() and end > check_in.isoformat():
+                return True
+        return False
+
+
+def create_hold_store(url: str) -> HoldStore:
+    if url == "memory://":
+        return MemoryHoldStore()
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisHoldStore(url)
+    raise ValueError(f"Unsupported hold store: {url}")
+
+
+@lru_cache
+def get_hold_store() -> HoldStore:
+    return create_hold_store(settings.HOLD_STORE_URL or settings.REDIS_URL)
@@ -0,0 +1,188 @@
+import asyncio
+import hashlib
+import json
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable
+
+from fastapi import HTTPException, Request, Response, status
+from pydantic import BaseModel
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.admission import Admission
+from app.config import settings
+from app.crud import (
+    claim_idempotency_key,
+    complete_idempotency_key,
+    get_idempotency_key,
+    mark_idempotency_key_executed_sync,
+    release_idempotency_key,
+)
+
+REPLAYED_HEADER = "Idempotent-Replayed"
+CLAIM_KEY = "idempotency_claim"
+
+# Waiters in this process are woken as soon as the owning request finishes;
+# requests in other processes are picked up by polling.
+_in_flight: dict[tuple[int, str], asyncio.Event] = {}
+
+
+def request_fingerprint(request: Request, payload: BaseModel) -> str:
+    body = payload.model_dump_json()
+    return hashlib.sha256(
+        f"{request.method} {request.url.path}\n{body}".encode()
+    ).hexdigest()
+
+
+def _replay(status_code: int, body: str) -> Response:
+    return Response(
+        content=body,
+        status_code=status_code,
+        media_type="application/json",
+        headers={REPLAYED_HEADER: "true"},
+    )
+
+
+def _result_expiry() -> datetime:
+    return datetime.now() + timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL)
+
+
+class IdempotencyClaimLost(Exception):
+    """The key's lease ran out and another request claimed it."""
+
+
+@event.listens_for(Session, "before_commit")
+def _mark_claim_executed(session: Session) -> None:
+    """Mark the claimed key as executed in the handler's own transaction.
+
+    From then on the key is kept for the full TTL and never released, so a
+    retry cannot run the handler again even if the response is never stored.
+    A claim that was taken over aborts the commit instead.
+    """
+    claim = session.info.get(CLAIM_KEY)
+    if claim is None:
+        return
+    if not mark_idempotency_key_executed_sync(session, *claim, _result_expiry()):
+        raise IdempotencyClaimLost()
+
+
+async def _wait_for_result(
+    db: AsyncSession, user_id: int, key: str, request_hash: str
+) -> Response | None:
+    """Replay the stored response, waiting while the key is in flight.
+
+    Returns None when the owner gave the key up and the caller may claim it.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.IDEMPOTENCY_WAIT_TIMEOUT
+    while True:
+        record = await get_idempotency_key(db, user_id, key)
+        if record is None or record.expires_at <= datetime.now():
+            return None
+        if record.request_hash != request_hash:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+                detail="Idempotency-Key was already used with a different request",
+            )
+        if record.status_code is not None:
+            return _replay(record.status_code, record.response_body or "")
+
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="A request with this Idempotency-Key is still in progress",
+            )
+        interval = min(settings.IDEMPOTENCY_POLL_INTERVAL, remaining)
+        event = _in_flight.get((user_id, key))
+        if event is None:
+            await asyncio.sleep(interval)
+        else:
+            try:
+                await asyncio.wait_for(event.wait(), interval)
+            except asyncio.TimeoutError:
+                pass
+
+
+async def idempotent(
+    db: AsyncSession,
+    user_id: int,
+    key: str | None,
+    request_hash: str,
+    handler: Callable[[], Awaitable[Response]],
+    admission: Admission | None = None,
+) -> Response:
+    """Run ``handler`` at most once per user and ``Idempotency-Key``.
+
+    The first request commits an in-flight record before running the handler
+    and stores the finished response on it. Retries replay that response;
+    duplicates that arrive while it is running wait for it instead of
+    executing again. Errors before the handler commits anything release the
+    key so it can be retried.
+
+    The in-flight record only holds a short ``IDEMPOTENCY_LEASE``, so a key
+    whose owner crashed before committing can be claimed again soon. The
+    handler's first commit marks the key as executed in the same transaction
+    and extends it to ``IDEMPOTENCY_KEY_TTL``; completion and release only
+    touch the record while it still carries this request's claim token.
+
+    While a duplicate waits for the owner it gives up its ``admission`` slots,
+    taking them again only if it has to run the handler itself.
+    """
+    if key is None:
+        return await handler()
+
+    lease = datetime.now() + timedelta(seconds=settings.IDEMPOTENCY_LEASE)
+    while (
+        token := await claim_idempotency_key(db, user_id, key, request_hash, lease)
+    ) is None:
+        if admission is not None:
+            await admission.release()
+        replay = await _wait_for_result(db, user_id, key, request_hash)
+        if replay is not None:
+            return replay
+        if admission is not None:
+            await admission.reacquire()
+
+    event = _in_flight[(user_id, key)] = asyncio.Event()
+    db.info[CLAIM_KEY] = (user_id, key, token)
+    try:
+        try:
+            response = await handler()
+        except IdempotencyClaimLost:
+            db.info.pop(CLAIM_KEY, None)
+            await db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="A request with this Idempotency-Key is still in progress",
+            )
+        except HTTPException as e:
+            db.info.pop(CLAIM_KEY, None)
+            await db.rollback()
+            body = json.dumps({"detail": e.detail})
+            await complete_idempotency_key(
+                db, user_id, key, token, e.status_code, body, _result_expiry()
+            )
+            raise
+        except BaseException:
+            db.info.pop(CLAIM_KEY, None)
+            await db.rollback()
+            await release_idempotency_key(db, user_id, key, token)
+            raise
+
+        db.info.pop(CLAIM_KEY, None)
+        await complete_idempotency_key(
+            db,
+            user_id,
+            key,
+            token,
+            response.status_code,
+            response.body.decode(),
+            _result_expiry(),
+        )
+        return response
+    finally:
+        db.info.pop(CLAIM_KEY, None)
+        _in_flight.pop((user_id, key), None)
+        event.set()
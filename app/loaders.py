@@ -0,0 +1,130 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable, Iterable
+from functools import partial
+from typing import Generic, TypeVar
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Booking, Property
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+LOADERS_KEY = "loaders"
+
+
+class Loader(Generic[K, V]):
+    """Deduplicates and batches lookups by key.
+
+    Keys requested in the same event-loop tick are fetched with a single call
+    to ``fetch``, and each key is fetched at most once per loader. The fetch
+    runs in one of the awaiting coroutines rather than a background task, so
+    it never overlaps other statements on the caller's session.
+    """
+
+    def __init__(self, fetch: Callable[[list[K]], Awaitable[dict[K, V]]]):
+        self._fetch = fetch
+        self._results: dict[K, asyncio.Future] = {}
+        self._pending: list[K] = []
+
+    def _enqueue(self, key: K) -> asyncio.Future:
+        future = self._results.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._results[key] = future
+            self._pending.append(key)
+        return future
+
+    async def _dispatch(self) -> None:
+        if not self._pending:
+            return
+        keys, self._pending = self._pending, []
+        try:
+            found = await self._fetch(keys)
+        except Exception as e:
+            # Failures are handed to every waiter and not cached
+            for key in keys:
+                self._results.pop(key).set_exception(e)
+            return
+        except BaseException:
+            for key in keys:
+                self._results.pop(key).cancel()
+            raise
+        for key in keys:
+            self._results[key].set_result(found.get(key))
+
+    async def load(self, key: K) -> V | None:
+        future = self._results.get(key)
+        if future is None:
+            future = self._enqueue(key)
+            # Let sibling coroutines queue their keys before fetching
+            await asyncio.sleep(0)
+            await self._dispatch()
+        return await future
+
+    async def load_many(self, keys: Iterable[K]) -> list[V | None]:
+        futures = [self._enqueue(key) for key in keys]
+        await self._dispatch()
+        return list(await asyncio.gather(*futures))
+
+    def prime(self, key: K, value: V) -> None:
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(value)
+        self._results[key] = future
+
+    def clear(self, key: K | None = None) -> None:
+        if key is None:
+            self._results = {
+                key: future
+                for key, future in self._results.items()
+                if not future.done()
+            }
+        else:
+            self._results.pop(key, None)
+
+
+async def _by_id(db: AsyncSession, model, ids: list[int]) -> dict:
+    result = await db.execute(select(model).where(model.id.in_(ids)))
+    return {row.id: row for row in result.scalars()}
+
+
+class Loaders:
+    """Primary-key loaders sharing one session.
+
+    Cached rows are dropped when the session commits or rolls back, because
+    committing expires them and their lazy reload would need a sync context.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.properties: Loader[int, Property] = Loader(partial(_by_id, db, Property))
+        self.bookings: Loader[int, Booking] = Loader(partial(_by_id, db, Booking))
+
+    def clear(self) -> None:
+        self.properties.clear()
+        self.bookings.clear()
+
+    def _on_transaction_end(self, session, *args) -> None:
+        self.clear()
+
+    def attach(self) -> None:
+        """Make these loaders the ones ``loaders_for`` returns for the session."""
+        self.db.info[LOADERS_KEY] = self
+        for name in ("after_commit", "after_soft_rollback"):
+            event.listen(self.db.sync_session, name, self._on_transaction_end)
+
+    def detach(self) -> None:
+        if self.db.info.get(LOADERS_KEY) is self:
+            del self.db.info[LOADERS_KEY]
+        for name in ("after_commit", "after_soft_rollback"):
+            if event.contains(self.db.sync_session, name, self._on_transaction_end):
+                event.remove(self.db.sync_session, name, self._on_transaction_end)
+
+
+def loaders_for(db: AsyncSession) -> Loaders:
+    """The request's loaders, or throwaway ones outside a request scope."""
+    loaders = db.info.get(LOADERS_KEY)
+    if loaders is None:
+        return Loaders(db)
+    return loaders
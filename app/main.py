@@ -1,18 +1,34 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
-from app.routes import auth, bookings, properties
+from app.admission import admission
+from app.changes import change_bus
+from app.routes import auth, bookings, properties, webhooks
+from app.streams import property_events
+
+from app.worker.publisher import task_publisher
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await change_bus.start()
+    yield
+    task_publisher.stop()
+    await change_bus.stop()
 
-from app.worker.app import app as celery_app
 
 app = FastAPI(
     title="Booking Service API",
     description="API for booking service",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 app.include_router(auth.router)
 app.include_router(bookings.router)
 app.include_router(properties.router)
+app.include_router(webhooks.router)
 
 
 @app.get("/")
@@ -24,10 +40,16 @@ async def root():
             "auth": "/auth",
             "bookings": "/bookings",
             "properties": "/properties",
+            "webhooks": "/webhooks",
         },
     }
 
 
 @app.get("/health")
 async def health_check():
-    return {"status": "ok"}
+    return {
+        "status": "ok",
+        "task_publisher": task_publisher.metrics(),
+        "admission": admission.metrics(),
+        "event_streams": property_events.metrics(),
+    }
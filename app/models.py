@@ -1,7 +1,18 @@
 import enum
 from datetime import datetime, date
 
-from sqlalchemy import ForeignKey, String, Text
+from sqlalchemy import (
+    DDL,
+    JSON,
+    ForeignKey,
+    Index,
+    String,
+    Text,
+    UniqueConstraint,
+    event,
+    text,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -26,6 +37,13 @@ class PropertyStatus(str, enum.Enum):
     ARCHIVED = "archived"
 
 
+class PricingRuleKind(str, enum.Enum):
+    OVERRIDE = "override"
+    WEEKEND = "weekend"
+    SEASONAL = "seasonal"
+    LENGTH_OF_STAY = "length_of_stay"
+
+
 class TokenType(str, enum.Enum):
     ACCESS = "access"
     REFRESH = "refresh"
@@ -61,19 +79,51 @@ class Property(Base):
     city: Mapped[str] = mapped_column(String(255))
     beds: Mapped[int] = mapped_column(default=1)
     price: Mapped[float] = mapped_column(default=0.0)
+    latitude: Mapped[float | None]
+    longitude: Mapped[float | None]
+    geohash: Mapped[str | None] = mapped_column(String(12), index=True)
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR().with_variant(Text(), "sqlite"), deferred=True
+    )
     status: Mapped[PropertyStatus] = mapped_column(default=PropertyStatus.AVAILABLE)
     created_at: Mapped[datetime] = mapped_column(default=datetime.now)
 
     bookings: Mapped[list["Booking"]] = relationship(back_populates="property")
     user: Mapped["User"] = relationship(back_populates="properties", lazy="selectin")
+    pricing_rules: Mapped[list["PricingRule"]] = relationship(
+        back_populates="property", cascade="all, delete-orphan", passive_deletes=True
+    )
+
+    __table_args__ = (
+        Index(
+            "ix_properties_search_vector", "search_vector", postgresql_using="gin"
+        ).ddl_if(dialect="postgresql"),
+    )
+
+
+# SQLite has no tsvector; tests search through an FTS5 table instead
+event.listen(
+    Property.__table__,
+    "after_create",
+    DDL(
+        "CREATE VIRTUAL TABLE properties_fts USING fts5(title, description)"
+    ).execute_if(dialect="sqlite"),
+)
+event.listen(
+    Property.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS properties_fts").execute_if(dialect="sqlite"),
+)
 
 
 class Booking(Base):
+    # On Postgres the table is range-partitioned by check_in and its primary
+    # key is (id, check_in); id alone stays unique and is the ORM identity.
     __tablename__ = "bookings"
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     property_id: Mapped[int] = mapped_column(ForeignKey("properties.id"))
-    guest_id: Mapped[int] = mapped_column(ForeignKey("users.id"), default=1)
+    guest_id: Mapped[int] = mapped_column(ForeignKey("users.id"), default=1, index=True)
     check_in: Mapped[date] = mapped_column(default=datetime.now)
     check_out: Mapped[date] = mapped_column(default=datetime.now)
     guests: Mapped[int] = mapped_column(default=1)
@@ -87,3 +137,121 @@ class Booking(Base):
         back_populates="bookings", lazy="joined"
     )
     user: Mapped["User"] = relationship(back_populates="bookings", lazy="joined")
+
+    # Availability checks only look at active bookings; finished and
+    # cancelled history stays out of the index
+    __table_args__ = (
+        Index(
+            "ix_bookings_active",
+            "property_id",
+            "check_in",
+            "check_out",
+            postgresql_where=text("status IN ('PENDING', 'CONFIRMED')"),
+            sqlite_where=text("status IN ('PENDING', 'CONFIRMED')"),
+        ),
+    )
+
+
+class PricingRule(Base):
+    __tablename__ = "pricing_rules"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    property_id: Mapped[int] = mapped_column(
+        ForeignKey("properties.id", ondelete="CASCADE"), index=True
+    )
+    kind: Mapped[PricingRuleKind]
+    start_date: Mapped[date | None] = mapped_column(default=None)
+    end_date: Mapped[date | None] = mapped_column(default=None)
+    price: Mapped[float | None] = mapped_column(default=None)
+    multiplier: Mapped[float] = mapped_column(default=1.0)
+    min_nights: Mapped[int | None] = mapped_column(default=None)
+    discount: Mapped[float] = mapped_column(default=0.0)
+    created_at: Mapped[datetime] = mapped_column(default=datetime.now)
+
+    property: Mapped["Property"] = relationship(back_populates="pricing_rules")
+
+
+class OutboxMessage(Base):
+    __tablename__ = "outbox"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    task_name: Mapped[str] = mapped_column(String(255))
+    payload: Mapped[dict] = mapped_column(JSON, default=dict)
+    attempts: Mapped[int] = mapped_column(default=0)
+    created_at: Mapped[datetime] = mapped_column(default=datetime.now)
+    published_at: Mapped[datetime | None] = mapped_column(default=None)
+
+    __table_args__ = (
+        Index(
+            "ix_outbox_unpublished",
+            "id",
+            postgresql_where=text("published_at IS NULL"),
+            sqlite_where=text("published_at IS NULL"),
+        ),
+    )
+
+
+class IdempotencyKey(Base):
+    __tablename__ = "idempotency_keys"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
+    key: Mapped[str] = mapped_column(String(255))
+    request_hash: Mapped[str] = mapped_column(String(64))
+    status_code: Mapped[int | None] = mapped_column(default=None)
+    response_body: Mapped[str | None] = mapped_column(Text, default=None)
+    claim_token: Mapped[str | None] = mapped_column(String(32), default=None)
+    executed: Mapped[bool] = mapped_column(default=False)
+    created_at: Mapped[datetime] = mapped_column(default=datetime.now)
+    expires_at: Mapped[datetime] = mapped_column(index=True)
+
+    __table_args__ = (UniqueConstraint("user_id", "key"),)
+
+
+class WebhookSubscription(Base):
+    __tablename__ = "webhook_subscriptions"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    host_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), index=True
+    )
+    url: Mapped[str] = mapped_column(String(2048))
+    secret: Mapped[str] = mapped_column(String(64))
+    events: Mapped[list[str]] = mapped_column(JSON, default=list)
+    created_at: Mapped[datetime] = mapped_column(default=datetime.now)
+
+
+class WebhookDelivery(Base):
+    """A webhook event waiting to be sent, deleted once delivered."""
+
+    __tablename__ = "webhook_deliveries"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    subscription_id: Mapped[int] = mapped_column(
+        ForeignKey("webhook_subscriptions.id", ondelete="CASCADE"), index=True
+    )
+    event: Mapped[str] = mapped_column(String(64))
+    payload: Mapped[dict] = mapped_column(JSON, default=dict)
+    attempts: Mapped[int] = mapped_column(default=0)
+    last_error: Mapped[str | None] = mapped_column(Text, default=None)
+    created_at: Mapped[datetime] = mapped_column(default=datetime.now)
+    next_attempt_at: Mapped[datetime] = mapped_column(default=datetime.now, index=True)
+
+    subscription: Mapped["WebhookSubscription"] = relationship()
+
+
+class WebhookDeadLetter(Base):
+    """A webhook event given up on after the maximum number of attempts."""
+
+    __tablename__ = "webhook_dead_letters"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    subscription_id: Mapped[int] = mapped_column(
+        ForeignKey("webhook_subscriptions.id", ondelete="CASCADE"), index=True
+    )
+    event: Mapped[str] = mapped_column(String(64))
+    payload: Mapped[dict] = mapped_column(JSON, default=dict)
+    attempts: Mapped[int] = mapped_column()
+    last_error: Mapped[str | None] = mapped_column(Text, default=None)
+    created_at: Mapped[datetime] = mapped_column()
+    failed_at: Mapped[datetime] = mapped_column(default=datetime.now)
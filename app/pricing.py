@@ -0,0 +1,102 @@
+from datetime import date, timedelta
+
+import numpy as np
+
+from app.models import PricingRule, PricingRuleKind
+
+# Nights starting on Friday and Saturday
+WEEKEND_DAYS = (4, 5)
+
+
+class NightlyRates:
+    """Nightly prices for a property over ``[start, end)``.
+
+    Rates are materialized once into an array and turned into a prefix sum, so
+    pricing any stay inside the window is two lookups and a subtraction.
+    Rule precedence: seasonal and weekend multipliers stack on top of the base
+    price, per-date overrides replace the result, and the largest matching
+    length-of-stay discount applies to the whole stay.
+    """
+
+    def __init__(
+        self, base_price: float, rules: list[PricingRule], start: date, end: date
+    ):
+        self.start = start
+        self.end = end
+        days = (end - start).days
+        offsets = np.arange(days)
+
+        rates = np.full(days, base_price, dtype=np.float64)
+        weekdays = (start.weekday() + offsets) % 7
+
+        overrides = []
+        discounts = []
+        for rule in rules:
+            if rule.kind == PricingRuleKind.WEEKEND:
+                rates[np.isin(weekdays, WEEKEND_DAYS)] *= rule.multiplier
+            elif rule.kind == PricingRuleKind.SEASONAL:
+                rates[self._slice(rule.start_date, rule.end_date)] *= rule.multiplier
+            elif rule.kind == PricingRuleKind.OVERRIDE:
+                overrides.append(rule)
+            elif rule.kind == PricingRuleKind.LENGTH_OF_STAY:
+                discounts.append((rule.min_nights, rule.discount))
+
+        for rule in overrides:
+            rates[self._slice(rule.start_date, rule.end_date)] = rule.price
+
+        self.rates = rates
+        self.cumulative = np.concatenate(([0.0], np.cumsum(rates)))
+
+        discounts.sort()
+        self.discount_nights = np.array([n for n, _ in discounts], dtype=np.int64)
+        self.discount_rates = np.maximum.accumulate(
+            np.array([d for _, d in discounts], dtype=np.float64)
+        )
+
+    def _slice(self, first: date | None, last: date | None) -> slice:
+        lo = 0 if first is None else max((first - self.start).days, 0)
+        hi = len(self.rates) if last is None else (last - self.start).days + 1
+        return slice(lo, max(hi, lo))
+
+    def quote(
+        self, check_ins: list[date], check_outs: list[date], guests: int = 1
+    ) -> tuple[np.ndarray, np.ndarray]:
+        lo = np.array([(d - self.start).days for d in check_ins], dtype=np.int64)
+        hi = np.array([(d - self.start).days for d in check_outs], dtype=np.int64)
+        if lo.size and (lo.min() < 0 or hi.max() > len(self.rates)):
+            raise ValueError("Stay is outside of the priced range")
+
+        nights = hi - lo
+        totals = self.cumulative[hi] - self.cumulative[lo]
+
+        if self.discount_nights.size:
+            index = np.searchsorted(self.discount_nights, nights, side="right") - 1
+            discount = np.where(
+                index >= 0, self.discount_rates[np.maximum(index, 0)], 0.0
+            )
+            totals = totals * (1.0 - discount)
+
+        return nights, np.round(totals * guests, 2)
+
+
+def quote_stays(
+    base_price: float,
+    rules: list[PricingRule],
+    stays: list[tuple[date, date]],
+    guests: int = 1,
+) -> tuple[np.ndarray, np.ndarray]:
+    check_ins = [check_in for check_in, _ in stays]
+    check_outs = [check_out for _, check_out in stays]
+    rates = NightlyRates(base_price, rules, min(check_ins), max(check_outs))
+    return rates.quote(check_ins, check_outs, guests)
+
+
+def quote_stay(
+    base_price: float,
+    rules: list[PricingRule],
+    check_in: date,
+    check_out: date,
+    guests: int = 1,
+) -> float:
+    _, totals = quote_stays(base_price, rules, [(check_in, check_out)], guests)
+    return float(totals[0])
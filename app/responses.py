@@ -0,0 +1,58 @@
+import types
+from functools import lru_cache, reduce
+from operator import or_
+from typing import Annotated, Any, Union, get_args, get_origin
+
+from fastapi import Response, status
+from pydantic import BaseModel, EmailStr, TypeAdapter, create_model
+
+
+@lru_cache
+def _stored_type(tp: Any) -> Any:
+    """``tp`` with every ``EmailStr`` replaced by ``str``.
+
+    Response data comes from our own rows, whose addresses were validated on
+    the way in, so re-running email-validator on each serialized user is
+    pure overhead. The rewritten types dump to the same JSON.
+    """
+    if tp is EmailStr:
+        return str
+    if isinstance(tp, type) and issubclass(tp, BaseModel):
+        # Subclassing keeps the model's validators, serializers, computed
+        # fields and config; only the fields that change are overridden
+        overrides = {}
+        for name, field in tp.model_fields.items():
+            stored = _stored_type(field.annotation)
+            if stored != field.annotation:
+                overrides[name] = (stored, field)
+        if not overrides:
+            return tp
+        return create_model(f"Stored{tp.__name__}", __base__=tp, **overrides)
+
+    origin, args = get_origin(tp), get_args(tp)
+    if origin is Annotated:
+        return Annotated[(_stored_type(args[0]), *tp.__metadata__)]
+    if origin in (Union, types.UnionType):
+        return reduce(or_, (_stored_type(arg) for arg in args))
+    if origin is not None and args:
+        return origin[tuple(_stored_type(arg) for arg in args)]
+    return tp
+
+
+@lru_cache
+def _type_adapter(response_type: Any) -> TypeAdapter:
+    return TypeAdapter(_stored_type(response_type))
+
+
+def json_response(
+    response_type: Any, data: Any, status_code: int = status.HTTP_200_OK
+) -> Response:
+    """Validates ``data`` once against ``response_type`` and serializes it
+    straight to JSON bytes with pydantic-core, bypassing FastAPI's
+    ``response_model`` re-validation and ``jsonable_encoder``.
+    """
+    adapter = _type_adapter(response_type)
+    content = adapter.dump_json(adapter.validate_python(data, from_attributes=True))
+    return Response(
+        content=content, status_code=status_code, media_type="application/json"
+    )
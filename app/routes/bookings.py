@@ -1,32 +1,129 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import logging
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.admission import Admission
+from app.config import settings
 from app.crud import (
     create_booking,
     get_bookings,
     get_booking,
+    get_bookings_by_ids,
     cancel_booking,
     confirm_booking,
+    enqueue_booking_confirmation,
     check_property_owner,
     check_booking_owner,
+    create_hold,
 )
 from app.database import get_db
-from app.dependencies import get_current_user
+from app.dependencies import (
+    admit_booking,
+    admit_write,
+    get_current_user,
+    get_loaders,
+)
+from app.holds import get_hold_store
+from app.idempotency import idempotent, request_fingerprint
 from app.models import User, UserRole
-from app.schemas import BookingCreate, BookingResponse
+from app.responses import json_response
+from app.schemas import (
+    BookingCreate,
+    BookingLookup,
+    BookingLookupRequest,
+    BookingResponse,
+    HoldResponse,
+    LookupStatus,
+    parse_fields,
+    sparse_model,
+)
+from app.worker.publisher import PublisherFull, task_publisher
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/bookings", tags=["bookings"], dependencies=[Depends(get_loaders)]
+)
 
-from app.worker.tasks import process_booking_confirmation
-from celery.result import AsyncResult
 
-router = APIRouter(prefix="/bookings", tags=["bookings"])
+def _booking_error(e: ValueError) -> HTTPException:
+    error_msg = str(e)
+    if "not found" in error_msg.lower():
+        return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error_msg)
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error_msg)
+
+
+async def _book(
+    db: AsyncSession, user: User, booking: BookingCreate, hold_id: str | None = None
+):
+    try:
+        new_booking = await create_booking(db, user.id, booking)
+        await enqueue_booking_confirmation(db, new_booking, user)
+        await db.commit()
+        await db.refresh(new_booking)
+    except ValueError as e:
+        raise _booking_error(e)
+
+    if hold_id is not None:
+        await get_hold_store().release(hold_id)
+
+    try:
+        await task_publisher.publish(
+            "app.celery.tasks.relay_outbox",
+            coalesce=True,
+            timeout=settings.TASK_PUBLISHER_TIMEOUT,
+        )
+    except PublisherFull:
+        # Counted in the publisher metrics; the outbox row is already
+        # committed, so the periodic relay_outbox run still delivers it
+        logger.warning("Task publisher is full, leaving the outbox to the beat relay")
+
+    new_booking = await confirm_booking(db, new_booking.id)
+    return json_response(
+        BookingResponse, new_booking, status_code=status.HTTP_201_CREATED
+    )
 
 
 @router.get("", response_model=list[BookingResponse])
 async def list_bookings(
-    db: AsyncSession = Depends(get_db), user: User = Depends(get_current_user)
+    fields: str | None = None,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    try:
+        selected = parse_fields(BookingResponse, fields)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    bookings = await get_bookings(db, user.id, fields=selected)
+    if selected:
+        return json_response(list[sparse_model(BookingResponse, selected)], bookings)
+    return json_response(list[BookingResponse], bookings)
+
+
+@router.post("/lookup", response_model=BookingLookup)
+async def lookup_bookings(
+    lookup: BookingLookupRequest,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
 ):
-    bookings = await get_bookings(db, user.id)
-    return bookings
+    # Bookings come with their property joined, so access to every item is
+    # decided from the one query
+    bookings = await get_bookings_by_ids(db, lookup.ids)
+    items = []
+    for booking_id, booking in zip(lookup.ids, bookings):
+        if booking is None:
+            items.append({"id": booking_id, "status": LookupStatus.NOT_FOUND})
+        elif (
+            user.role == UserRole.ADMIN
+            or booking.guest_id == user.id
+            or booking.property.host_id == user.id
+        ):
+            items.append({"id": booking_id, "status": LookupStatus.OK, "item": booking})
+        else:
+            items.append({"id": booking_id, "status": LookupStatus.FORBIDDEN})
+    return json_response(BookingLookup, {"items": items})
 
 
 @router.get("/{booking_id}", response_model=BookingResponse)
@@ -41,10 +138,12 @@ async def get_booking_detail(
             status_code=status.HTTP_404_NOT_FOUND, detail="Booking not found"
         )
 
-    is_property_owner = await check_property_owner(db, booking.property_id, user.id)
+    # Both checks reuse the booking loaded above; the property is only
+    # fetched when the user is not the guest
     is_booking_guest = await check_booking_owner(db, booking_id, user.id)
-
-    if not is_property_owner and not is_booking_guest:
+    if not is_booking_guest and not await check_property_owner(
+        db, booking.property_id, user.id
+    ):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions"
         )
@@ -55,38 +154,103 @@ async def get_booking_detail(
 @router.post("", response_model=BookingResponse, status_code=status.HTTP_201_CREATED)
 async def place_booking(
     booking: BookingCreate,
+    request: Request,
+    idempotency_key: str | None = Header(None, max_length=255),
+    admitted: Admission = Depends(admit_booking),
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
-    from typing import cast
-    from celery import Task
+    async def handler():
+        if user.role == UserRole.HOST:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Only customers can place bookings",
+            )
+        return await _book(db, user, booking)
+
+    return await idempotent(
+        db,
+        user.id,
+        idempotency_key,
+        request_fingerprint(request, booking),
+        handler,
+        admission=admitted,
+    )
 
+
+@router.post("/holds", response_model=HoldResponse, status_code=status.HTTP_201_CREATED)
+async def place_hold(
+    booking: BookingCreate,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
     if user.role == UserRole.HOST:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only customers can place bookings",
         )
     try:
-        new_booking = await create_booking(db, user.id, booking)
-        await db.commit()
-        await db.refresh(new_booking)
+        hold = await create_hold(db, user.id, booking)
+    except ValueError as e:
+        raise _booking_error(e)
+    if hold is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="The selected dates are held by another guest",
+        )
+    return hold
+
 
-        cast(Task, process_booking_confirmation).delay(
-            booking_id=new_booking.id, user_email=user.email
+async def _get_own_hold(hold_id: str, user: User):
+    hold = await get_hold_store().get(hold_id)
+    if hold is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Hold not found"
         )
+    if hold.guest_id != user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions"
+        )
+    return hold
+
 
-        new_booking = await confirm_booking(db, new_booking.id)
-        return new_booking
+@router.post(
+    "/holds/{hold_id}/confirm",
+    response_model=BookingResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def confirm_hold(
+    hold_id: str,
+    _admission: None = Depends(admit_write),
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    hold = await _get_own_hold(hold_id, user)
+    try:
+        booking = BookingCreate(
+            property_id=hold.property_id,
+            check_in=hold.check_in,
+            check_out=hold.check_out,
+            guests=hold.guests,
+        )
     except ValueError as e:
-        error_msg = str(e)
-        if "not found" in error_msg.lower():
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error_msg)
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error_msg)
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return await _book(db, user, booking, hold_id=hold.id)
+
+
+@router.delete("/holds/{hold_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def release_hold(
+    hold_id: str,
+    user: User = Depends(get_current_user),
+):
+    hold = await _get_own_hold(hold_id, user)
+    await get_hold_store().release(hold.id)
 
 
 @router.delete("/{booking_id}", response_model=BookingResponse)
 async def delete_booking(
     booking_id: int,
+    _admission: None = Depends(admit_write),
     user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
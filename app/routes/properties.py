@@ -1,32 +1,65 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import date
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.crud import (
+    archive_property,
     create_property,
     delete_property,
     get_user,
     get_property,
     get_properties,
+    get_properties_by_ids,
     update_property,
     get_property_for_update,
+    get_property_calendar,
     check_property_owner,
+    property_exists,
+    property_has_bookings,
+    get_pricing_rules,
+    create_pricing_rule,
+    delete_pricing_rule,
 )
+from app.availability import blocked_runs
+from app.pricing import quote_stays
+from app.config import settings
 from app.database import get_db
-from app.dependencies import get_admin_user, get_current_user
+from app.dependencies import get_admin_user, get_current_user, get_loaders
+from app.idempotency import idempotent, request_fingerprint
 from app.models import User, UserRole
+from app.responses import json_response
 from app.schemas import (
+    PropertyArchived,
     PropertyCreate,
     PropertyResponse,
     PropertyUpdate,
     PaginatedProperties,
     PropertyFilter,
+    PropertyLookup,
+    LookupStatus,
+    PropertyCalendar,
+    DateRange,
+    PricingRuleCreate,
+    PricingRuleResponse,
+    Quote,
+    QuoteRequest,
+    QuoteResponse,
+    parse_fields,
+    parse_ids,
+    sparse_page_model,
 )
+from app.streams import property_events
 
-router = APIRouter(prefix="/properties", tags=["properties"])
+router = APIRouter(
+    prefix="/properties", tags=["properties"], dependencies=[Depends(get_loaders)]
+)
 
 
-@router.get("", response_model=PaginatedProperties)
+@router.get("", response_model=PaginatedProperties | PropertyLookup)
 async def list_properties(
+    ids: str | None = None,
     limit: int = 100,
     offset: int = 0,
     host_id: int | None = None,
@@ -34,22 +67,76 @@ async def list_properties(
     max_price: float | None = None,
     city: str | None = None,
     beds: int | None = None,
+    q: str | None = None,
+    lat: float | None = None,
+    lon: float | None = None,
+    radius_km: float | None = None,
+    min_lat: float | None = None,
+    max_lat: float | None = None,
+    min_lon: float | None = None,
+    max_lon: float | None = None,
+    fields: str | None = None,
     db: AsyncSession = Depends(get_db),
 ):
-    filters = PropertyFilter(
-        min_price=min_price, max_price=max_price, city=city, beds=beds
-    )
+    if ids is not None:
+        return await _lookup_properties(ids, db)
+
+    try:
+        selected = parse_fields(PropertyResponse, fields, exclude=frozenset({"user"}))
+        filters = PropertyFilter(
+            min_price=min_price,
+            max_price=max_price,
+            city=city,
+            beds=beds,
+            q=q,
+            lat=lat,
+            lon=lon,
+            radius_km=radius_km,
+            min_lat=min_lat,
+            max_lat=max_lat,
+            min_lon=min_lon,
+            max_lon=max_lon,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     properties, total = await get_properties(
-        db, skip=offset, limit=limit, host_id=host_id, filters=filters
+        db,
+        skip=offset,
+        limit=limit,
+        host_id=host_id,
+        filters=filters,
+        fields=selected,
     )
 
-    return PaginatedProperties(
-        items=[
-            PropertyResponse.model_validate(property_obj) for property_obj in properties
-        ],
-        limit=limit,
-        offset=offset,
-        total=total,
+    return json_response(
+        (
+            sparse_page_model(PropertyResponse, selected)
+            if selected
+            else PaginatedProperties
+        ),
+        {"items": properties, "limit": limit, "offset": offset, "total": total},
+    )
+
+
+async def _lookup_properties(ids: str, db: AsyncSession):
+    try:
+        requested = parse_ids(ids)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    properties = await get_properties_by_ids(db, requested)
+    return json_response(
+        PropertyLookup,
+        {
+            "items": [
+                {
+                    "id": property_id,
+                    "status": (LookupStatus.OK if property else LookupStatus.NOT_FOUND),
+                    "item": property,
+                }
+                for property_id, property in zip(requested, properties)
+            ]
+        },
     )
 
 
@@ -63,6 +150,145 @@ async def get_property_detail(property_id: int, db: AsyncSession = Depends(get_d
     return property
 
 
+@router.get("/{property_id}/calendar", response_model=PropertyCalendar)
+async def get_property_availability(
+    property_id: int,
+    start: date = Query(alias="from"),
+    end: date = Query(alias="to"),
+    db: AsyncSession = Depends(get_db),
+):
+    if end < start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'to' must not be before 'from'",
+        )
+    if (end - start).days >= settings.CALENDAR_MAX_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Calendar range is limited to {settings.CALENDAR_MAX_DAYS} days",
+        )
+    if not await property_exists(db, property_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Property not found"
+        )
+
+    days = await get_property_calendar(db, property_id, start, end)
+    return PropertyCalendar(
+        property_id=property_id,
+        start=start,
+        end=end,
+        days=days,
+        blocked=[DateRange(start=s, end=e) for s, e in blocked_runs(start, days)],
+    )
+
+
+@router.get("/{property_id}/events", response_class=StreamingResponse)
+async def stream_property_events(property_id: int, db: AsyncSession = Depends(get_db)):
+    if not await property_exists(db, property_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Property not found"
+        )
+    # The stream outlives the handler; don't pin a pooled connection for it
+    await db.commit()
+
+    return StreamingResponse(
+        property_events.stream(property_id, settings.EVENT_STREAM_HEARTBEAT),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/{property_id}/quotes", response_model=QuoteResponse)
+async def quote_property_stays(
+    property_id: int,
+    quote_request: QuoteRequest,
+    db: AsyncSession = Depends(get_db),
+):
+    property = await get_property(db, property_id)
+    if not property:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Property not found"
+        )
+
+    stays = [(stay.check_in, stay.check_out) for stay in quote_request.stays]
+    nights, totals = quote_stays(
+        property.price,
+        await get_pricing_rules(db, property_id),
+        stays,
+        quote_request.guests,
+    )
+    return QuoteResponse(
+        property_id=property_id,
+        guests=quote_request.guests,
+        quotes=[
+            Quote(
+                check_in=check_in,
+                check_out=check_out,
+                nights=stay_nights,
+                total_price=total,
+            )
+            for (check_in, check_out), stay_nights, total in zip(
+                stays, nights.tolist(), totals.tolist()
+            )
+        ],
+    )
+
+
+@router.get("/{property_id}/pricing-rules", response_model=list[PricingRuleResponse])
+async def list_pricing_rules(property_id: int, db: AsyncSession = Depends(get_db)):
+    if not await property_exists(db, property_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Property not found"
+        )
+    return await get_pricing_rules(db, property_id)
+
+
+@router.post(
+    "/{property_id}/pricing-rules",
+    response_model=PricingRuleResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def add_pricing_rule(
+    property_id: int,
+    rule: PricingRuleCreate,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    if not await property_exists(db, property_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Property not found"
+        )
+    if user.role != UserRole.ADMIN and not await check_property_owner(
+        db, property_id, user.id
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions"
+        )
+    return await create_pricing_rule(db, property_id, rule)
+
+
+@router.delete(
+    "/{property_id}/pricing-rules/{rule_id}", status_code=status.HTTP_204_NO_CONTENT
+)
+async def remove_pricing_rule(
+    property_id: int,
+    rule_id: int,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    if user.role != UserRole.ADMIN and not await check_property_owner(
+        db, property_id, user.id
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions"
+        )
+    if not await delete_pricing_rule(db, property_id, rule_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Pricing rule not found"
+        )
+    return None
+
+
 @router.post(
     "",
     response_model=PropertyResponse,
@@ -70,16 +296,26 @@ async def get_property_detail(property_id: int, db: AsyncSession = Depends(get_d
 )
 async def add_property(
     property: PropertyCreate,
+    request: Request,
+    idempotency_key: str | None = Header(None, max_length=255),
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
-    if user.role == UserRole.CUSTOMER:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only host users can add properties",
+    async def handler():
+        if user.role == UserRole.CUSTOMER:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Only host users can add properties",
+            )
+
+        new_property = await create_property(db, property, user.id)
+        return json_response(
+            PropertyResponse, new_property, status_code=status.HTTP_201_CREATED
         )
 
-    return await create_property(db, property, user.id)
+    return await idempotent(
+        db, user.id, idempotency_key, request_fingerprint(request, property), handler
+    )
 
 
 @router.patch("/{property_id}", response_model=PropertyResponse)
@@ -131,9 +367,37 @@ async def remove_property(
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions"
         )
+    if await property_has_bookings(db, property_id):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Property has bookings; archive it instead",
+        )
     deleted = await delete_property(db, property_id)
     if not deleted:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to delete"
         )
     return None
+
+
+@router.post("/{property_id}/archive", response_model=PropertyArchived)
+async def archive_property_listing(
+    property_id: int,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    property = await get_property_for_update(db, property_id)
+    if not property:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Property not found"
+        )
+    if user.role != UserRole.ADMIN and property.host_id != user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions"
+        )
+
+    cancelled = await archive_property(db, property)
+    await db.commit()
+    return PropertyArchived(
+        id=property.id, status=property.status, cancelled_booking_ids=cancelled
+    )
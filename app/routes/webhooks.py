@@ -0,0 +1,71 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud import (
+    create_webhook_subscription,
+    delete_webhook_subscription,
+    get_webhook_subscriptions,
+)
+from app.database import get_db
+from app.dependencies import get_current_user
+from app.models import User, UserRole
+from app.schemas import (
+    WebhookSubscriptionCreate,
+    WebhookSubscriptionCreated,
+    WebhookSubscriptionResponse,
+)
+from app.webhooks import check_webhook_url_async
+
+router = APIRouter(prefix="/webhooks", tags=["webhooks"])
+
+
+def _require_host(user: User) -> None:
+    if user.role != UserRole.HOST:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only host users can manage webhooks",
+        )
+
+
+@router.get("", response_model=list[WebhookSubscriptionResponse])
+async def list_webhooks(
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    _require_host(user)
+    return await get_webhook_subscriptions(db, user.id)
+
+
+@router.post(
+    "",
+    response_model=WebhookSubscriptionCreated,
+    status_code=status.HTTP_201_CREATED,
+)
+async def add_webhook(
+    subscription: WebhookSubscriptionCreate,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    _require_host(user)
+    try:
+        await check_webhook_url_async(str(subscription.url))
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT, detail=str(e)
+        )
+    # The signing secret is only ever returned here
+    return await create_webhook_subscription(db, user.id, subscription)
+
+
+@router.delete("/{subscription_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def remove_webhook(
+    subscription_id: int,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    _require_host(user)
+    if not await delete_webhook_subscription(db, subscription_id, user.id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Webhook not found"
+        )
+    return None
@@ -1,15 +1,30 @@
+import enum
 from datetime import datetime, date
+from functools import lru_cache
 
 from pydantic import (
     BaseModel,
     ConfigDict,
     EmailStr,
     Field,
+    HttpUrl,
+    create_model,
     field_validator,
     ValidationInfo,
+    model_validator,
 )
 
-from app.models import UserRole, BookingStatus, PropertyStatus, Property
+from app.config import settings
+from app.models import (
+    UserRole,
+    BookingStatus,
+    PropertyStatus,
+    PricingRuleKind,
+    Property,
+    Booking,
+    User,
+)
+from app.webhooks import WEBHOOK_EVENTS, WebhookEvent
 
 
 class UserCreate(BaseModel):
@@ -37,6 +52,14 @@ class PropertyBase(BaseModel):
     city: str = Field(..., min_length=3, max_length=255)
     beds: int = Field(..., ge=1, le=10)
     price: float = Field(..., ge=0.0)
+    latitude: float | None = Field(None, ge=-90.0, le=90.0)
+    longitude: float | None = Field(None, ge=-180.0, le=180.0)
+
+    @model_validator(mode="after")
+    def check_coordinates(self) -> "PropertyBase":
+        if (self.latitude is None) != (self.longitude is None):
+            raise ValueError("latitude and longitude must be set together")
+        return self
 
 
 class PropertyCreate(PropertyBase):
@@ -48,6 +71,14 @@ class PropertyFilter(BaseModel):
     beds: int | None
     min_price: float | None
     max_price: float | None
+    q: str | None = Field(None, min_length=1, max_length=200)
+    lat: float | None = Field(None, ge=-90.0, le=90.0)
+    lon: float | None = Field(None, ge=-180.0, le=180.0)
+    radius_km: float | None = Field(None, gt=0.0, le=500.0)
+    min_lat: float | None = Field(None, ge=-90.0, le=90.0)
+    max_lat: float | None = Field(None, ge=-90.0, le=90.0)
+    min_lon: float | None = Field(None, ge=-180.0, le=180.0)
+    max_lon: float | None = Field(None, ge=-180.0, le=180.0)
 
     @field_validator("min_price", "max_price")
     @classmethod
@@ -58,6 +89,21 @@ class PropertyFilter(BaseModel):
             raise ValueError("Price must be positive")
         return value
 
+    @model_validator(mode="after")
+    def check_geo(self) -> "PropertyFilter":
+        near = (self.lat, self.lon, self.radius_km)
+        if any(v is not None for v in near) and any(v is None for v in near):
+            raise ValueError("lat, lon and radius_km must be set together")
+        bbox = (self.min_lat, self.max_lat, self.min_lon, self.max_lon)
+        if any(v is not None for v in bbox):
+            if any(v is None for v in bbox):
+                raise ValueError(
+                    "min_lat, max_lat, min_lon and max_lon must be set together"
+                )
+            if self.min_lat > self.max_lat or self.min_lon > self.max_lon:
+                raise ValueError("Bounding box minimum must not exceed its maximum")
+        return self
+
 
 class PropertyUpdate(BaseModel):
     title: str | None = Field(None, min_length=3, max_length=255)
@@ -66,6 +112,16 @@ class PropertyUpdate(BaseModel):
     city: str | None = Field(None, min_length=3, max_length=255)
     beds: int | None = Field(None, ge=1, le=10)
     price: float | None = Field(None, ge=0.0)
+    latitude: float | None = Field(None, ge=-90.0, le=90.0)
+    longitude: float | None = Field(None, ge=-180.0, le=180.0)
+
+    @model_validator(mode="after")
+    def check_coordinates(self) -> "PropertyUpdate":
+        if ("latitude" in self.model_fields_set) != (
+            "longitude" in self.model_fields_set
+        ) or (self.latitude is None) != (self.longitude is None):
+            raise ValueError("latitude and longitude must be set together")
+        return self
 
 
 class PropertyResponse(BaseModel):
@@ -79,11 +135,19 @@ class PropertyResponse(BaseModel):
     city: str
     beds: int
     price: float
+    latitude: float | None = None
+    longitude: float | None = None
     status: PropertyStatus
     created_at: datetime
     user: UserResponse
 
 
+class PropertyArchived(BaseModel):
+    id: int
+    status: PropertyStatus
+    cancelled_booking_ids: list[int]
+
+
 class PaginatedProperties(BaseModel):
     items: list[PropertyResponse]
     total: int
@@ -91,6 +155,82 @@ class PaginatedProperties(BaseModel):
     offset: int
 
 
+class LookupStatus(str, enum.Enum):
+    OK = "ok"
+    NOT_FOUND = "not_found"
+    FORBIDDEN = "forbidden"
+
+
+class PropertyLookupItem(BaseModel):
+    id: int
+    status: LookupStatus
+    item: PropertyResponse | None = None
+
+
+class PropertyLookup(BaseModel):
+    items: list[PropertyLookupItem]
+
+
+def parse_fields(
+    model: type[BaseModel], fields: str | None, exclude: frozenset[str] = frozenset()
+) -> tuple[str, ...] | None:
+    if not fields:
+        return None
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    allowed = [name for name in model.model_fields if name not in exclude]
+    unknown = requested - set(allowed)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return tuple(name for name in allowed if name == "id" or name in requested)
+
+
+def parse_ids(ids: str) -> list[int]:
+    try:
+        parsed = [int(part) for part in ids.split(",") if part.strip()]
+    except ValueError:
+        raise ValueError("ids must be a comma-separated list of integers")
+    if not parsed:
+        raise ValueError("ids must not be empty")
+    if len(parsed) > settings.LOOKUP_MAX_IDS:
+        raise ValueError(f"At most {settings.LOOKUP_MAX_IDS} ids can be requested")
+    return parsed
+
+
+@lru_cache
+def sparse_model(model: type[BaseModel], fields: tuple[str, ...]) -> type[BaseModel]:
+    return create_model(
+        f"{model.__name__}Sparse",
+        __config__=ConfigDict(from_attributes=True),
+        **{name: (model.model_fields[name].annotation, ...) for name in fields},
+    )
+
+
+@lru_cache
+def sparse_page_model(
+    model: type[BaseModel], fields: tuple[str, ...]
+) -> type[BaseModel]:
+    return create_model(
+        f"Paginated{model.__name__}Sparse",
+        items=(list[sparse_model(model, fields)], ...),
+        total=(int, ...),
+        limit=(int, ...),
+        offset=(int, ...),
+    )
+
+
+class DateRange(BaseModel):
+    start: date
+    end: date
+
+
+class PropertyCalendar(BaseModel):
+    property_id: int
+    start: date = Field(serialization_alias="from")
+    end: date = Field(serialization_alias="to")
+    days: str
+    blocked: list[DateRange]
+
+
 class BookingCreate(BaseModel):
     property_id: int
     guests: int
@@ -109,9 +249,26 @@ class BookingCreate(BaseModel):
     def check_out_must_be_after_start(cls, v: date, info: ValidationInfo) -> date:
         if "check_in" in info.data and v <= info.data["check_in"]:
             raise ValueError("Check-out must be after check-in")
+        if (
+            "check_in" in info.data
+            and (v - info.data["check_in"]).days > settings.MAX_STAY_NIGHTS
+        ):
+            raise ValueError(f"Stays are limited to {settings.MAX_STAY_NIGHTS} nights")
         return v
 
 
+class HoldResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    property_id: int
+    guest_id: int
+    guests: int
+    check_in: date
+    check_out: date
+    expires_at: datetime
+
+
 class BookingResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
@@ -128,6 +285,120 @@ class BookingResponse(BaseModel):
     cancelled_at: datetime
 
 
+class BookingLookupRequest(BaseModel):
+    ids: list[int] = Field(min_length=1, max_length=settings.LOOKUP_MAX_IDS)
+
+
+class BookingLookupItem(BaseModel):
+    id: int
+    status: LookupStatus
+    item: BookingResponse | None = None
+
+
+class BookingLookup(BaseModel):
+    items: list[BookingLookupItem]
+
+
+class BookingSnapshot(BaseModel):
+    id: int
+    guest_id: int
+    guest_name: str
+    property_id: int
+    property_title: str
+    check_in: date
+    check_out: date
+    guests: int
+    total_price: float
+
+    @classmethod
+    def from_booking(
+        cls, booking: Booking, guest: User, property: Property
+    ) -> "BookingSnapshot":
+        return cls(
+            id=booking.id,
+            guest_id=booking.guest_id,
+            guest_name=f"{guest.first_name} {guest.last_name}",
+            property_id=booking.property_id,
+            property_title=property.title,
+            check_in=booking.check_in,
+            check_out=booking.check_out,
+            guests=booking.guests,
+            total_price=booking.total_price,
+        )
+
+
+class PricingRuleCreate(BaseModel):
+    kind: PricingRuleKind
+    start_date: date | None = None
+    end_date: date | None = None
+    price: float | None = Field(None, ge=0.0)
+    multiplier: float = Field(1.0, gt=0.0)
+    min_nights: int | None = Field(None, ge=1)
+    discount: float = Field(0.0, ge=0.0, lt=1.0)
+
+    @model_validator(mode="after")
+    def check_kind_fields(self) -> "PricingRuleCreate":
+        if self.kind in (PricingRuleKind.OVERRIDE, PricingRuleKind.SEASONAL):
+            if self.start_date is None or self.end_date is None:
+                raise ValueError("start_date and end_date are required")
+            if self.end_date < self.start_date:
+                raise ValueError("end_date must not be before start_date")
+        if self.kind == PricingRuleKind.OVERRIDE and self.price is None:
+            raise ValueError("price is required for override rules")
+        if self.kind == PricingRuleKind.LENGTH_OF_STAY and self.min_nights is None:
+            raise ValueError("min_nights is required for length_of_stay rules")
+        return self
+
+
+class PricingRuleResponse(PricingRuleCreate):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    property_id: int
+    created_at: datetime
+
+
+class StayDates(BaseModel):
+    check_in: date
+    check_out: date
+
+    @field_validator("check_out")
+    @classmethod
+    def check_out_must_be_after_start(cls, v: date, info: ValidationInfo) -> date:
+        if "check_in" in info.data and v <= info.data["check_in"]:
+            raise ValueError("Check-out must be after check-in")
+        return v
+
+
+class QuoteRequest(BaseModel):
+    guests: int = Field(1, ge=1)
+    stays: list[StayDates] = Field(..., min_length=1, max_length=500)
+
+    @model_validator(mode="after")
+    def check_span(self) -> "QuoteRequest":
+        # Nightly rates are built over the whole span of the request
+        start = min(stay.check_in for stay in self.stays)
+        end = max(stay.check_out for stay in self.stays)
+        if (end - start).days > settings.QUOTE_MAX_SPAN_DAYS:
+            raise ValueError(
+                f"Stays must fit within {settings.QUOTE_MAX_SPAN_DAYS} days"
+            )
+        return self
+
+
+class Quote(BaseModel):
+    check_in: date
+    check_out: date
+    nights: int
+    total_price: float
+
+
+class QuoteResponse(BaseModel):
+    property_id: int
+    guests: int
+    quotes: list[Quote]
+
+
 class Token(BaseModel):
     value: str
     token_type: str
@@ -146,3 +417,23 @@ class TokenData(BaseModel):
 class LoginRequest(BaseModel):
     email: EmailStr
     password: str
+
+
+class WebhookSubscriptionCreate(BaseModel):
+    url: HttpUrl
+    events: list[WebhookEvent] = Field(
+        default_factory=lambda: list(WEBHOOK_EVENTS), min_length=1
+    )
+
+
+class WebhookSubscriptionResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    url: str
+    events: list[str]
+    created_at: datetime
+
+
+class WebhookSubscriptionCreated(WebhookSubscriptionResponse):
+    secret: str
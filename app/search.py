@@ -0,0 +1,95 @@
+import re
+from dataclasses import dataclass
+
+from sqlalchemy import (
+    ColumnElement,
+    Select,
+    column,
+    delete,
+    func,
+    insert,
+    literal_column,
+    table,
+)
+
+from app.models import Property
+
+TEXT_SEARCH_CONFIG = "simple"
+SQLITE_FTS_TABLE = "properties_fts"
+
+_WORD = re.compile(r"\w+")
+
+# Bound parameters would need asyncpg codecs for regconfig and "char"
+_CONFIG = literal_column(f"'{TEXT_SEARCH_CONFIG}'::regconfig")
+_TITLE_WEIGHT = literal_column("'A'")
+_DESCRIPTION_WEIGHT = literal_column("'B'")
+
+properties_fts = table(
+    SQLITE_FTS_TABLE,
+    column("rowid"),
+    column("title"),
+    column("description"),
+    column("rank"),
+)
+
+
+def search_terms(q: str) -> list[str]:
+    return _WORD.findall(q.lower())
+
+
+def document_vector(title: str, description: str) -> ColumnElement:
+    """Weighted tsvector for a property, title ranking above description."""
+    return func.setweight(func.to_tsvector(_CONFIG, title), _TITLE_WEIGHT).op("||")(
+        func.setweight(func.to_tsvector(_CONFIG, description), _DESCRIPTION_WEIGHT)
+    )
+
+
+def fts_delete(property_id: int):
+    return delete(properties_fts).where(properties_fts.c.rowid == property_id)
+
+
+def fts_insert(property_id: int, title: str, description: str):
+    return insert(properties_fts).values(
+        rowid=property_id, title=title, description=description
+    )
+
+
+@dataclass
+class TextSearch:
+    condition: ColumnElement[bool]
+    rank: ColumnElement | None = None
+    join: tuple | None = None
+
+    def apply(self, query: Select, ranked: bool = True) -> Select:
+        if self.join is not None:
+            query = query.join(*self.join)
+        query = query.where(self.condition)
+        if ranked and self.rank is not None:
+            query = query.order_by(self.rank)
+        return query
+
+
+def property_search(dialect: str, q: str) -> TextSearch | None:
+    """Index-backed keyword search over property title and description.
+
+    PostgreSQL matches the GIN-indexed ``search_vector`` column and ranks with
+    ``ts_rank``; SQLite, used in tests, goes through an FTS5 table ranked by
+    bm25. All words must match in both cases.
+    """
+    terms = search_terms(q)
+    if not terms:
+        return None
+
+    if dialect == "postgresql":
+        query = func.plainto_tsquery(_CONFIG, " ".join(terms))
+        return TextSearch(
+            condition=Property.search_vector.op("@@")(query),
+            rank=func.ts_rank(Property.search_vector, query).desc(),
+        )
+
+    match = " ".join(f'"{term}"' for term in terms)
+    return TextSearch(
+        condition=literal_column(SQLITE_FTS_TABLE).op("MATCH")(match),
+        rank=properties_fts.c.rank.asc(),
+        join=(properties_fts, properties_fts.c.rowid == Property.id),
+    )
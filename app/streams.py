@@ -0,0 +1,102 @@
+import asyncio
+import json
+from collections.abc import AsyncIterator
+
+from app.changes import ChangeBus, ChangeEvent, change_bus
+from app.config import settings
+
+
+def format_sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+class _Watcher:
+    __slots__ = ("queue", "overflowed")
+
+    def __init__(self, queue_size: int):
+        self.queue: asyncio.Queue[ChangeEvent | None] = asyncio.Queue(queue_size)
+        self.overflowed = False
+
+
+class PropertyEventHub:
+    """Fans change events out to the SSE streams watching each property.
+
+    The hub holds one change bus subscription for the whole process, however
+    many clients are connected. Each watcher has a bounded queue; a client too
+    slow to keep up loses its backlog and is told to ``resync`` instead of
+    making the process buffer events for it. When the bus itself may have
+    missed changes, every client is told to ``resync``.
+    """
+
+    def __init__(self, bus: ChangeBus, queue_size: int):
+        self.bus = bus
+        self.queue_size = queue_size
+        self._watchers: dict[int, set[_Watcher]] = {}
+        self._unsubscribe = None
+        self._overflows = 0
+
+    def _publish(self, change: ChangeEvent) -> None:
+        for watcher in self._watchers.get(change.property_id, ()):
+            try:
+                watcher.queue.put_nowait(change)
+            except asyncio.QueueFull:
+                if not watcher.overflowed:
+                    watcher.overflowed = True
+                    self._overflows += 1
+
+    def _resync(self) -> None:
+        # The bus may have missed changes (e.g. while reconnecting), so every
+        # client is told to reload; the wake-up item ends a pending wait
+        for watchers in self._watchers.values():
+            for watcher in watchers:
+                watcher.overflowed = True
+                try:
+                    watcher.queue.put_nowait(None)
+                except asyncio.QueueFull:
+                    pass
+
+    def watch(self, property_id: int) -> _Watcher:
+        if self._unsubscribe is None:
+            self._unsubscribe = self.bus.subscribe(self._publish)
+            self.bus.on_resync(self._resync)
+        watcher = _Watcher(self.queue_size)
+        self._watchers.setdefault(property_id, set()).add(watcher)
+        return watcher
+
+    def unwatch(self, property_id: int, watcher: _Watcher) -> None:
+        watchers = self._watchers.get(property_id)
+        if watchers is not None:
+            watchers.discard(watcher)
+            if not watchers:
+                del self._watchers[property_id]
+
+    async def stream(self, property_id: int, heartbeat: float) -> AsyncIterator[str]:
+        watcher = self.watch(property_id)
+        try:
+            yield ": connected\n\n"
+            while True:
+                if watcher.overflowed:
+                    while not watcher.queue.empty():
+                        watcher.queue.get_nowait()
+                    watcher.overflowed = False
+                    yield format_sse("resync", {"property_id": property_id})
+                    continue
+                try:
+                    change = await asyncio.wait_for(watcher.queue.get(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield ": heartbeat\n\n"
+                    continue
+                if change is not None:
+                    yield format_sse(change.kind, change.to_dict())
+        finally:
+            self.unwatch(property_id, watcher)
+
+    def metrics(self) -> dict:
+        return {
+            "properties": len(self._watchers),
+            "watchers": sum(len(watchers) for watchers in self._watchers.values()),
+            "overflows": self._overflows,
+        }
+
+
+property_events = PropertyEventHub(change_bus, settings.EVENT_STREAM_QUEUE_SIZE)
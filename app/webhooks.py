@@ -0,0 +1,120 @@
+import asyncio
+import hashlib
+import hmac
+import ipaddress
+import secrets
+import socket
+from typing import Literal, get_args
+from urllib.parse import urlsplit
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.changes import PENDING_KEY, ChangeEvent
+from app.config import settings
+from app.models import Property, WebhookDelivery, WebhookSubscription
+
+WebhookEvent = Literal["booking.created", "booking.cancelled"]
+WEBHOOK_EVENTS: tuple[str, ...] = get_args(WebhookEvent)
+
+SIGNATURE_HEADER = "X-Webhook-Signature"
+
+
+def new_secret() -> str:
+    return secrets.token_hex(32)
+
+
+def sign(secret: str, timestamp: int, body: bytes) -> str:
+    """Stripe-style signature over the timestamp and the raw body.
+
+    Receivers recompute it with their secret and reject stale timestamps to
+    stop replays.
+    """
+    digest = hmac.new(
+        secret.encode(), f"{timestamp}.".encode() + body, hashlib.sha256
+    ).hexdigest()
+    return f"t={timestamp},v1={digest}"
+
+
+def verify(secret: str, header: str, body: bytes) -> bool:
+    parts = dict(part.split("=", 1) for part in header.split(",") if "=" in part)
+    try:
+        timestamp = int(parts["t"])
+    except (KeyError, ValueError):
+        return False
+    return hmac.compare_digest(sign(secret, timestamp, body), header)
+
+
+def _is_public(address: str) -> bool:
+    ip = ipaddress.ip_address(address.split("%", 1)[0])
+    if isinstance(ip, ipaddress.IPv6Address) and ip.ipv4_mapped is not None:
+        ip = ip.ipv4_mapped
+    return ip.is_global and not ip.is_multicast
+
+
+def _resolve(host: str, port: int) -> list[str]:
+    infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    return [info[4][0] for info in infos]
+
+
+def public_addresses(host: str, port: int) -> list[str]:
+    """Resolve ``host``; raise ValueError unless every address is public."""
+    try:
+        addresses = _resolve(host, port)
+    except (OSError, UnicodeError) as e:
+        raise ValueError(f"Cannot resolve webhook host {host}: {e}")
+    if not addresses or not all(_is_public(address) for address in addresses):
+        raise ValueError(f"Webhook host {host} is not a public address")
+    return addresses
+
+
+def check_webhook_url(url: str) -> None:
+    """Raise ValueError unless every address of the URL's host is public.
+
+    Deliveries are sent from inside the network, so endpoints on loopback,
+    private, link-local (cloud metadata) or other reserved addresses would
+    let a host probe internal services.
+    """
+    if settings.WEBHOOK_ALLOW_PRIVATE_HOSTS:
+        return
+    parts = urlsplit(url)
+    if not parts.hostname:
+        raise ValueError("Webhook URL has no host")
+    port = parts.port or (443 if parts.scheme == "https" else 80)
+    public_addresses(parts.hostname, port)
+
+
+async def check_webhook_url_async(url: str) -> None:
+    await asyncio.to_thread(check_webhook_url, url)
+
+
+@event.listens_for(Session, "before_commit")
+def _enqueue_webhook_deliveries(session: Session) -> None:
+    """Turn committed booking changes into webhook deliveries.
+
+    Runs inside the committing transaction, like the outbox, so a delivery
+    exists exactly when the booking change it reports does.
+    """
+    changes: list[ChangeEvent] = [
+        change
+        for change in session.info.get(PENDING_KEY, ())
+        if change.kind in WEBHOOK_EVENTS
+    ]
+    if not changes:
+        return
+
+    subscriptions = session.execute(
+        select(WebhookSubscription.id, WebhookSubscription.events, Property.id)
+        .join(Property, Property.host_id == WebhookSubscription.host_id)
+        .where(Property.id.in_({change.property_id for change in changes}))
+    ).all()
+    for subscription_id, events, property_id in subscriptions:
+        for change in changes:
+            if change.property_id == property_id and change.kind in events:
+                session.add(
+                    WebhookDelivery(
+                        subscription_id=subscription_id,
+                        event=change.kind,
+                        payload=change.to_dict(),
+                    )
+                )
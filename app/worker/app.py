@@ -1,9 +1,14 @@
+import logging
+
 from celery import Celery
+from kombu import Queue
 from app.config import settings
 
 
-print(f"BROKER_URL: {settings.CELERY_BROKER_URL}")
-print(f"BACKEND_URL: {settings.CELERY_RESULT_BACKEND}")
+logger = logging.getLogger(__name__)
+
+logger.info(f"BROKER_URL: {settings.CELERY_BROKER_URL}")
+logger.info(f"BACKEND_URL: {settings.CELERY_RESULT_BACKEND}")
 
 
 app = Celery(
@@ -22,4 +27,49 @@ app.conf.update(
     enable_utc=True,
     task_track_started=True,
     task_time_limit=30 * 60,
+    task_default_queue="default",
+    task_queues=(
+        Queue("default"),
+        Queue("pdf"),
+        Queue("email"),
+    ),
+    task_routes={
+        "app.celery.tasks.generate_booking_pdf": {"queue": "pdf"},
+        "app.celery.tasks.bulk_render_booking_pdfs": {"queue": "pdf"},
+        # Runs where the artifacts volume is mounted
+        "app.celery.tasks.purge_expired_artifacts": {"queue": "pdf"},
+        "app.celery.tasks.send_booking_email": {"queue": "email"},
+        "app.celery.tasks.flush_email_batch": {"queue": "email"},
+        "app.celery.tasks.notify_cancelled_bookings": {"queue": "email"},
+    },
+    beat_schedule={
+        "relay-outbox": {
+            "task": "app.celery.tasks.relay_outbox",
+            "schedule": settings.OUTBOX_RELAY_INTERVAL,
+        },
+        "deliver-webhooks": {
+            "task": "app.celery.tasks.deliver_webhooks",
+            "schedule": settings.WEBHOOK_DELIVERY_INTERVAL,
+        },
+        "purge-expired-artifacts": {
+            "task": "app.celery.tasks.purge_expired_artifacts",
+            "schedule": settings.ARTIFACT_PURGE_INTERVAL,
+        },
+        "sweep-booking-lifecycle": {
+            "task": "app.celery.tasks.sweep_booking_lifecycle",
+            "schedule": settings.BOOKING_SWEEP_INTERVAL,
+        },
+        "maintain-booking-partitions": {
+            "task": "app.celery.tasks.maintain_booking_partitions",
+            "schedule": settings.BOOKING_PARTITION_INTERVAL,
+        },
+        "purge-expired-idempotency-keys": {
+            "task": "app.celery.tasks.purge_expired_idempotency_keys",
+            "schedule": settings.IDEMPOTENCY_PURGE_INTERVAL,
+        },
+        "flush-email-batch": {
+            "task": "app.celery.tasks.flush_email_batch",
+            "schedule": settings.EMAIL_BATCH_INTERVAL,
+        },
+    },
 )
@@ -0,0 +1,110 @@
+import os
+import time
+import uuid
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from pathlib import Path
+
+from app.config import settings
+
+
+class ArtifactNotFound(Exception):
+    pass
+
+
+class ArtifactStore(ABC):
+    """Stores binary task artifacts so that only their keys travel through the broker.
+
+    Object storage backends (S3, GCS, ...) implement the same interface and
+    are selected through ``ARTIFACT_STORE_URL``.
+    """
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+
+    @staticmethod
+    def new_key(prefix: str, suffix: str = "") -> str:
+        return f"{prefix}/{uuid.uuid4().hex}{suffix}"
+
+    @abstractmethod
+    def put(self, key: str, data: bytes) -> str: ...
+
+    @abstractmethod
+    def get(self, key: str) -> bytes: ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None: ...
+
+    @abstractmethod
+    def purge_expired(self) -> int: ...
+
+
+class LocalArtifactStore(ArtifactStore):
+    def __init__(self, directory: str | Path, ttl: int):
+        super().__init__(ttl)
+        self.directory = Path(directory)
+
+    def _path(self, key: str) -> Path:
+        path = (self.directory / key).resolve()
+        if self.directory.resolve() not in path.parents:
+            raise ValueError(f"Invalid artifact key: {key}")
+        return path
+
+    def put(self, key: str, data: bytes) -> str:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+        return key
+
+    def get(self, key: str) -> bytes:
+        try:
+            return self._path(key).read_bytes()
+        except FileNotFoundError:
+            raise ArtifactNotFound(key)
+
+    def delete(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+
+    def purge_expired(self) -> int:
+        if not self.directory.exists():
+            return 0
+        cutoff = time.time() - self.ttl
+        purged = 0
+        for path in self.directory.rglob("*"):
+            if path.is_file() and path.stat().st_mtime < cutoff:
+                path.unlink(missing_ok=True)
+                purged += 1
+        return purged
+
+
+ARTIFACT_BACKENDS: dict[str, type[ArtifactStore]] = {}
+
+
+def register_artifact_backend(scheme: str, backend: type[ArtifactStore]) -> None:
+    ARTIFACT_BACKENDS[scheme] = backend
+
+
+def create_artifact_store(url: str, ttl: int) -> ArtifactStore:
+    scheme, sep, location = url.partition("://")
+    if not sep:
+        return LocalArtifactStore(url, ttl)
+    if scheme == "file":
+        return LocalArtifactStore(location, ttl)
+    if scheme not in ARTIFACT_BACKENDS:
+        raise ValueError(f"Unsupported artifact store: {scheme}")
+    return ARTIFACT_BACKENDS[scheme](location, ttl)
+
+
+@lru_cache
+def get_artifact_store() -> ArtifactStore:
+    return create_artifact_store(
+        settings.ARTIFACT_STORE_URL, settings.ARTIFACT_TTL_SECONDS
+    )
+
+
+@lru_cache
+def get_archive_store() -> ArtifactStore:
+    # Archives are kept indefinitely; nothing purges this store
+    return create_artifact_store(settings.BOOKING_ARCHIVE_URL, ttl=0)
@@ -0,0 +1,167 @@
+import logging
+import os
+import smtplib
+import threading
+import time
+from contextlib import contextmanager
+from email.message import Message
+from typing import Iterator
+
+from app.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+class SMTPConnectionPool:
+    """Keeps authenticated SMTP connections open between messages.
+
+    Idle connections are checked with NOOP before reuse and replaced when the
+    server has dropped them, so STARTTLS and login happen once per connection
+    instead of once per email.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        user: str | None = None,
+        password: str | None = None,
+        use_tls: bool = True,
+        max_size: int = 4,
+        max_idle: float = 60.0,
+        timeout: float = 30.0,
+    ):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.use_tls = use_tls
+        self.max_size = max_size
+        self.max_idle = max_idle
+        self.timeout = timeout
+
+        self._idle: list[tuple[smtplib.SMTP, float]] = []
+        self._lock = threading.Lock()
+        self.opened = 0
+
+    def _connect(self) -> smtplib.SMTP:
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.use_tls:
+                server.starttls()
+            if self.user:
+                server.login(self.user, self.password or "")
+        except Exception:
+            self._close(server)
+            raise
+        self.opened += 1
+        return server
+
+    @staticmethod
+    def _close(server: smtplib.SMTP) -> None:
+        try:
+            server.quit()
+        except Exception:
+            server.close()
+
+    @staticmethod
+    def _is_alive(server: smtplib.SMTP) -> bool:
+        try:
+            return server.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def _acquire(self) -> smtplib.SMTP:
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                server, released_at = self._idle.pop()
+            if time.monotonic() - released_at > self.max_idle:
+                self._close(server)
+                continue
+            if self._is_alive(server):
+                return server
+            server.close()
+        return self._connect()
+
+    def _release(self, server: smtplib.SMTP) -> None:
+        with self._lock:
+            if len(self._idle) < self.max_size:
+                self._idle.append((server, time.monotonic()))
+                return
+        self._close(server)
+
+    @contextmanager
+    def connection(self) -> Iterator[smtplib.SMTP]:
+        server = self._acquire()
+        try:
+            yield server
+        except (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError):
+            server.close()
+            raise
+        except smtplib.SMTPException:
+            # SMTPException subclasses OSError, but a refused recipient or
+            # rejected message leaves the session usable (smtplib sends RSET)
+            self._release(server)
+            raise
+        except OSError:
+            server.close()
+            raise
+        except Exception:
+            self._release(server)
+            raise
+        self._release(server)
+
+    def send(self, message: Message) -> None:
+        try:
+            with self.connection() as server:
+                server.send_message(message)
+        except smtplib.SMTPServerDisconnected:
+            with self.connection() as server:
+                server.send_message(message)
+
+    def send_many(self, messages: list[Message]) -> list[Exception | None]:
+        results: list[Exception | None] = []
+        for message in messages:
+            try:
+                self.send(message)
+                results.append(None)
+            except (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError) as e:
+                results.extend([e] * (len(messages) - len(results)))
+                break
+            except smtplib.SMTPException as e:
+                # Only this message failed, e.g. its recipient was refused
+                results.append(e)
+            except OSError as e:
+                results.extend([e] * (len(messages) - len(results)))
+                break
+        return results
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for server, _ in idle:
+            self._close(server)
+
+
+_pool: SMTPConnectionPool | None = None
+_pool_pid: int | None = None
+
+
+def get_smtp_pool() -> SMTPConnectionPool:
+    global _pool, _pool_pid
+
+    if _pool is None or _pool_pid != os.getpid():
+        _pool = SMTPConnectionPool(
+            settings.SMTP_HOST,
+            settings.SMTP_PORT,
+            user=settings.SMTP_USER,
+            password=settings.SMTP_PASSWORD,
+            use_tls=settings.SMTP_USE_TLS,
+            max_size=settings.SMTP_POOL_SIZE,
+            max_idle=settings.SMTP_POOL_MAX_IDLE,
+        )
+        _pool_pid = os.getpid()
+    return _pool
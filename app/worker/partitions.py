@@ -0,0 +1,223 @@
+import gzip
+import io
+import logging
+import re
+from datetime import date
+from typing import Callable
+
+from sqlalchemy import Connection, text
+from sqlalchemy.orm import Session
+
+from app.worker.artifacts import ArtifactStore
+
+logger = logging.getLogger(__name__)
+
+PARTITIONED_TABLE = "bookings"
+DEFAULT_PARTITION = f"{PARTITIONED_TABLE}_default"
+
+_PARTITION_NAME = re.compile(r"^bookings_p(\d{4})(\d{2})$")
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"bookings_p{month:%Y%m}"
+
+
+def partition_month(name: str) -> date | None:
+    match = _PARTITION_NAME.match(name)
+    if not match:
+        return None
+    return date(int(match[1]), int(match[2]), 1)
+
+
+def partitions_to_create(
+    existing: set[str], today: date, months_ahead: int
+) -> list[date]:
+    current = month_start(today)
+    months = [add_months(current, i) for i in range(months_ahead + 1)]
+    return [month for month in months if partition_name(month) not in existing]
+
+
+def partitions_to_archive(
+    existing: set[str], today: date, retain_months: int
+) -> list[str]:
+    """Monthly partitions whose whole range is older than the retention window."""
+    cutoff = add_months(month_start(today), -retain_months)
+    expired = []
+    for name in existing:
+        month = partition_month(name)
+        if month is not None and add_months(month, 1) <= cutoff:
+            expired.append(name)
+    return sorted(expired)
+
+
+def is_partitioned(conn: Connection) -> bool:
+    relkind = conn.execute(
+        text("SELECT relkind FROM pg_class WHERE relname = :name"),
+        {"name": PARTITIONED_TABLE},
+    ).scalar()
+    return relkind == "p"
+
+
+def list_partitions(conn: Connection) -> set[str]:
+    result = conn.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON pg_inherits.inhparent = parent.oid "
+            "JOIN pg_class child ON pg_inherits.inhrelid = child.oid "
+            "WHERE parent.relname = :name"
+        ),
+        {"name": PARTITIONED_TABLE},
+    )
+    return set(result.scalars())
+
+
+def _default_has_rows(conn: Connection, bounds: dict[str, date]) -> bool:
+    if not conn.execute(
+        text("SELECT to_regclass(:name) IS NOT NULL"), {"name": DEFAULT_PARTITION}
+    ).scalar():
+        return False
+    return bool(
+        conn.execute(
+            text(
+                f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} "
+                "WHERE check_in >= :start AND check_in < :end)"
+            ),
+            bounds,
+        ).scalar()
+    )
+
+
+def create_partition(conn: Connection, month: date) -> str:
+    """Create the monthly partition for ``month``.
+
+    Bookings made beyond the partition horizon sit in the default partition,
+    and Postgres refuses a new range that rows in the default one already
+    match. In that case the default partition is detached, the new one is
+    created and the matching rows are moved into it before reattaching.
+    """
+    name = partition_name(month)
+    bounds = {"start": month, "end": add_months(month, 1)}
+    create = text(
+        f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {PARTITIONED_TABLE} "
+        f"FOR VALUES FROM ('{bounds['start']}') TO ('{bounds['end']}')"
+    )
+
+    if not _default_has_rows(conn, bounds):
+        conn.execute(create)
+        return name
+
+    conn.execute(
+        text(f"ALTER TABLE {PARTITIONED_TABLE} DETACH PARTITION {DEFAULT_PARTITION}")
+    )
+    conn.execute(create)
+    conn.execute(
+        text(
+            f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+            "WHERE check_in >= :start AND check_in < :end RETURNING *) "
+            f"INSERT INTO {name} SELECT * FROM moved"
+        ),
+        bounds,
+    )
+    conn.execute(
+        text(
+            f"ALTER TABLE {PARTITIONED_TABLE} "
+            f"ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT"
+        )
+    )
+    logger.info(f"Moved bookings for {month:%Y-%m} out of {DEFAULT_PARTITION}")
+    return name
+
+
+def list_detached_partitions(conn: Connection) -> set[str]:
+    """Monthly partitions detached by an earlier run that were not archived."""
+    result = conn.execute(
+        text(
+            "SELECT relname FROM pg_class "
+            "WHERE relkind = 'r' AND NOT relispartition AND relname LIKE :pattern"
+        ),
+        {"pattern": f"{PARTITIONED_TABLE}\\_p%"},
+    )
+    return {name for name in result.scalars() if partition_month(name) is not None}
+
+
+def detach_partition(conn: Connection, name: str) -> None:
+    """Detach a monthly partition from ``bookings``.
+
+    DETACH takes an ACCESS EXCLUSIVE lock on the parent table, so the caller
+    should commit right away instead of holding it through the archive.
+    """
+    if partition_month(name) is None:
+        raise ValueError(f"Not a monthly bookings partition: {name}")
+    conn.execute(text(f"ALTER TABLE {PARTITIONED_TABLE} DETACH PARTITION {name}"))
+
+
+def archive_partition(conn: Connection, name: str, store: ArtifactStore) -> str:
+    """Dump a detached partition as gzipped CSV to the store and drop it.
+
+    Only the detached table is locked, so bookings stay readable and writable
+    during the COPY and the upload. A failed upload leaves the table in place
+    and the next run archives it again. Dropping the table replaces
+    row-level deletes and the vacuum work they would cause.
+    """
+    if partition_month(name) is None:
+        raise ValueError(f"Not a monthly bookings partition: {name}")
+
+    buffer = io.BytesIO()
+    with gzip.GzipFile(fileobj=buffer, mode="wb") as archive:
+        cursor = conn.connection.cursor()
+        try:
+            cursor.copy_expert(f"COPY {name} TO STDOUT WITH CSV HEADER", archive)
+        finally:
+            cursor.close()
+
+    key = store.put(f"{PARTITIONED_TABLE}/{name}.csv.gz", buffer.getvalue())
+    conn.execute(text(f"DROP TABLE {name}"))
+    return key
+
+
+def maintain_partitions(
+    session_factory: Callable[[], Session],
+    store: ArtifactStore,
+    today: date,
+    months_ahead: int,
+    retain_months: int,
+) -> dict[str, list[str]]:
+    with session_factory() as session:
+        conn = session.connection()
+        if conn.dialect.name != "postgresql" or not is_partitioned(conn):
+            logger.info("bookings is not partitioned, skipping maintenance")
+            return {"created": [], "archived": []}
+
+        existing = list_partitions(conn)
+        detached = list_detached_partitions(conn)
+        created = [
+            create_partition(conn, month)
+            for month in partitions_to_create(existing, today, months_ahead)
+        ]
+        session.commit()
+
+    # Each detach commits on its own so the lock on bookings is brief
+    for name in partitions_to_archive(existing, today, retain_months):
+        with session_factory() as session:
+            detach_partition(session.connection(), name)
+            session.commit()
+        detached.add(name)
+
+    archived = []
+    for name in sorted(detached):
+        with session_factory() as session:
+            key = archive_partition(session.connection(), name, store)
+            session.commit()
+        logger.info(f"Archived partition {name} to {key}")
+        archived.append(name)
+
+    return {"created": created, "archived": archived}
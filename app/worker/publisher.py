@@ -0,0 +1,218 @@
+import asyncio
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable
+
+from app.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+class PublisherFull(Exception):
+    pass
+
+
+@dataclass
+class PendingTask:
+    name: str
+    args: tuple = ()
+    kwargs: dict = field(default_factory=dict)
+    options: dict = field(default_factory=dict)
+    coalesce: bool = False
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+    def coalesce_key(self) -> tuple:
+        return (self.name, repr(self.args), repr(sorted(self.kwargs.items())))
+
+
+def _send_with_celery(batch: list[PendingTask]) -> None:
+    from app.worker.app import app as celery_app
+
+    with celery_app.producer_or_acquire() as producer:
+        for task in batch:
+            celery_app.send_task(
+                task.name,
+                args=task.args,
+                kwargs=task.kwargs,
+                producer=producer,
+                **task.options,
+            )
+
+
+class TaskPublisher:
+    """Publishes Celery tasks from a dedicated thread.
+
+    Coroutines hand tasks over through a bounded queue, so the event loop
+    never waits on broker I/O. The thread drains the queue in batches and
+    sends each batch over a single producer connection.
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        maxsize: int = 1000,
+        batch_size: int = 50,
+        sender: Callable[[list[PendingTask]], None] = _send_with_celery,
+        backpressure_interval: float = 0.005,
+    ):
+        self._queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self._batch_size = batch_size
+        self._sender = sender
+        self._backpressure_interval = backpressure_interval
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        # Counters are written from the publisher thread and the event loop
+        self._stats_lock = threading.Lock()
+
+        self._published = 0
+        self._failed = 0
+        self._coalesced = 0
+        self._rejected = 0
+        self._last_latency = 0.0
+        self._max_latency = 0.0
+        self._total_latency = 0.0
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="task-publisher", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is None or not thread.is_alive():
+            return
+        try:
+            self._queue.put(self._STOP, timeout=timeout)
+        except queue.Full:
+            logger.warning("Task publisher queue is full, stopping without flush")
+            return
+        thread.join(timeout)
+
+    async def publish(
+        self,
+        name: str,
+        args: tuple = (),
+        kwargs: dict | None = None,
+        coalesce: bool = False,
+        timeout: float | None = None,
+        **options,
+    ) -> None:
+        task = PendingTask(
+            name=name,
+            args=tuple(args),
+            kwargs=kwargs or {},
+            options=options,
+            coalesce=coalesce,
+        )
+        self.start()
+
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        while True:
+            try:
+                self._queue.put_nowait(task)
+                return
+            except queue.Full:
+                if deadline is not None and loop.time() >= deadline:
+                    with self._stats_lock:
+                        self._rejected += 1
+                    raise PublisherFull(f"Task publisher queue is full ({name})")
+                await asyncio.sleep(self._backpressure_interval)
+
+    def metrics(self) -> dict:
+        with self._stats_lock:
+            published = self._published
+            failed = self._failed
+            coalesced = self._coalesced
+            rejected = self._rejected
+            last_latency = self._last_latency
+            max_latency = self._max_latency
+            total_latency = self._total_latency
+        return {
+            "queue_depth": self._queue.qsize(),
+            "queue_size": self._queue.maxsize,
+            "published": published,
+            "failed": failed,
+            "coalesced": coalesced,
+            "rejected": rejected,
+            "last_latency_ms": round(last_latency * 1000, 3),
+            "max_latency_ms": round(max_latency * 1000, 3),
+            "avg_latency_ms": (
+                round(total_latency / published * 1000, 3) if published else 0.0
+            ),
+        }
+
+    def _next_batch(self) -> tuple[list[PendingTask], bool]:
+        first = self._queue.get()
+        if first is self._STOP:
+            return [], True
+
+        batch = [first]
+        stop = False
+        while len(batch) < self._batch_size:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is self._STOP:
+                stop = True
+                break
+            batch.append(item)
+        return self._coalesce(batch), stop
+
+    def _coalesce(self, batch: list[PendingTask]) -> list[PendingTask]:
+        seen = set()
+        unique = []
+        for task in batch:
+            if task.coalesce:
+                key = task.coalesce_key()
+                if key in seen:
+                    with self._stats_lock:
+                        self._coalesced += 1
+                    continue
+                seen.add(key)
+            unique.append(task)
+        return unique
+
+    def _run(self) -> None:
+        while True:
+            batch, stop = self._next_batch()
+            if batch:
+                self._flush(batch)
+            if stop:
+                return
+
+    def _flush(self, batch: list[PendingTask]) -> None:
+        try:
+            self._sender(batch)
+        except Exception as e:
+            with self._stats_lock:
+                self._failed += len(batch)
+            logger.error(f"Failed to publish {len(batch)} tasks: {str(e)}")
+            return
+
+        now = time.monotonic()
+        with self._stats_lock:
+            for task in batch:
+                latency = now - task.enqueued_at
+                self._published += 1
+                self._last_latency = latency
+                self._total_latency += latency
+                self._max_latency = max(self._max_latency, latency)
+
+
+task_publisher = TaskPublisher(
+    maxsize=settings.TASK_PUBLISHER_QUEUE_SIZE,
+    batch_size=settings.TASK_PUBLISHER_BATCH_SIZE,
+)
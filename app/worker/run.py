@@ -0,0 +1,49 @@
+"""Start a Celery worker for one queue with its options from Settings.
+
+python -m app.worker.run pdf [extra celery worker options]
+"""
+
+import sys
+
+from app.config import settings
+from app.worker.app import app
+
+
+def worker_argv(queue: str) -> list[str]:
+    options = {
+        "default": ("prefork", settings.DEFAULT_WORKER_CONCURRENCY, None),
+        "pdf": (
+            "prefork",
+            settings.PDF_WORKER_CONCURRENCY,
+            settings.PDF_WORKER_PREFETCH,
+        ),
+        "email": (
+            settings.EMAIL_WORKER_POOL,
+            settings.EMAIL_WORKER_CONCURRENCY,
+            settings.EMAIL_WORKER_PREFETCH,
+        ),
+    }
+    if queue not in options:
+        raise ValueError(f"Unknown queue: {queue}")
+
+    pool, concurrency, prefetch = options[queue]
+    argv = [
+        "worker",
+        "--loglevel=info",
+        f"--queues={queue}",
+        f"--hostname={queue}@%h",
+        f"--pool={pool}",
+        f"--concurrency={concurrency}",
+    ]
+    if prefetch is not None:
+        argv.append(f"--prefetch-multiplier={prefetch}")
+    return argv
+
+
+def main(args: list[str]) -> None:
+    queue, *extra = args or ["default"]
+    app.worker_main(worker_argv(queue) + extra)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
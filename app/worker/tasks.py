@@ -1,86 +1,149 @@
 import smtplib
-import io
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.application import MIMEApplication
 
 from app.config import settings
+from app.worker.artifacts import get_archive_store, get_artifact_store
+from app.worker.mailer import get_smtp_pool
+from app.worker.pdf import render_booking_pdf, render_booking_pdfs
 
-from reportlab.lib.pagesizes import A4
-from reportlab.pdfgen import canvas
-from reportlab.lib.units import cm
-
-from datetime import datetime
-from celery import chain, shared_task, Task
+from datetime import date, datetime, timedelta
+from celery import chain, current_app, shared_task, Task
+import json
 import logging
-import base64
 from typing import cast
 
 
 logger = logging.getLogger(__name__)
 
 
-def _get_booking_data_from_db(booking_id: int) -> dict:
+def _get_bookings_data_from_db(booking_ids: list[int]) -> dict[int, dict]:
     from app.database import sync_session
-    from app.crud import get_booking_sync, get_user_sync
+    from app.crud import get_bookings_with_details_sync
+    from app.schemas import BookingSnapshot
 
     with sync_session() as session:
-        booking = get_booking_sync(session, booking_id)
-        if not booking:
-            raise ValueError(f"Booking {booking_id} not found")
-
-        guest = get_user_sync(session, booking.guest_id)
-        if not guest:
-            raise ValueError(f"Guest {booking.guest_id} not found")
-
+        bookings = get_bookings_with_details_sync(session, booking_ids)
         return {
-            "id": booking.id,
-            "guest_id": booking.guest_id,
-            "guest_name": f"{guest.first_name} {guest.last_name}",
-            "property_id": booking.property_id,
-            "property_title": booking.property.title,
-            "check_in": booking.check_in.strftime("%Y-%m-%d"),
-            "check_out": booking.check_out.strftime("%Y-%m-%d"),
-            "guests": booking.guests,
-            "total_price": booking.total_price,
+            booking.id: BookingSnapshot.from_booking(
+                booking, booking.user, booking.property
+            ).model_dump(mode="json")
+            for booking in bookings
         }
 
 
-@shared_task(name="app.celery.tasks.generate_booking_pdf")
+def _get_booking_data_from_db(booking_id: int) -> dict:
+    bookings = _get_bookings_data_from_db([booking_id])
+    if booking_id not in bookings:
+        raise ValueError(f"Booking {booking_id} not found")
+    return bookings[booking_id]
+
+
+@shared_task(name="app.celery.tasks.generate_booking_pdf", ignore_result=True)
 def generate_booking_pdf(booking_data: dict) -> str:
-    buffer = io.BytesIO()
-
-    pdf = canvas.Canvas(buffer, pagesize=A4)
-    width, height = A4
-
-    pdf.setFont("Helvetica-Bold", 24)
-    pdf.drawString(2 * cm, height - 3 * cm, "BOOKING CONFIRMATION")
-    pdf.line(2 * cm, height - 3.5 * cm, width - 2 * cm, height - 3.5 * cm)
-
-    pdf.setFont("Helvetica", 12)
-    y_position = height - 5 * cm
-
-    lines = [
-        f"Booking ID: {booking_data['id']}",
-        f"Guest: {booking_data['guest_name']}",
-        f"Property: {booking_data['property_title']}",
-        f"Check-in: {booking_data['check_in']}",
-        f"Check-out: {booking_data['check_out']}",
-        f"Number of guests: {booking_data['guests']}",
-        f"Total price: ${booking_data['total_price']:.2f}",
-        f"",
-        f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+    store = get_artifact_store()
+    return store.put(
+        store.new_key(f"bookings/{booking_data['id']}", ".pdf"),
+        render_booking_pdf(booking_data),
+    )
+
+
+@shared_task(name="app.celery.tasks.bulk_render_booking_pdfs")
+def bulk_render_booking_pdfs(booking_ids: list[int]) -> dict[int, str]:
+    found = _get_bookings_data_from_db(booking_ids)
+    bookings = [found[booking_id] for booking_id in booking_ids if booking_id in found]
+    pdfs = render_booking_pdfs(bookings, processes=settings.PDF_RENDER_PROCESSES)
+
+    store = get_artifact_store()
+    return {
+        booking_data["id"]: store.put(
+            store.new_key(f"bookings/{booking_data['id']}", ".pdf"), pdf
+        )
+        for booking_data, pdf in zip(bookings, pdfs)
+    }
+
+
+def _build_confirmation_email(
+    recipient_email: str, booking_data: dict, pdf_bytes: bytes
+) -> MIMEMultipart:
+    msg = MIMEMultipart()
+    msg["From"] = f"{settings.EMAIL_FROM_NAME} <{settings.EMAIL_FROM}>"
+    msg["To"] = recipient_email
+    msg["Subject"] = f"Booking Confirmation #{booking_data['id']}"
+
+    body = f"""
+        Hello, {booking_data['guest_name']}.
+        
+        Your booking has been confirmed!
+
+        Details:
+        - Property: {booking_data['property_title']}
+        - Check-in: {booking_data['check_in']}
+        - Check-out: {booking_data['check_out']}
+        - Guests: {booking_data['guests']}
+        - Price: {booking_data['total_price']:.2f}
+    """
+
+    msg.attach(MIMEText(body, "plain"))
+
+    pdf_attachment = MIMEApplication(pdf_bytes, _subtype="pdf")
+    pdf_attachment.add_header(
+        "Content-Disposition",
+        "attachment",
+        filename=f'booking_{booking_data["id"]}.pdf',
+    )
+    msg.attach(pdf_attachment)
+    return msg
+
+
+def _build_cancellation_email(recipient_email: str, booking_data: dict) -> MIMEText:
+    body = f"""
+        Hello, {booking_data['guest_name']}.
+
+        Your booking has been cancelled because the property is no longer
+        available.
+
+        Details:
+        - Property: {booking_data['property_title']}
+        - Check-in: {booking_data['check_in']}
+        - Check-out: {booking_data['check_out']}
+    """
+
+    msg = MIMEText(body, "plain")
+    msg["From"] = f"{settings.EMAIL_FROM_NAME} <{settings.EMAIL_FROM}>"
+    msg["To"] = recipient_email
+    msg["Subject"] = f"Booking Cancelled #{booking_data['id']}"
+    return msg
+
+
+def _send_cancellation_emails(recipients: list[tuple[str, dict]]) -> list[int]:
+    """Send cancellation notices and return the booking ids that failed."""
+    messages = [
+        _build_cancellation_email(email, booking_data)
+        for email, booking_data in recipients
     ]
+    failed = []
+    for (email, booking_data), error in zip(
+        recipients, get_smtp_pool().send_many(messages)
+    ):
+        if error is None:
+            continue
+        logger.error(
+            f"Failed to send cancellation of booking {booking_data['id']} "
+            f"to {email}: {error}"
+        )
+        failed.append(booking_data["id"])
+    return failed
 
-    for line in lines:
-        pdf.drawString(2 * cm, y_position, line)
-        y_position -= 0.7 * cm
 
-    pdf.save()
+def _get_redis():
+    import redis
 
-    buffer.seek(0)
+    return redis.Redis.from_url(settings.REDIS_URL)
 
-    return base64.b64encode(buffer.read()).decode("utf-8")
+
+EMAIL_BATCH_QUEUE = "email:pending"
 
 
 @shared_task(
@@ -91,46 +154,29 @@ def generate_booking_pdf(booking_data: dict) -> str:
 )
 def send_booking_email(
     self,
-    pdf_b64: str,
+    pdf_key: str,
     recipient_email: str,
     booking_data: dict,
 ) -> dict:
-    pdf_bytes = base64.b64decode(pdf_b64)
+    if settings.EMAIL_BATCH_ENABLED:
+        job = {
+            "pdf_key": pdf_key,
+            "recipient_email": recipient_email,
+            "booking_data": booking_data,
+            "attempts": 0,
+        }
+        _get_redis().rpush(EMAIL_BATCH_QUEUE, json.dumps(job))
+        return {"status": "queued", "message": f"Email to {recipient_email} queued"}
+
+    store = get_artifact_store()
     logger.info(f"Sending email to {recipient_email} for booking {booking_data['id']}")
     try:
-        msg = MIMEMultipart()
-        msg["From"] = f"{settings.EMAIL_FROM_NAME} <{settings.EMAIL_FROM}>"
-        msg["To"] = recipient_email
-        msg["Subject"] = f"Booking Confirmation #{booking_data['id']}"
-
-        body = f"""
-            Hello, {booking_data['guest_name']}.
-            
-            Your booking has been confirmed!
-
-            Details:
-            - Property: {booking_data['property_title']}
-            - Check-in: {booking_data['check_in']}
-            - Check-out: {booking_data['check_out']}
-            - Guests: {booking_data['guests']}
-            - Price: {booking_data['total_price']:.2f}
-        """
-
-        msg.attach(MIMEText(body, "plain"))
-
-        pdf_attachment = MIMEApplication(pdf_bytes, _subtype="pdf")
-        pdf_attachment.add_header(
-            "Content-Disposition",
-            "attachment",
-            filename=f'booking_{booking_data["id"]}.pdf',
+        msg = _build_confirmation_email(
+            recipient_email, booking_data, store.get(pdf_key)
         )
-        msg.attach(pdf_attachment)
-
-        with smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT) as server:
-            server.starttls()
-            server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
-            server.send_message(msg)
+        get_smtp_pool().send(msg)
 
+        store.delete(pdf_key)
         logger.info(f"Email successfully sent to {recipient_email}")
         return {"status": "success", "message": f"Email sent to {recipient_email}"}
     except smtplib.SMTPException as e:
@@ -140,9 +186,62 @@ def send_booking_email(
         return {"status": "error", "message": str(e)}
 
 
-@shared_task(name="app.celery.tasks.process_booking_confirmation")
-def process_booking_confirmation(booking_id: int, user_email: str) -> str:
-    booking_data = _get_booking_data_from_db(booking_id)
+def _send_email_batch(jobs: list[dict]) -> list[dict]:
+    store = get_artifact_store()
+    messages = []
+    sendable = []
+    for job in jobs:
+        try:
+            pdf_bytes = store.get(job["pdf_key"])
+        except Exception as e:
+            logger.error(f"Dropping email for booking {job['booking_data']['id']}: {e}")
+            continue
+        messages.append(
+            _build_confirmation_email(
+                job["recipient_email"], job["booking_data"], pdf_bytes
+            )
+        )
+        sendable.append(job)
+
+    failed = []
+    for job, error in zip(sendable, get_smtp_pool().send_many(messages)):
+        if error is None:
+            store.delete(job["pdf_key"])
+            continue
+        logger.error(f"Failed to send email to {job['recipient_email']}: {error}")
+        failed.append(job)
+    return failed
+
+
+@shared_task(name="app.celery.tasks.flush_email_batch", ignore_result=True)
+def flush_email_batch() -> int:
+    client = _get_redis()
+    sent = 0
+    while True:
+        raw_jobs = client.lpop(EMAIL_BATCH_QUEUE, settings.EMAIL_BATCH_SIZE)
+        if not raw_jobs:
+            break
+
+        jobs = [json.loads(raw) for raw in raw_jobs]
+        failed = _send_email_batch(jobs)
+        sent += len(jobs) - len(failed)
+
+        for job in failed:
+            job["attempts"] += 1
+            if job["attempts"] < settings.EMAIL_BATCH_MAX_ATTEMPTS:
+                client.rpush(EMAIL_BATCH_QUEUE, json.dumps(job))
+
+        if failed or len(raw_jobs) < settings.EMAIL_BATCH_SIZE:
+            break
+    return sent
+
+
+@shared_task(name="app.celery.tasks.process_booking_confirmation", ignore_result=True)
+def process_booking_confirmation(
+    booking_id: int, user_email: str, booking_data: dict | None = None
+) -> str:
+    if booking_data is None:
+        booking_data = _get_booking_data_from_db(booking_id)
 
     workflow = chain(
         cast(Task, generate_booking_pdf).s(booking_data),
@@ -155,3 +254,178 @@ def process_booking_confirmation(booking_id: int, user_email: str) -> str:
         raise RuntimeError("Failed to enqueue booking workflow")
 
     return result.id
+
+
+@shared_task(
+    name="app.celery.tasks.notify_cancelled_bookings",
+    max_retries=3,
+    bind=True,
+    default_retry_delay=60,
+    ignore_result=True,
+)
+def notify_cancelled_bookings(self, booking_ids: list[int]) -> int:
+    from app.database import sync_session
+    from app.crud import get_bookings_with_details_sync
+    from app.schemas import BookingSnapshot
+
+    sent = 0
+    failed = []
+    for start in range(0, len(booking_ids), settings.EMAIL_BATCH_SIZE):
+        with sync_session() as session:
+            bookings = get_bookings_with_details_sync(
+                session, booking_ids[start : start + settings.EMAIL_BATCH_SIZE]
+            )
+            recipients = [
+                (
+                    booking.user.email,
+                    BookingSnapshot.from_booking(
+                        booking, booking.user, booking.property
+                    ).model_dump(mode="json"),
+                )
+                for booking in bookings
+            ]
+        chunk_failed = _send_cancellation_emails(recipients)
+        sent += len(recipients) - len(chunk_failed)
+        failed.extend(chunk_failed)
+
+    if failed:
+        if self.request.retries >= self.max_retries:
+            logger.error(f"Giving up on cancellation emails for bookings {failed}")
+        else:
+            # Only the failed subset goes round again, so guests that were
+            # already notified are not emailed twice.
+            raise self.retry(kwargs={"booking_ids": failed})
+    return sent
+
+
+@shared_task(name="app.celery.tasks.relay_outbox", ignore_result=True)
+def relay_outbox() -> int:
+    from app.database import sync_session
+    from app.crud import claim_outbox_batch_sync
+
+    published = 0
+    failed = False
+    for _ in range(settings.OUTBOX_MAX_BATCHES):
+        with sync_session() as session:
+            messages = claim_outbox_batch_sync(session, settings.OUTBOX_BATCH_SIZE)
+            if not messages:
+                break
+
+            with current_app.producer_or_acquire() as producer:
+                for message in messages:
+                    try:
+                        current_app.send_task(
+                            message.task_name,
+                            kwargs=message.payload,
+                            producer=producer,
+                        )
+                    except Exception as e:
+                        logger.error(
+                            f"Failed to relay outbox message {message.id}: {str(e)}"
+                        )
+                        message.attempts += 1
+                        failed = True
+                        break
+                    message.published_at = datetime.now()
+                    published += 1
+
+            session.commit()
+
+        if failed or len(messages) < settings.OUTBOX_BATCH_SIZE:
+            break
+
+    return published
+
+
+@shared_task(name="app.celery.tasks.deliver_webhooks", ignore_result=True)
+def deliver_webhooks() -> dict[str, int]:
+    from app.database import sync_session
+    from app.worker.webhooks import deliver_due_webhooks, get_http_client
+
+    counts = {"delivered": 0, "retried": 0, "dead": 0}
+    for _ in range(settings.WEBHOOK_MAX_BATCHES):
+        batch = deliver_due_webhooks(
+            sync_session,
+            get_http_client(),
+            datetime.now(),
+            settings.WEBHOOK_BATCH_SIZE,
+            settings.WEBHOOK_MAX_ATTEMPTS,
+        )
+        for name, count in batch.items():
+            counts[name] += count
+        if sum(batch.values()) < settings.WEBHOOK_BATCH_SIZE:
+            break
+
+    if any(counts.values()):
+        logger.info(
+            f"Delivered {counts['delivered']} webhook events, "
+            f"{counts['retried']} to retry, {counts['dead']} dead-lettered"
+        )
+    return counts
+
+
+@shared_task(name="app.celery.tasks.purge_expired_artifacts", ignore_result=True)
+def purge_expired_artifacts() -> int:
+    purged = get_artifact_store().purge_expired()
+    if purged:
+        logger.info(f"Purged {purged} expired artifacts")
+    return purged
+
+
+@shared_task(name="app.celery.tasks.sweep_booking_lifecycle", ignore_result=True)
+def sweep_booking_lifecycle() -> dict[str, int]:
+    from app.database import sync_session
+    from app.crud import complete_past_bookings_sync, expire_pending_bookings_sync
+
+    today = date.today()
+    created_before = datetime.now() - timedelta(seconds=settings.PENDING_BOOKING_TTL)
+    sweeps = {
+        "completed": lambda session, limit: complete_past_bookings_sync(
+            session, today, limit
+        ),
+        "expired": lambda session, limit: expire_pending_bookings_sync(
+            session, created_before, limit
+        ),
+    }
+
+    counts = {}
+    for name, sweep in sweeps.items():
+        counts[name] = 0
+        for _ in range(settings.BOOKING_SWEEP_MAX_BATCHES):
+            with sync_session() as session:
+                ids = sweep(session, settings.BOOKING_SWEEP_BATCH_SIZE)
+                session.commit()
+            counts[name] += len(ids)
+            if len(ids) < settings.BOOKING_SWEEP_BATCH_SIZE:
+                break
+
+    if any(counts.values()):
+        logger.info(
+            f"Completed {counts['completed']} and expired {counts['expired']} bookings"
+        )
+    return counts
+
+
+@shared_task(name="app.celery.tasks.maintain_booking_partitions", ignore_result=True)
+def maintain_booking_partitions() -> dict[str, list[str]]:
+    from app.database import sync_session
+    from app.worker.partitions import maintain_partitions
+
+    return maintain_partitions(
+        sync_session,
+        get_archive_store(),
+        date.today(),
+        months_ahead=settings.BOOKING_PARTITIONS_AHEAD,
+        retain_months=settings.BOOKING_RETENTION_MONTHS,
+    )
+
+
+@shared_task(name="app.celery.tasks.purge_expired_idempotency_keys", ignore_result=True)
+def purge_expired_idempotency_keys() -> int:
+    from app.database import sync_session
+    from app.crud import purge_expired_idempotency_keys_sync
+
+    with sync_session() as session:
+        purged = purge_expired_idempotency_keys_sync(session, datetime.now())
+        session.commit()
+    return purged
@@ -0,0 +1,210 @@
+import json
+import logging
+import math
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable
+
+import httpcore
+import httpx
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.crud import (
+    claim_webhook_deliveries_sync,
+    dead_letter_webhook_delivery_sync,
+    get_webhook_deliveries_sync,
+)
+from app.models import WebhookDelivery
+from app.webhooks import SIGNATURE_HEADER, public_addresses, sign
+
+logger = logging.getLogger(__name__)
+
+
+def retry_delay(attempts: int, base: float, maximum: float) -> timedelta:
+    return timedelta(seconds=min(base * 2 ** (attempts - 1), maximum))
+
+
+def delivery_body(deliveries: list[WebhookDelivery]) -> bytes:
+    return json.dumps(
+        {
+            "events": [
+                {
+                    "id": delivery.id,
+                    "type": delivery.event,
+                    "created_at": delivery.created_at.isoformat(),
+                    "data": delivery.payload,
+                }
+                for delivery in deliveries
+            ]
+        }
+    ).encode()
+
+
+class _PublicAddressBackend(httpcore.SyncBackend):
+    """Connects to the addresses it has checked, never to a fresh lookup.
+
+    Checking the URL first and letting the client resolve the name again
+    would let a DNS-rebinding host pass the check and still be reached on a
+    private address. TLS keeps verifying against the URL's host name.
+    """
+
+    def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: float | None = None,
+        local_address: str | None = None,
+        socket_options=None,
+    ) -> httpcore.NetworkStream:
+        if settings.WEBHOOK_ALLOW_PRIVATE_HOSTS:
+            return super().connect_tcp(
+                host, port, timeout, local_address, socket_options
+            )
+        try:
+            addresses = public_addresses(host, port)
+        except ValueError as e:
+            raise httpcore.ConnectError(str(e))
+        for address in addresses:
+            try:
+                return super().connect_tcp(
+                    address, port, timeout, local_address, socket_options
+                )
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                error = e
+        raise error
+
+
+def public_transport(**kwargs) -> httpx.HTTPTransport:
+    transport = httpx.HTTPTransport(**kwargs)
+    # httpx does not expose httpcore's network_backend option
+    transport._pool._network_backend = _PublicAddressBackend()
+    return transport
+
+
+def post_webhook(
+    client: httpx.Client, url: str, secret: str, body: bytes
+) -> str | None:
+    """POST one signed batch; returns the error, or None when delivered.
+
+    The client must use ``public_transport``, which only connects to public
+    addresses. The response body is never read, so a slow endpoint cannot
+    keep the request open beyond its status line.
+    """
+    headers = {
+        "Content-Type": "application/json",
+        SIGNATURE_HEADER: sign(secret, int(time.time()), body),
+    }
+    try:
+        with client.stream("POST", url, content=body, headers=headers) as response:
+            pass
+    except httpx.HTTPError as e:
+        return f"{type(e).__name__}: {e}"
+    if response.is_success:
+        return None
+    return f"HTTP {response.status_code}"
+
+
+def deliver_due_webhooks(
+    session_factory: Callable[[], Session],
+    client: httpx.Client,
+    now: datetime,
+    batch_size: int,
+    max_attempts: int,
+) -> dict[str, int]:
+    """Send due deliveries as one request per endpoint.
+
+    Claimed deliveries are leased by moving ``next_attempt_at`` a
+    ``WEBHOOK_LEASE`` per round of requests ahead, and that is committed
+    before anything is sent, so no row lock or transaction stays open during
+    the HTTP fan-out. Endpoints are posted to concurrently through the shared
+    client and the outcomes are recorded in a second transaction. Failed batches are retried with
+    exponential backoff and moved to the dead-letter table after
+    ``max_attempts``.
+    """
+    counts = {"delivered": 0, "retried": 0, "dead": 0}
+    with session_factory() as session:
+        deliveries = claim_webhook_deliveries_sync(session, now, batch_size)
+        if not deliveries:
+            return counts
+
+        batches: dict[int, list[WebhookDelivery]] = defaultdict(list)
+        for delivery in deliveries:
+            batches[delivery.subscription_id].append(delivery)
+        requests = [
+            (
+                batch[0].subscription.url,
+                batch[0].subscription.secret,
+                delivery_body(batch),
+            )
+            for batch in batches.values()
+        ]
+        batch_ids = [[delivery.id for delivery in batch] for batch in batches.values()]
+
+        workers = min(len(requests), settings.WEBHOOK_POOL_SIZE)
+        rounds = math.ceil(len(requests) / workers)
+        lease = timedelta(seconds=settings.WEBHOOK_LEASE * rounds)
+        for delivery in deliveries:
+            delivery.next_attempt_at = now + lease
+        session.commit()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        errors = list(
+            executor.map(lambda request: post_webhook(client, *request), requests)
+        )
+
+    with session_factory() as session:
+        for ids, error in zip(batch_ids, errors):
+            batch = get_webhook_deliveries_sync(session, ids)
+            for delivery in batch:
+                if error is None:
+                    session.delete(delivery)
+                    counts["delivered"] += 1
+                    continue
+                delivery.attempts += 1
+                delivery.last_error = error
+                if delivery.attempts >= max_attempts:
+                    dead_letter_webhook_delivery_sync(session, delivery, now)
+                    counts["dead"] += 1
+                else:
+                    delivery.next_attempt_at = now + retry_delay(
+                        delivery.attempts,
+                        settings.WEBHOOK_RETRY_BASE,
+                        settings.WEBHOOK_RETRY_MAX,
+                    )
+                    counts["retried"] += 1
+            if error is not None and batch:
+                logger.warning(
+                    f"Webhook delivery to subscription {batch[0].subscription_id} "
+                    f"failed: {error}"
+                )
+        session.commit()
+    return counts
+
+
+_client: httpx.Client | None = None
+_client_pid: int | None = None
+
+
+def get_http_client() -> httpx.Client:
+    global _client, _client_pid
+
+    if _client is None or _client_pid != os.getpid():
+        _client = httpx.Client(
+            timeout=settings.WEBHOOK_TIMEOUT,
+            transport=public_transport(
+                limits=httpx.Limits(
+                    max_connections=settings.WEBHOOK_POOL_SIZE,
+                    max_keepalive_connections=settings.WEBHOOK_POOL_SIZE,
+                ),
+            ),
+            # Environment proxies would get their own transport, bypassing
+            # the address check
+            trust_env=False,
+            headers={"User-Agent": "booking-service-webhooks"},
+        )
+        _client_pid = os.getpid()
+    return _client
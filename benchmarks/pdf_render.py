@@ -0,0 +1,46 @@
+"""Measures booking confirmation PDFs rendered per second.
+
+    python -m benchmarks.pdf_render --count 2000 --processes 4
+"""
+import argparse
+import time
+
+from app.worker.pdf import render_booking_pdf, render_booking_pdfs
+
+
+def _booking(i: int) -> dict:
+    return {
+        "id": i,
+        "guest_name": f"Guest {i}",
+        "property_title": f"Property {i % 100}",
+        "check_in": "2026-11-02",
+        "check_out": "2026-11-12",
+        "guests": 2,
+        "total_price": 1999.99,
+    }
+
+
+def _report(label: str, count: int, elapsed: float) -> None:
+    print(f"{label:<24} {count / elapsed:>10.1f} PDFs/sec ({elapsed:.2f}s)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=1000)
+    parser.add_argument("--processes", type=int, default=None)
+    args = parser.parse_args()
+
+    bookings = [_booking(i) for i in range(args.count)]
+
+    started = time.perf_counter()
+    for booking_data in bookings:
+        render_booking_pdf(booking_data)
+    _report("single process", args.count, time.perf_counter() - started)
+
+    started = time.perf_counter()
+    render_booking_pdfs(bookings, processes=args.processes)
+    _report("process pool", args.count, time.perf_counter() - started)
+
+
+if __name__ == "__main__":
+    main()
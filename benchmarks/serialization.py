@@ -0,0 +1,94 @@
+"""Compares FastAPI response_model serialization with app.responses.json_response
+on a page of 100 properties.
+
+    python -m benchmarks.serialization --items 100 --rounds 2000
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime
+from types import SimpleNamespace
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.responses import json_response
+from app.schemas import PaginatedProperties, PropertyResponse
+
+
+def _property(i: int) -> SimpleNamespace:
+    user = SimpleNamespace(
+        id=1,
+        first_name="Host",
+        last_name="User",
+        email="host@example.com",
+        role="host",
+        created_at=datetime(2026, 1, 1),
+    )
+    return SimpleNamespace(
+        id=i,
+        host_id=1,
+        title=f"Property {i}",
+        description="A cosy flat in the city centre " * 4,
+        address=f"{i} Main Street",
+        city="Berlin",
+        beds=2,
+        price=120.5,
+        status="available",
+        created_at=datetime(2026, 1, 1),
+        user=user,
+    )
+
+
+def _fastapi_path(loop, field, properties: list) -> bytes:
+    # What list_properties did before: validate each item, then let FastAPI
+    # validate response_model and encode the result again.
+    content = PaginatedProperties(
+        items=[PropertyResponse.model_validate(p) for p in properties],
+        limit=100,
+        offset=0,
+        total=len(properties),
+    )
+    serialized = loop.run_until_complete(
+        serialize_response(field=field, response_content=content, is_coroutine=True)
+    )
+    return JSONResponse(serialized).body
+
+
+def _fast_path(properties: list) -> bytes:
+    return json_response(
+        PaginatedProperties,
+        {"items": properties, "limit": 100, "offset": 0, "total": len(properties)},
+    ).body
+
+
+def _measure(label: str, rounds: int, fn) -> None:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<24} {elapsed / rounds * 1e6:>10.1f} us/page")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=2000)
+    args = parser.parse_args()
+
+    properties = [_property(i) for i in range(args.items)]
+    field = create_model_field(name="response", type_=PaginatedProperties)
+    loop = asyncio.new_event_loop()
+
+    _measure(
+        "response_model",
+        args.rounds,
+        lambda: _fastapi_path(loop, field, properties),
+    )
+    _measure("json_response", args.rounds, lambda: _fast_path(properties))
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
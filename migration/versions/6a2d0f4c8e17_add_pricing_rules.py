@@ -0,0 +1,44 @@
+"""Add pricing rules
+
+Revision ID: 6a2d0f4c8e17
+Revises: 3f1c9a7e2b64
+Create Date: 2026-10-19 11:02:13.774502
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6a2d0f4c8e17'
+down_revision: Union[str, Sequence[str], None] = '3f1c9a7e2b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('pricing_rules',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('property_id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.Enum('OVERRIDE', 'WEEKEND', 'SEASONAL', 'LENGTH_OF_STAY', name='pricingrulekind'), nullable=False),
+    sa.Column('start_date', sa.Date(), nullable=True),
+    sa.Column('end_date', sa.Date(), nullable=True),
+    sa.Column('price', sa.Float(), nullable=True),
+    sa.Column('multiplier', sa.Float(), nullable=False),
+    sa.Column('min_nights', sa.Integer(), nullable=True),
+    sa.Column('discount', sa.Float(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['property_id'], ['properties.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_pricing_rules_property_id'), 'pricing_rules', ['property_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_pricing_rules_property_id'), table_name='pricing_rules')
+    op.drop_table('pricing_rules')
+    sa.Enum(name='pricingrulekind').drop(op.get_bind(), checkfirst=True)
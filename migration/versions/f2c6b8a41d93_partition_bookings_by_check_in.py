@@ -0,0 +1,125 @@
+"""Partition bookings by check_in
+
+Revision ID: f2c6b8a41d93
+Revises: e5a7c3d19b28
+Create Date: 2026-10-19 15:48:03.217554
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.config import settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c6b8a41d93'
+down_revision: Union[str, Sequence[str], None] = 'e5a7c3d19b28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Monthly partitions are created up to this many months past the current one;
+# the maintain_booking_partitions beat task keeps extending them.
+PARTITIONS_AHEAD = 3
+
+
+def _rename_existing(table: str) -> None:
+    op.execute(f"ALTER TABLE bookings RENAME TO {table}")
+    op.execute(f"ALTER TABLE {table} RENAME CONSTRAINT bookings_pkey TO {table}_pkey")
+    op.execute(f"ALTER INDEX ix_bookings_id RENAME TO ix_{table}_id")
+    op.execute(f"ALTER INDEX ix_bookings_active RENAME TO ix_{table}_active")
+
+
+def _create_indexes() -> None:
+    op.create_index('ix_bookings_id', 'bookings', ['id'], unique=False)
+    op.create_index('ix_bookings_guest_id', 'bookings', ['guest_id'], unique=False)
+    op.create_index('ix_bookings_active', 'bookings', ['property_id', 'check_in', 'check_out'], unique=False, postgresql_where=sa.text("status IN ('PENDING', 'CONFIRMED')"))
+
+
+def _check_stay_lengths() -> None:
+    # Overlap queries bound check_in from below by MAX_STAY_NIGHTS to prune
+    # partitions; a longer stay already in the table would silently drop out
+    # of availability checks.
+    op.execute(f"""
+        DO $$
+        BEGIN
+            IF EXISTS (
+                SELECT 1 FROM bookings
+                WHERE check_out - check_in > {settings.MAX_STAY_NIGHTS}
+            ) THEN
+                RAISE EXCEPTION 'Bookings longer than MAX_STAY_NIGHTS = % exist',
+                    {settings.MAX_STAY_NIGHTS};
+            END IF;
+        END $$
+    """)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _check_stay_lengths()
+    _rename_existing('bookings_unpartitioned')
+
+    op.execute(
+        "CREATE TABLE bookings (LIKE bookings_unpartitioned INCLUDING DEFAULTS) "
+        "PARTITION BY RANGE (check_in)"
+    )
+    op.create_primary_key('bookings_pkey', 'bookings', ['id', 'check_in'])
+    op.create_foreign_key(None, 'bookings', 'users', ['guest_id'], ['id'])
+    op.create_foreign_key(None, 'bookings', 'properties', ['property_id'], ['id'])
+    _create_indexes()
+
+    # Rows outside every monthly range land here instead of failing the insert;
+    # maintain_booking_partitions moves them out when their month is created
+    op.execute("CREATE TABLE bookings_default PARTITION OF bookings DEFAULT")
+    # Existing rows are all covered by monthly partitions, however far ahead
+    # they were booked. ids keep coming from bookings_id_seq, which is what
+    # keeps them unique: Postgres can't enforce it without check_in in the key.
+    op.execute(f"""
+        DO $$
+        DECLARE
+            month date;
+            last_month date;
+        BEGIN
+            SELECT date_trunc('month', coalesce(min(check_in), current_date))::date,
+                   greatest(
+                       date_trunc('month', coalesce(max(check_in), current_date)),
+                       date_trunc('month', current_date)
+                           + interval '{PARTITIONS_AHEAD} months'
+                   )::date
+            INTO month, last_month FROM bookings_unpartitioned;
+            WHILE month <= last_month LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF bookings FOR VALUES FROM (%L) TO (%L)',
+                    'bookings_p' || to_char(month, 'YYYYMM'),
+                    month,
+                    (month + interval '1 month')::date
+                );
+                month := (month + interval '1 month')::date;
+            END LOOP;
+        END $$
+    """)
+
+    op.execute("INSERT INTO bookings SELECT * FROM bookings_unpartitioned")
+    op.execute("ALTER SEQUENCE bookings_id_seq OWNED BY bookings.id")
+    op.drop_table('bookings_unpartitioned')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("ALTER TABLE bookings RENAME TO bookings_partitioned")
+    op.execute("ALTER TABLE bookings_partitioned RENAME CONSTRAINT bookings_pkey TO bookings_partitioned_pkey")
+    op.execute("ALTER INDEX ix_bookings_id RENAME TO ix_bookings_partitioned_id")
+    op.execute("ALTER INDEX ix_bookings_guest_id RENAME TO ix_bookings_partitioned_guest_id")
+    op.execute("ALTER INDEX ix_bookings_active RENAME TO ix_bookings_partitioned_active")
+
+    op.execute("CREATE TABLE bookings (LIKE bookings_partitioned INCLUDING DEFAULTS)")
+    op.create_primary_key('bookings_pkey', 'bookings', ['id'])
+    op.create_foreign_key(None, 'bookings', 'users', ['guest_id'], ['id'])
+    op.create_foreign_key(None, 'bookings', 'properties', ['property_id'], ['id'])
+    op.create_index('ix_bookings_id', 'bookings', ['id'], unique=False)
+    op.create_index('ix_bookings_active', 'bookings', ['property_id', 'check_in', 'check_out'], unique=False, postgresql_where=sa.text("status IN ('PENDING', 'CONFIRMED')"))
+
+    op.execute("INSERT INTO bookings SELECT * FROM bookings_partitioned")
+    op.execute("ALTER SEQUENCE bookings_id_seq OWNED BY bookings.id")
+    op.drop_table('bookings_partitioned')
@@ -1,11 +1,15 @@
 import asyncio
+import os
 from collections.abc import AsyncGenerator
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, AsyncMock
 
 import pytest
 from httpx import ASGITransport, AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
+# Holds default to Redis; the suite runs without one
+os.environ.setdefault("HOLD_STORE_URL", "memory://")
+
 from app.database import Base, get_db
 from app.main import app
 from app.models import UserRole
@@ -53,10 +57,22 @@ async def client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
 
 
 @pytest.fixture(autouse=True)
-def mock_celery_tasks():
-    with patch("app.routes.bookings.process_booking_confirmation") as mock_task:
-        mock_task.delay = MagicMock(return_value=None)
-        yield mock_task
+def clear_caches():
+    from app.availability import calendar_cache
+    from app.holds import MemoryHoldStore, get_hold_store
+
+    calendar_cache.clear()
+    store = get_hold_store()
+    if isinstance(store, MemoryHoldStore):
+        store.clear()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def mock_task_publisher():
+    with patch("app.routes.bookings.task_publisher") as mock_publisher:
+        mock_publisher.publish = AsyncMock(return_value=None)
+        yield mock_publisher
 
 
 @pytest.fixture
@@ -0,0 +1,230 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from httpx import AsyncClient
+
+from app.admission import AdmissionController, AdmissionRejected
+
+
+def _controller(**overrides) -> AdmissionController:
+    options = dict(per_key_limit=1, max_waiters=1, global_limit=2, queue_timeout=0.05)
+    options.update(overrides)
+    return AdmissionController(**options)
+
+
+@pytest.mark.asyncio
+async def test_waiter_is_admitted_when_slot_frees():
+    controller = _controller(queue_timeout=1.0)
+    order = []
+
+    async def request(name: str, hold: float):
+        async with controller.admit(7):
+            order.append(name)
+            await asyncio.sleep(hold)
+
+    await asyncio.gather(request("first", 0.05), request("second", 0))
+    assert order == ["first", "second"]
+    assert controller.metrics()["admitted"] == 2
+    assert controller.metrics()["hot_keys"] == 0
+
+
+@pytest.mark.asyncio
+async def test_rejects_when_property_queue_is_full():
+    controller = _controller(max_waiters=0)
+    async with controller.admit(7):
+        with pytest.raises(AdmissionRejected) as rejected:
+            async with controller.admit(7):
+                pass
+        async with controller.admit(8):
+            pass
+    assert rejected.value.status_code == 429
+    assert controller.metrics()["rejected_key"] == 1
+
+
+@pytest.mark.asyncio
+async def test_rejects_after_queue_timeout():
+    controller = _controller()
+    async with controller.admit(7):
+        with pytest.raises(AdmissionRejected) as rejected:
+            async with controller.admit(7):
+                pass
+    assert rejected.value.status_code == 429
+
+
+@pytest.mark.asyncio
+async def test_global_cap_sheds_with_503():
+    controller = _controller(global_limit=1)
+    async with controller.admit(7):
+        with pytest.raises(AdmissionRejected) as rejected:
+            async with controller.admit(8):
+                pass
+    assert rejected.value.status_code == 503
+    assert controller.metrics()["rejected_global"] == 1
+
+
+class _FullLimiter:
+    async def acquire(self, key):
+        return None
+
+    async def release(self, key, token):
+        raise AssertionError("nothing to release")
+
+
+@pytest.mark.asyncio
+async def test_distributed_limiter_rejection():
+    controller = _controller(limiter=_FullLimiter())
+    with pytest.raises(AdmissionRejected):
+        async with controller.admit(7):
+            pass
+    assert controller.metrics()["rejected_distributed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_place_booking_rejected_with_retry_after(
+    client: AsyncClient, test_property, customer_token
+):
+    controller = _controller(max_waiters=0, retry_after=3)
+    with patch("app.dependencies.admission", controller):
+        async with controller.admit(test_property.id):
+            response = await client.post(
+                "/bookings",
+                json={
+                    "property_id": test_property.id,
+                    "guests": 2,
+                    "check_in": "2026-11-02",
+                    "check_out": "2026-11-05",
+                },
+                headers={"Authorization": f"Bearer {customer_token}"},
+            )
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "3"
+
+
+@pytest.mark.asyncio
+async def test_released_admission_frees_its_slots():
+    controller = _controller(max_waiters=0)
+    async with controller.admit(7) as admitted:
+        await admitted.release()
+        assert controller.metrics()["active"] == 0
+        async with controller.admit(7):
+            pass
+
+        await admitted.reacquire()
+        assert admitted.held
+        with pytest.raises(AdmissionRejected):
+            async with controller.admit(7):
+                pass
+    assert controller.metrics()["active"] == 0
+    assert controller.metrics()["hot_keys"] == 0
+
+
+@pytest.mark.asyncio
+async def test_idempotent_duplicate_waits_without_admission_slot(
+    client: AsyncClient, db_session, test_property, test_customer, customer_token
+):
+    from datetime import datetime, timedelta
+
+    from fastapi import Request
+
+    from app.idempotency import request_fingerprint
+    from app.models import IdempotencyKey
+    from app.schemas import BookingCreate
+
+    payload = {
+        "property_id": test_property.id,
+        "guests": 2,
+        "check_in": "2026-11-02",
+        "check_out": "2026-11-05",
+    }
+    request = Request(
+        {"type": "http", "method": "POST", "path": "/bookings", "headers": []}
+    )
+    db_session.add(
+        IdempotencyKey(
+            user_id=test_customer.id,
+            key="waiting",
+            request_hash=request_fingerprint(request, BookingCreate(**payload)),
+            expires_at=datetime.now() + timedelta(hours=1),
+        )
+    )
+    await db_session.commit()
+
+    controller = _controller(max_waiters=0)
+    with (
+        patch("app.dependencies.admission", controller),
+        patch("app.idempotency.settings.IDEMPOTENCY_WAIT_TIMEOUT", 0.5),
+    ):
+        duplicate = asyncio.create_task(
+            client.post(
+                "/bookings",
+                json=payload,
+                headers={
+                    "Authorization": f"Bearer {customer_token}",
+                    "Idempotency-Key": "waiting",
+                },
+            )
+        )
+        await asyncio.sleep(0.2)
+        # The property's only slot is free while the duplicate waits
+        async with controller.admit(test_property.id):
+            pass
+        response = await duplicate
+
+    assert response.status_code == 409
+    assert controller.metrics()["active"] == 0
+
+
+@pytest.mark.asyncio
+async def test_duplicate_rejected_when_slot_is_gone_after_waiting(
+    client: AsyncClient, db_session, test_property, test_customer, customer_token
+):
+    from datetime import datetime, timedelta
+
+    from fastapi import Request
+
+    from app.idempotency import request_fingerprint
+    from app.models import IdempotencyKey
+    from app.schemas import BookingCreate
+
+    payload = {
+        "property_id": test_property.id,
+        "guests": 2,
+        "check_in": "2026-11-02",
+        "check_out": "2026-11-05",
+    }
+    request = Request(
+        {"type": "http", "method": "POST", "path": "/bookings", "headers": []}
+    )
+    # The owner's lease runs out while the duplicate waits
+    db_session.add(
+        IdempotencyKey(
+            user_id=test_customer.id,
+            key="lapsed",
+            request_hash=request_fingerprint(request, BookingCreate(**payload)),
+            expires_at=datetime.now() + timedelta(seconds=0.3),
+        )
+    )
+    await db_session.commit()
+
+    controller = _controller(max_waiters=0, retry_after=2)
+    with (
+        patch("app.dependencies.admission", controller),
+        patch("app.idempotency.settings.IDEMPOTENCY_POLL_INTERVAL", 0.05),
+    ):
+        duplicate = asyncio.create_task(
+            client.post(
+                "/bookings",
+                json=payload,
+                headers={
+                    "Authorization": f"Bearer {customer_token}",
+                    "Idempotency-Key": "lapsed",
+                },
+            )
+        )
+        await asyncio.sleep(0.1)
+        async with controller.admit(test_property.id):
+            response = await duplicate
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "2"
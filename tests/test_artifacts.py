@@ -0,0 +1,72 @@
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app.worker.artifacts import (
+    ArtifactNotFound,
+    LocalArtifactStore,
+    create_artifact_store,
+)
+
+BOOKING_DATA = {
+    "id": 1,
+    "guest_id": 1,
+    "guest_name": "Customer User",
+    "property_id": 1,
+    "property_title": "Test Property",
+    "check_in": "2026-11-02",
+    "check_out": "2026-11-12",
+    "guests": 2,
+    "total_price": 2000.0,
+}
+
+
+def test_local_store_roundtrip(tmp_path):
+    store = LocalArtifactStore(tmp_path, ttl=60)
+    key = store.put(store.new_key("bookings/1", ".pdf"), b"%PDF-data")
+
+    assert key.startswith("bookings/1/")
+    assert store.get(key) == b"%PDF-data"
+
+    store.delete(key)
+    with pytest.raises(ArtifactNotFound):
+        store.get(key)
+
+
+def test_local_store_rejects_keys_outside_directory(tmp_path):
+    store = LocalArtifactStore(tmp_path / "artifacts", ttl=60)
+    with pytest.raises(ValueError):
+        store.put("../escape.pdf", b"data")
+
+
+def test_local_store_purges_expired_artifacts(tmp_path):
+    store = LocalArtifactStore(tmp_path, ttl=60)
+    old_key = store.put("bookings/old.pdf", b"old")
+    new_key = store.put("bookings/new.pdf", b"new")
+    expired = time.time() - 120
+    os.utime(tmp_path / old_key, (expired, expired))
+
+    assert store.purge_expired() == 1
+    assert store.get(new_key) == b"new"
+
+
+def test_create_artifact_store_from_url(tmp_path):
+    store = create_artifact_store(f"file://{tmp_path}", ttl=10)
+    assert isinstance(store, LocalArtifactStore)
+    assert store.ttl == 10
+
+    with pytest.raises(ValueError):
+        create_artifact_store("s3://bucket/prefix", ttl=10)
+
+
+def test_generate_booking_pdf_returns_artifact_key(tmp_path):
+    from app.worker.tasks import generate_booking_pdf
+
+    store = LocalArtifactStore(tmp_path, ttl=60)
+    with patch("app.worker.tasks.get_artifact_store", return_value=store):
+        key = generate_booking_pdf.run(BOOKING_DATA)
+
+    assert key.startswith("bookings/1/")
+    assert store.get(key).startswith(b"%PDF")
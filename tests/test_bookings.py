@@ -36,6 +36,23 @@ async def test_create_booking_unauthorized(client: AsyncClient, test_property):
     assert response.status_code == 401
 
 
+@pytest.mark.asyncio
+async def test_create_booking_longer_than_max_stay(
+    client: AsyncClient, test_property, customer_token
+):
+    response = await client.post(
+        "/bookings",
+        json={
+            "property_id": test_property.id,
+            "guests": 2,
+            "check_in": "2026-11-02",
+            "check_out": "2028-11-02",
+        },
+        headers={"Authorization": f"Bearer {customer_token}"},
+    )
+    assert response.status_code == 422
+
+
 @pytest.mark.asyncio
 async def test_create_booking_property_not_found(client: AsyncClient, customer_token):
     response = await client.post(
@@ -101,3 +118,411 @@ async def test_admin_cancel_booking(client: AsyncClient, test_booking, admin_tok
     assert response.status_code == 200
     data = response.json()
     assert data["status"] == "cancelled"
+
+
+@pytest.mark.asyncio
+async def test_create_booking_writes_outbox_message(
+    client: AsyncClient, db_session, test_property, customer_token, mock_task_publisher
+):
+    from sqlalchemy import select
+
+    from app.models import OutboxMessage
+
+    response = await client.post(
+        "/bookings",
+        json={
+            "property_id": test_property.id,
+            "guests": 1,
+            "check_in": "2026-12-01",
+            "check_out": "2026-12-03",
+        },
+        headers={"Authorization": f"Bearer {customer_token}"},
+    )
+    assert response.status_code == 201
+
+    result = await db_session.execute(select(OutboxMessage))
+    messages = result.scalars().all()
+    assert len(messages) == 1
+    assert messages[0].task_name == "app.celery.tasks.process_booking_confirmation"
+    booking_id = response.json()["id"]
+    assert messages[0].payload == {
+        "booking_id": booking_id,
+        "user_email": "customer@example.com",
+        "booking_data": {
+            "id": booking_id,
+            "guest_id": response.json()["guest_id"],
+            "guest_name": "Customer User",
+            "property_id": test_property.id,
+            "property_title": "Test Property",
+            "check_in": "2026-12-01",
+            "check_out": "2026-12-03",
+            "guests": 1,
+            "total_price": 200.0,
+        },
+    }
+    assert messages[0].published_at is None
+    mock_task_publisher.publish.assert_awaited_once()
+
+
+def test_get_bookings_with_details_sync_loads_in_one_query():
+    from sqlalchemy import create_engine, event
+    from sqlalchemy.orm import Session
+
+    from app.crud import get_bookings_with_details_sync
+    from app.database import Base
+    from app.models import Booking, Property, User
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        guest = User(first_name="Guest", last_name="One", email="g@x.com", password="x")
+        host = User(first_name="Host", last_name="One", email="h@x.com", password="x")
+        session.add_all([guest, host])
+        session.flush()
+        property = Property(
+            title="Cabin",
+            description="Cabin",
+            address="Road",
+            city="Town",
+            host_id=host.id,
+        )
+        session.add(property)
+        session.flush()
+        bookings = [
+            Booking(property_id=property.id, guest_id=guest.id) for _ in range(3)
+        ]
+        session.add_all(bookings)
+        session.commit()
+        ids = [booking.id for booking in bookings]
+
+    statements = []
+    event.listen(
+        engine, "before_cursor_execute", lambda *args: statements.append(args[2])
+    )
+    with Session(engine) as session:
+        loaded = get_bookings_with_details_sync(session, ids + [999])
+        titles = {booking.property.title for booking in loaded}
+        names = {booking.user.first_name for booking in loaded}
+
+    assert sorted(booking.id for booking in loaded) == ids
+    assert titles == {"Cabin"}
+    assert names == {"Guest"}
+    assert len(statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_list_bookings_sparse_fields(
+    client: AsyncClient, test_booking, customer_token
+):
+    response = await client.get(
+        "/bookings?fields=status,check_in",
+        headers={"Authorization": f"Bearer {customer_token}"},
+    )
+    assert response.status_code == 200
+    assert response.json() == [
+        {"id": test_booking.id, "check_in": "2025-01-01", "status": "pending"}
+    ]
+
+
+@pytest.mark.asyncio
+async def test_place_booking_idempotency_key_replays_response(
+    client: AsyncClient, test_property, customer_token, mock_task_publisher
+):
+    payload = {
+        "property_id": test_property.id,
+        "guests": 2,
+        "check_in": "2026-11-02",
+        "check_out": "2026-11-05",
+    }
+    headers = {
+        "Authorization": f"Bearer {customer_token}",
+        "Idempotency-Key": "retry-1",
+    }
+
+    first = await client.post("/bookings", json=payload, headers=headers)
+    retry = await client.post("/bookings", json=payload, headers=headers)
+
+    assert first.status_code == retry.status_code == 201
+    assert retry.json() == first.json()
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert "Idempotent-Replayed" not in first.headers
+    mock_task_publisher.publish.assert_awaited_once()
+
+    response = await client.get(
+        "/bookings", headers={"Authorization": f"Bearer {customer_token}"}
+    )
+    assert len(response.json()) == 1
+
+
+@pytest.mark.asyncio
+async def test_place_booking_idempotency_key_reused_with_other_body(
+    client: AsyncClient, test_property, customer_token
+):
+    headers = {
+        "Authorization": f"Bearer {customer_token}",
+        "Idempotency-Key": "retry-2",
+    }
+    payload = {
+        "property_id": test_property.id,
+        "guests": 2,
+        "check_in": "2026-11-02",
+        "check_out": "2026-11-05",
+    }
+    await client.post("/bookings", json=payload, headers=headers)
+
+    response = await client.post(
+        "/bookings", json={**payload, "guests": 3}, headers=headers
+    )
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_place_booking_idempotency_key_in_flight(
+    client: AsyncClient, db_session, test_property, test_customer, customer_token
+):
+    from datetime import datetime, timedelta
+    from unittest.mock import patch
+
+    from fastapi import Request
+    from app.idempotency import request_fingerprint
+    from app.models import IdempotencyKey
+    from app.schemas import BookingCreate
+
+    payload = {
+        "property_id": test_property.id,
+        "guests": 2,
+        "check_in": "2026-11-02",
+        "check_out": "2026-11-05",
+    }
+    request = Request(
+        {"type": "http", "method": "POST", "path": "/bookings", "headers": []}
+    )
+    db_session.add(
+        IdempotencyKey(
+            user_id=test_customer.id,
+            key="retry-3",
+            request_hash=request_fingerprint(request, BookingCreate(**payload)),
+            expires_at=datetime.now() + timedelta(hours=1),
+        )
+    )
+    await db_session.commit()
+
+    with patch("app.idempotency.settings.IDEMPOTENCY_WAIT_TIMEOUT", 0.2):
+        response = await client.post(
+            "/bookings",
+            json=payload,
+            headers={
+                "Authorization": f"Bearer {customer_token}",
+                "Idempotency-Key": "retry-3",
+            },
+        )
+    assert response.status_code == 409
+
+
+@pytest.mark.asyncio
+async def test_idempotency_key_lease_is_short_until_completed(
+    client: AsyncClient, db_session, test_property, test_customer, customer_token
+):
+    from datetime import datetime, timedelta
+
+    from fastapi import Request
+    from sqlalchemy import select
+
+    from app.config import settings
+    from app.idempotency import request_fingerprint
+    from app.models import IdempotencyKey
+    from app.schemas import BookingCreate
+
+    payload = {
+        "property_id": test_property.id,
+        "guests": 2,
+        "check_in": "2026-11-02",
+        "check_out": "2026-11-05",
+    }
+    request = Request(
+        {"type": "http", "method": "POST", "path": "/bookings", "headers": []}
+    )
+    # A claim whose owner died; its lease has run out
+    db_session.add(
+        IdempotencyKey(
+            user_id=test_customer.id,
+            key="retry-4",
+            request_hash=request_fingerprint(request, BookingCreate(**payload)),
+            expires_at=datetime.now() - timedelta(seconds=1),
+        )
+    )
+    await db_session.commit()
+
+    response = await client.post(
+        "/bookings",
+        json=payload,
+        headers={
+            "Authorization": f"Bearer {customer_token}",
+            "Idempotency-Key": "retry-4",
+        },
+    )
+    assert response.status_code == 201
+
+    record = await db_session.scalar(
+        select(IdempotencyKey).where(IdempotencyKey.key == "retry-4")
+    )
+    await db_session.refresh(record)
+    assert record.status_code == 201
+    assert record.expires_at > datetime.now() + timedelta(
+        seconds=settings.IDEMPOTENCY_KEY_TTL - 60
+    )
+
+
+@pytest.mark.asyncio
+async def test_idempotency_claim_uses_lease():
+    from datetime import datetime, timedelta
+    from unittest.mock import AsyncMock, MagicMock, patch
+
+    from fastapi import Response
+
+    from app.config import settings
+    from app.idempotency import idempotent
+
+    claim = AsyncMock(return_value="token")
+    with (
+        patch("app.idempotency.claim_idempotency_key", claim),
+        patch("app.idempotency.complete_idempotency_key", AsyncMock()),
+    ):
+        await idempotent(
+            MagicMock(info={}), 1, "k", "hash", AsyncMock(return_value=Response())
+        )
+
+    remaining = claim.await_args.args[4] - datetime.now()
+    assert timedelta(0) < remaining <= timedelta(seconds=settings.IDEMPOTENCY_LEASE)
+
+
+@pytest.mark.asyncio
+async def test_idempotency_key_kept_when_handler_fails_after_commit(
+    db_session, test_customer
+):
+    from unittest.mock import AsyncMock, patch
+
+    from fastapi import HTTPException
+    from sqlalchemy import select
+
+    from app.idempotency import idempotent
+    from app.models import IdempotencyKey
+
+    async def handler():
+        test_customer.first_name = "Booked"
+        await db_session.commit()
+        raise RuntimeError("failed after the booking was committed")
+
+    with pytest.raises(RuntimeError):
+        await idempotent(db_session, test_customer.id, "after-commit", "h", handler)
+
+    record = await db_session.scalar(
+        select(IdempotencyKey).where(IdempotencyKey.key == "after-commit")
+    )
+    assert record is not None and record.executed
+
+    # The retry must not run the handler again
+    retry = AsyncMock()
+    with patch("app.idempotency.settings.IDEMPOTENCY_WAIT_TIMEOUT", 0.1):
+        with pytest.raises(HTTPException) as e:
+            await idempotent(db_session, test_customer.id, "after-commit", "h", retry)
+    assert e.value.status_code == 409
+    retry.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_idempotency_commit_aborts_when_claim_taken_over(
+    db_session, test_customer
+):
+    from fastapi import HTTPException
+    from sqlalchemy import select, update
+
+    from app.idempotency import idempotent
+    from app.models import IdempotencyKey, User
+
+    async def handler():
+        # The lease ran out and another request claimed the key meanwhile
+        await db_session.execute(
+            update(IdempotencyKey)
+            .where(IdempotencyKey.key == "taken-over")
+            .values(claim_token="other")
+        )
+        test_customer.first_name = "Twice"
+        await db_session.commit()
+
+    user_id = test_customer.id
+    with pytest.raises(HTTPException) as e:
+        await idempotent(db_session, user_id, "taken-over", "h", handler)
+    assert e.value.status_code == 409
+
+    first_name = await db_session.scalar(
+        select(User.first_name).where(User.id == user_id)
+    )
+    assert first_name != "Twice"
+
+
+@pytest.mark.asyncio
+async def test_lookup_bookings_marks_missing_and_forbidden(
+    client: AsyncClient, db_session, test_booking, test_property, test_admin
+):
+    from datetime import date
+
+    from app.models import Booking
+    from app.security import create_access_token
+
+    other = Booking(
+        property_id=test_property.id,
+        guest_id=test_admin.id,
+        check_in=date(2025, 2, 1),
+        check_out=date(2025, 2, 5),
+    )
+    db_session.add(other)
+    await db_session.commit()
+
+    token = create_access_token({"sub": str(test_booking.guest_id)})
+    missing = other.id + 100
+    response = await client.post(
+        "/bookings/lookup",
+        json={"ids": [other.id, missing, test_booking.id]},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert [(item["id"], item["status"]) for item in items] == [
+        (other.id, "forbidden"),
+        (missing, "not_found"),
+        (test_booking.id, "ok"),
+    ]
+    assert items[0]["item"] is None
+    assert items[2]["item"]["guest_id"] == test_booking.guest_id
+
+
+@pytest.mark.asyncio
+async def test_lookup_bookings_as_host(client: AsyncClient, test_booking, host_token):
+    response = await client.post(
+        "/bookings/lookup",
+        json={"ids": [test_booking.id]},
+        headers={"Authorization": f"Bearer {host_token}"},
+    )
+    assert response.json()["items"][0]["status"] == "ok"
+
+
+@pytest.mark.asyncio
+async def test_create_booking_survives_full_publisher(
+    client: AsyncClient, test_property, customer_token, mock_task_publisher, caplog
+):
+    from app.worker.publisher import PublisherFull
+
+    mock_task_publisher.publish.side_effect = PublisherFull("full")
+    response = await client.post(
+        "/bookings",
+        json={
+            "property_id": test_property.id,
+            "guests": 2,
+            "check_in": "2026-11-02",
+            "check_out": "2026-11-05",
+        },
+        headers={"Authorization": f"Bearer {customer_token}"},
+    )
+    assert response.status_code == 201
+    assert "beat relay" in caplog.text
@@ -0,0 +1,64 @@
+from datetime import date
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.changes import (
+    ChangeEvent,
+    RedisChangeBus,
+    change_bus,
+    record_change,
+)
+from app.database import Base
+
+CHANGE = ChangeEvent(
+    kind="booking.created",
+    property_id=1,
+    booking_id=7,
+    check_in=date(2026, 11, 2),
+    check_out=date(2026, 11, 5),
+)
+
+
+def test_changes_are_emitted_only_after_commit():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    received = []
+    unsubscribe = change_bus.subscribe(received.append)
+    try:
+        with Session(engine) as session:
+            session.connection()
+            record_change(session, CHANGE)
+            assert received == []
+            session.commit()
+            assert received == [CHANGE]
+
+            session.connection()
+            record_change(session, CHANGE)
+            session.rollback()
+            session.commit()
+            assert received == [CHANGE]
+    finally:
+        unsubscribe()
+
+
+def test_redis_bus_skips_its_own_messages():
+    first = RedisChangeBus("redis://localhost", "changes")
+    second = RedisChangeBus("redis://localhost", "changes")
+    received = []
+    second.subscribe(received.append)
+
+    payload = first._payload([CHANGE])
+    second.receive(second._payload([CHANGE]))
+    assert received == []
+
+    second.receive(payload)
+    assert received == [CHANGE]
+
+
+def test_resync_runs_registered_handlers():
+    bus = RedisChangeBus("redis://localhost", "changes")
+    cleared = []
+    bus.on_resync(lambda: cleared.append(True))
+    bus.resync()
+    assert cleared == [True]
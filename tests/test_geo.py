@@ -0,0 +1,26 @@
+from app.geo import (
+    bounding_box,
+    covering_cells,
+    encode_geohash,
+    prefix_upper_bound,
+)
+
+
+def test_encode_geohash():
+    assert encode_geohash(42.6, -5.6, 5) == "ezs42"
+    assert encode_geohash(57.64911, 10.40744, 11) == "u4pruydqqvj"
+
+
+def test_covering_cells_contain_points_in_box():
+    box = bounding_box(52.52, 13.405, 5)
+    cells = covering_cells(*box)
+    assert 0 < len(cells) <= 32
+    for lat, lon in [(box[0], box[2]), (box[1], box[3]), (52.52, 13.405)]:
+        geohash = encode_geohash(lat, lon)
+        assert any(geohash.startswith(cell) for cell in cells)
+
+
+def test_prefix_upper_bound():
+    assert prefix_upper_bound("u33") == "u34"
+    assert prefix_upper_bound("u3z") == "u4"
+    assert prefix_upper_bound("zz") is None
@@ -0,0 +1,159 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+from httpx import AsyncClient
+
+from app.holds import Hold, MemoryHoldStore, new_hold
+
+
+def _hold(check_in: date, check_out: date, ttl: float = 60) -> Hold:
+    return new_hold(1, 1, check_in, check_out, 2, ttl)
+
+
+@pytest.mark.asyncio
+async def test_memory_store_rejects_overlapping_hold():
+    store = MemoryHoldStore()
+    first = _hold(date(2026, 11, 2), date(2026, 11, 5))
+    assert await store.place(first)
+
+    assert not await store.place(_hold(date(2026, 11, 4), date(2026, 11, 8)))
+    assert await store.place(_hold(date(2026, 11, 5), date(2026, 11, 8)))
+
+    assert await store.conflicts(1, date(2026, 11, 1), date(2026, 11, 3))
+    assert await store.conflicts(
+        1, date(2026, 11, 1), date(2026, 11, 3), guest_id=first.guest_id + 1
+    )
+    assert not await store.conflicts(
+        1, date(2026, 11, 1), date(2026, 11, 3), guest_id=first.guest_id
+    )
+    assert not await store.conflicts(2, date(2026, 11, 1), date(2026, 11, 3))
+
+
+@pytest.mark.asyncio
+async def test_memory_store_forgets_expired_and_released_holds():
+    store = MemoryHoldStore()
+    expired = _hold(date(2026, 11, 2), date(2026, 11, 5))
+    expired.expires_at = datetime.now() - timedelta(seconds=1)
+    assert await store.place(expired)
+
+    assert await store.get(expired.id) is None
+    live = _hold(date(2026, 11, 2), date(2026, 11, 5))
+    assert await store.place(live)
+
+    await store.release(live.id)
+    assert await store.get(live.id) is None
+    assert not await store.conflicts(1, date(2026, 11, 2), date(2026, 11, 5))
+
+
+def test_hold_json_round_trip():
+    hold = _hold(date(2026, 11, 2), date(2026, 11, 5))
+    assert Hold.from_json(hold.to_json()) == hold
+
+
+@pytest.mark.asyncio
+async def test_hold_blocks_dates_until_confirmed(
+    client: AsyncClient, test_property, customer_token, admin_token
+):
+    payload = {
+        "property_id": test_property.id,
+        "guests": 2,
+        "check_in": "2026-11-02",
+        "check_out": "2026-11-05",
+    }
+    response = await client.post(
+        "/bookings/holds",
+        json=payload,
+        headers={"Authorization": f"Bearer {customer_token}"},
+    )
+    assert response.status_code == 201
+    hold = response.json()
+    assert hold["check_in"] == "2026-11-02"
+
+    response = await client.post(
+        "/bookings/holds",
+        json={**payload, "check_in": "2026-11-04", "check_out": "2026-11-06"},
+        headers={"Authorization": f"Bearer {admin_token}"},
+    )
+    assert response.status_code == 409
+
+    response = await client.post(
+        "/bookings",
+        json=payload,
+        headers={"Authorization": f"Bearer {admin_token}"},
+    )
+    assert response.status_code == 400
+
+    response = await client.post(
+        f"/bookings/holds/{hold['id']}/confirm",
+        headers={"Authorization": f"Bearer {admin_token}"},
+    )
+    assert response.status_code == 403
+
+    response = await client.post(
+        f"/bookings/holds/{hold['id']}/confirm",
+        headers={"Authorization": f"Bearer {customer_token}"},
+    )
+    assert response.status_code == 201
+    assert response.json()["check_out"] == "2026-11-05"
+
+    response = await client.post(
+        f"/bookings/holds/{hold['id']}/confirm",
+        headers={"Authorization": f"Bearer {customer_token}"},
+    )
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_release_hold_frees_dates(
+    client: AsyncClient, test_property, customer_token, admin_token
+):
+    payload = {
+        "property_id": test_property.id,
+        "guests": 2,
+        "check_in": "2026-11-02",
+        "check_out": "2026-11-05",
+    }
+    response = await client.post(
+        "/bookings/holds",
+        json=payload,
+        headers={"Authorization": f"Bearer {customer_token}"},
+    )
+    hold_id = response.json()["id"]
+
+    response = await client.delete(
+        f"/bookings/holds/{hold_id}",
+        headers={"Authorization": f"Bearer {customer_token}"},
+    )
+    assert response.status_code == 204
+
+    response = await client.post(
+        "/bookings",
+        json=payload,
+        headers={"Authorization": f"Bearer {admin_token}"},
+    )
+    assert response.status_code == 201
+
+
+@pytest.mark.asyncio
+async def test_guest_can_book_over_own_hold(
+    client: AsyncClient, test_property, customer_token
+):
+    payload = {
+        "property_id": test_property.id,
+        "guests": 2,
+        "check_in": "2026-11-02",
+        "check_out": "2026-11-05",
+    }
+    headers = {"Authorization": f"Bearer {customer_token}"}
+    response = await client.post("/bookings/holds", json=payload, headers=headers)
+    assert response.status_code == 201
+
+    response = await client.post("/bookings", json=payload, headers=headers)
+    assert response.status_code == 201
+
+
+def test_hold_store_defaults_to_redis_url(monkeypatch):
+    from app.config import Settings
+
+    monkeypatch.delenv("HOLD_STORE_URL")
+    assert Settings(_env_file=None).HOLD_STORE_URL is None
@@ -0,0 +1,92 @@
+import asyncio
+from contextlib import contextmanager
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import event
+
+from app.loaders import Loader
+
+
+@contextmanager
+def count_statements(db_session):
+    statements = []
+
+    def before_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    engine = db_session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", before_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_execute)
+
+
+@pytest.mark.asyncio
+async def test_loader_batches_keys_from_one_tick():
+    calls = []
+
+    async def fetch(keys):
+        calls.append(sorted(keys))
+        return {key: key * 10 for key in keys if key != 3}
+
+    loader = Loader(fetch)
+    results = await asyncio.gather(
+        loader.load(1), loader.load(2), loader.load(1), loader.load(3)
+    )
+    assert results == [10, 20, 10, None]
+    assert calls == [[1, 2, 3]]
+
+    assert await loader.load_many([2, 4, 1]) == [20, 40, 10]
+    assert calls == [[1, 2, 3], [4]]
+
+
+@pytest.mark.asyncio
+async def test_loader_failure_is_not_cached():
+    attempts = 0
+
+    async def fetch(keys):
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise RuntimeError("database unavailable")
+        return {key: key for key in keys}
+
+    loader = Loader(fetch)
+    with pytest.raises(RuntimeError):
+        await loader.load(1)
+    assert await loader.load(1) == 1
+
+
+@pytest.mark.asyncio
+async def test_booking_detail_reuses_loaded_booking(
+    client: AsyncClient, db_session, test_booking, customer_token
+):
+    with count_statements(db_session) as statements:
+        response = await client.get(
+            f"/bookings/{test_booking.id}",
+            headers={"Authorization": f"Bearer {customer_token}"},
+        )
+    assert response.status_code == 200
+    # The ownership check reuses the booking loaded by the handler
+    assert sum("WHERE bookings.id" in s for s in statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_modify_property_does_not_reload_locked_property(
+    client: AsyncClient, db_session, test_property, host_token
+):
+    with count_statements(db_session) as statements:
+        response = await client.patch(
+            f"/properties/{test_property.id}",
+            json={"price": 150},
+            headers={"Authorization": f"Bearer {host_token}"},
+        )
+    assert response.status_code == 200
+    assert response.json()["price"] == 150
+    by_id = [
+        s for s in statements if s.startswith("SELECT") and "WHERE properties.id" in s
+    ]
+    # The locked row and the refresh after the update
+    assert len(by_id) == 2
@@ -0,0 +1,299 @@
+import smtplib
+import socket
+from email.message import EmailMessage
+from unittest.mock import patch
+
+import pytest
+from aiosmtpd.controller import Controller
+
+from app.worker.artifacts import LocalArtifactStore
+from app.worker.mailer import SMTPConnectionPool
+
+
+class RecordingHandler:
+    def __init__(self):
+        self.messages = []
+        self.sessions = set()
+
+    async def handle_DATA(self, server, session, envelope):
+        self.sessions.add(id(session))
+        self.messages.append(envelope)
+        return "250 OK"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_server():
+    handler = RecordingHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=_free_port())
+    controller.start()
+    yield controller, handler
+    controller.stop()
+
+
+@pytest.fixture
+def smtp_pool(smtp_server):
+    controller, _ = smtp_server
+    pool = SMTPConnectionPool(
+        controller.hostname, controller.port, use_tls=False, max_size=2
+    )
+    yield pool
+    pool.close()
+
+
+def _message(recipient: str) -> EmailMessage:
+    msg = EmailMessage()
+    msg["From"] = "noreply@example.com"
+    msg["To"] = recipient
+    msg["Subject"] = "Test"
+    msg.set_content("Hello")
+    return msg
+
+
+def test_pool_reuses_connection(smtp_server, smtp_pool):
+    _, handler = smtp_server
+
+    for i in range(3):
+        smtp_pool.send(_message(f"guest{i}@example.com"))
+
+    assert len(handler.messages) == 3
+    assert len(handler.sessions) == 1
+    assert smtp_pool.opened == 1
+
+
+def test_pool_reconnects_after_dropped_connection(smtp_server, smtp_pool):
+    _, handler = smtp_server
+
+    smtp_pool.send(_message("first@example.com"))
+    with smtp_pool.connection() as server:
+        server.sock.shutdown(socket.SHUT_RDWR)
+
+    smtp_pool.send(_message("second@example.com"))
+
+    assert len(handler.messages) == 2
+    assert smtp_pool.opened == 2
+
+
+def test_pool_send_many_uses_one_connection(smtp_server, smtp_pool):
+    _, handler = smtp_server
+
+    results = smtp_pool.send_many(
+        [_message(f"guest{i}@example.com") for i in range(5)]
+    )
+
+    assert results == [None] * 5
+    assert len(handler.messages) == 5
+    assert len(handler.sessions) == 1
+
+
+class RefusingHandler(RecordingHandler):
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address.startswith("refused"):
+            return "550 No such user"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+
+def test_send_many_continues_after_refused_recipient():
+    handler = RefusingHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=_free_port())
+    controller.start()
+    pool = SMTPConnectionPool(controller.hostname, controller.port, use_tls=False)
+    try:
+        results = pool.send_many(
+            [
+                _message("first@example.com"),
+                _message("refused@example.com"),
+                _message("last@example.com"),
+            ]
+        )
+    finally:
+        pool.close()
+        controller.stop()
+
+    assert results[0] is None and results[2] is None
+    assert isinstance(results[1], smtplib.SMTPRecipientsRefused)
+    assert [message.rcpt_tos for message in handler.messages] == [
+        ["first@example.com"],
+        ["last@example.com"],
+    ]
+    assert len(handler.sessions) == 1
+
+
+def test_send_many_reports_unreachable_server():
+    pool = SMTPConnectionPool("127.0.0.1", _free_port(), use_tls=False, timeout=1)
+
+    results = pool.send_many([_message("a@example.com"), _message("b@example.com")])
+
+    assert len(results) == 2
+    assert all(isinstance(error, OSError) for error in results)
+
+
+def test_send_email_batch_sends_and_cleans_up(smtp_server, smtp_pool, tmp_path):
+    from app.worker.tasks import _send_email_batch
+
+    _, handler = smtp_server
+    store = LocalArtifactStore(tmp_path, ttl=60)
+    booking_data = {
+        "id": 1,
+        "guest_name": "Customer User",
+        "property_title": "Test Property",
+        "check_in": "2026-11-02",
+        "check_out": "2026-11-12",
+        "guests": 2,
+        "total_price": 2000.0,
+    }
+    jobs = [
+        {
+            "pdf_key": store.put(f"bookings/{i}.pdf", b"%PDF"),
+            "recipient_email": f"guest{i}@example.com",
+            "booking_data": booking_data,
+            "attempts": 0,
+        }
+        for i in range(3)
+    ]
+
+    with (
+        patch("app.worker.tasks.get_artifact_store", return_value=store),
+        patch("app.worker.tasks.get_smtp_pool", return_value=smtp_pool),
+    ):
+        failed = _send_email_batch(jobs)
+
+    assert failed == []
+    assert len(handler.messages) == 3
+    assert len(handler.sessions) == 1
+    assert list(tmp_path.rglob("*.pdf")) == []
+
+
+def test_send_cancellation_emails_uses_one_connection(smtp_server, smtp_pool):
+    from app.worker.tasks import _send_cancellation_emails
+
+    _, handler = smtp_server
+    recipients = [
+        (
+            f"guest{i}@example.com",
+            {
+                "id": i,
+                "guest_name": "Customer User",
+                "property_title": "Test Property",
+                "check_in": "2026-11-02",
+                "check_out": "2026-11-05",
+            },
+        )
+        for i in range(3)
+    ]
+
+    with patch("app.worker.tasks.get_smtp_pool", return_value=smtp_pool):
+        failed = _send_cancellation_emails(recipients)
+
+    assert failed == []
+    assert [message.rcpt_tos for message in handler.messages] == [
+        [email] for email, _ in recipients
+    ]
+    assert len(handler.sessions) == 1
+
+
+def _cancellation(booking_id: int) -> dict:
+    return {
+        "id": booking_id,
+        "guest_name": "Customer User",
+        "property_title": "Test Property",
+        "check_in": "2026-11-02",
+        "check_out": "2026-11-05",
+    }
+
+
+@pytest.fixture
+def refusing_pool():
+    handler = RefusingHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=_free_port())
+    controller.start()
+    pool = SMTPConnectionPool(controller.hostname, controller.port, use_tls=False)
+    yield pool, handler
+    pool.close()
+    controller.stop()
+
+
+def test_send_cancellation_emails_returns_failed_bookings(refusing_pool):
+    from app.worker.tasks import _send_cancellation_emails
+
+    pool, handler = refusing_pool
+    recipients = [
+        ("first@example.com", _cancellation(1)),
+        ("refused@example.com", _cancellation(2)),
+        ("last@example.com", _cancellation(3)),
+    ]
+
+    with patch("app.worker.tasks.get_smtp_pool", return_value=pool):
+        failed = _send_cancellation_emails(recipients)
+
+    assert failed == [2]
+    assert [message.rcpt_tos for message in handler.messages] == [
+        ["first@example.com"],
+        ["last@example.com"],
+    ]
+
+
+def test_notify_cancelled_bookings_retries_only_failed_subset(refusing_pool):
+    from celery.exceptions import Retry
+    from datetime import date, timedelta
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+
+    from app.database import Base
+    from app.models import Booking, BookingStatus, Property, User
+    from app.worker.tasks import notify_cancelled_bookings
+
+    pool, handler = refusing_pool
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        host = User(first_name="Host", last_name="One", email="h@x.com", password="x")
+        guests = [
+            User(first_name="Guest", last_name=name, email=f"{name}@x.com", password="x")
+            for name in ("first", "refused", "last")
+        ]
+        session.add_all([host, *guests])
+        session.flush()
+        property = Property(
+            title="Cabin",
+            description="Cabin",
+            address="Road",
+            city="Town",
+            host_id=host.id,
+        )
+        session.add(property)
+        session.flush()
+        bookings = [
+            Booking(
+                property_id=property.id,
+                guest_id=guest.id,
+                status=BookingStatus.CANCELLED,
+                check_in=date.today() + timedelta(days=3),
+                check_out=date.today() + timedelta(days=5),
+            )
+            for guest in guests
+        ]
+        session.add_all(bookings)
+        session.commit()
+        ids = [booking.id for booking in bookings]
+
+    with (
+        patch("app.database.sync_session", lambda: Session(engine)),
+        patch("app.worker.tasks.get_smtp_pool", return_value=pool),
+        patch("app.worker.tasks.settings.EMAIL_BATCH_SIZE", 2),
+        patch.object(notify_cancelled_bookings, "retry", side_effect=Retry()) as retry,
+    ):
+        with pytest.raises(Retry):
+            notify_cancelled_bookings(ids)
+
+    retry.assert_called_once_with(kwargs={"booking_ids": [ids[1]]})
+    assert [message.rcpt_tos for message in handler.messages] == [
+        ["first@x.com"],
+        ["last@x.com"],
+    ]
@@ -0,0 +1,158 @@
+from datetime import date
+from unittest.mock import MagicMock, patch
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.worker.artifacts import LocalArtifactStore
+from app.worker.partitions import (
+    add_months,
+    create_partition,
+    maintain_partitions,
+    partition_month,
+    partition_name,
+    partitions_to_archive,
+    partitions_to_create,
+)
+
+
+def test_partition_names_round_trip():
+    assert partition_name(date(2026, 1, 1)) == "bookings_p202601"
+    assert partition_month("bookings_p202601") == date(2026, 1, 1)
+    assert partition_month("bookings_default") is None
+    assert add_months(date(2026, 11, 1), 3) == date(2027, 2, 1)
+    assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+
+
+def test_partitions_to_create_skips_existing():
+    existing = {"bookings_p202610", "bookings_p202611"}
+    assert partitions_to_create(existing, date(2026, 10, 19), 3) == [
+        date(2026, 12, 1),
+        date(2027, 1, 1),
+    ]
+
+
+def test_partitions_to_archive_respects_retention():
+    existing = {
+        "bookings_default",
+        "bookings_p202409",
+        "bookings_p202410",
+        "bookings_p202411",
+        "bookings_p202610",
+    }
+    assert partitions_to_archive(existing, date(2026, 10, 19), 24) == [
+        "bookings_p202409"
+    ]
+
+
+def test_maintain_partitions_skips_unpartitioned_databases(tmp_path):
+    engine = create_engine("sqlite://")
+    result = maintain_partitions(
+        lambda: Session(engine),
+        LocalArtifactStore(tmp_path, ttl=0),
+        date(2026, 10, 19),
+        months_ahead=3,
+        retain_months=24,
+    )
+    assert result == {"created": [], "archived": []}
+
+
+def _recording_connection(default_has_rows: bool) -> tuple[MagicMock, list[str]]:
+    statements = []
+
+    def execute(statement, params=None):
+        statements.append(" ".join(str(statement).split()))
+        return MagicMock(scalar=MagicMock(return_value=default_has_rows))
+
+    return MagicMock(execute=execute), statements
+
+
+def test_create_partition_moves_rows_out_of_default():
+    conn, statements = _recording_connection(default_has_rows=True)
+
+    assert create_partition(conn, date(2027, 6, 1)) == "bookings_p202706"
+
+    changes = [s.split(" ")[0] for s in statements if not s.startswith("SELECT")]
+    assert changes == ["ALTER", "CREATE", "WITH", "ALTER"]
+    assert "DETACH PARTITION bookings_default" in statements[2]
+    assert "FROM ('2027-06-01') TO ('2027-07-01')" in statements[3]
+    assert "INSERT INTO bookings_p202706" in statements[4]
+    assert statements[5].endswith("ATTACH PARTITION bookings_default DEFAULT")
+
+
+def test_create_partition_without_default_rows_only_creates():
+    conn, statements = _recording_connection(default_has_rows=False)
+
+    create_partition(conn, date(2027, 6, 1))
+
+    assert [s for s in statements if not s.startswith("SELECT")] == [
+        "CREATE TABLE IF NOT EXISTS bookings_p202706 PARTITION OF bookings "
+        "FOR VALUES FROM ('2027-06-01') TO ('2027-07-01')"
+    ]
+
+
+def test_booking_identity_is_the_sequence_id():
+    # The partitioned table's key is (id, check_in); ids stay unique because
+    # they only ever come from the sequence, never from the application
+    from sqlalchemy import inspect
+
+    from app.models import Booking
+
+    assert inspect(Booking).primary_key == (Booking.__table__.c.id,)
+    assert Booking.__table__.c.id.autoincrement in (True, "auto")
+    assert Booking().id is None
+
+
+def test_maintain_partitions_commits_detach_before_archiving(tmp_path):
+    log = []
+
+    def execute(statement, params=None):
+        log.append(" ".join(str(statement).split()))
+        return MagicMock()
+
+    def copy_expert(sql, archive):
+        log.append(sql)
+        archive.write(b"id,check_in\n")
+
+    def session_factory():
+        conn = MagicMock(execute=execute)
+        conn.dialect.name = "postgresql"
+        conn.connection.cursor.return_value.copy_expert = copy_expert
+        session = MagicMock()
+        session.__enter__.return_value = session
+        session.connection.return_value = conn
+        session.commit.side_effect = lambda: log.append("COMMIT")
+        return session
+
+    with (
+        patch("app.worker.partitions.is_partitioned", return_value=True),
+        patch(
+            "app.worker.partitions.list_partitions",
+            return_value={"bookings_p202409", "bookings_p202610"},
+        ),
+        patch(
+            "app.worker.partitions.list_detached_partitions",
+            return_value={"bookings_p202408"},
+        ),
+        patch("app.worker.partitions.create_partition"),
+    ):
+        result = maintain_partitions(
+            session_factory,
+            LocalArtifactStore(tmp_path, ttl=0),
+            date(2026, 10, 19),
+            months_ahead=0,
+            retain_months=24,
+        )
+
+    assert result["archived"] == ["bookings_p202408", "bookings_p202409"]
+    detach = log.index("ALTER TABLE bookings DETACH PARTITION bookings_p202409")
+    assert log[detach + 1] == "COMMIT"
+    assert log[detach + 2 :] == [
+        "COPY bookings_p202408 TO STDOUT WITH CSV HEADER",
+        "DROP TABLE bookings_p202408",
+        "COMMIT",
+        "COPY bookings_p202409 TO STDOUT WITH CSV HEADER",
+        "DROP TABLE bookings_p202409",
+        "COMMIT",
+    ]
+    assert (tmp_path / "bookings" / "bookings_p202409.csv.gz").exists()
@@ -0,0 +1,40 @@
+from datetime import datetime
+
+from app.worker.pdf import ConfirmationTemplate, render_booking_pdfs
+
+BOOKING_DATA = {
+    "id": 7,
+    "guest_name": "Customer User",
+    "property_title": "Test Property",
+    "check_in": "2026-11-02",
+    "check_out": "2026-11-12",
+    "guests": 2,
+    "total_price": 2000.0,
+}
+
+
+def test_template_renders_booking_fields():
+    pdf = ConfirmationTemplate().render(
+        BOOKING_DATA, generated_at=datetime(2026, 10, 1, 12, 0)
+    )
+
+    assert pdf.startswith(b"%PDF")
+    assert b"/FormXob.ConfirmationHeader" in pdf
+    assert b"ASCII85Decode" not in pdf
+
+
+def test_template_lines_format_booking_data():
+    lines = ConfirmationTemplate.lines(BOOKING_DATA, datetime(2026, 10, 1, 12, 0))
+
+    assert lines[0] == "Booking ID: 7"
+    assert "Total price: $2000.00" in lines
+    assert lines[-1] == "Generated: 2026-10-01 12:00:00"
+
+
+def test_render_booking_pdfs_in_process_pool():
+    bookings = [{**BOOKING_DATA, "id": i} for i in range(6)]
+
+    pdfs = render_booking_pdfs(bookings, processes=2, chunk_size=2)
+
+    assert len(pdfs) == 6
+    assert all(pdf.startswith(b"%PDF") for pdf in pdfs)
@@ -0,0 +1,81 @@
+from datetime import date
+
+import pytest
+
+from app.models import PricingRule, PricingRuleKind
+from app.pricing import NightlyRates, quote_stay, quote_stays
+
+
+def _rule(kind: PricingRuleKind, **fields) -> PricingRule:
+    fields.setdefault("multiplier", 1.0)
+    fields.setdefault("discount", 0.0)
+    return PricingRule(kind=kind, **fields)
+
+
+def test_base_price_matches_flat_formula():
+    assert quote_stay(100, [], date(2026, 11, 2), date(2026, 11, 12), 2) == 2000.0
+
+
+def test_weekend_override_and_length_of_stay_rules():
+    rules = [
+        _rule(PricingRuleKind.WEEKEND, multiplier=1.5),
+        _rule(
+            PricingRuleKind.OVERRIDE,
+            start_date=date(2026, 11, 3),
+            end_date=date(2026, 11, 3),
+            price=50,
+        ),
+        _rule(PricingRuleKind.LENGTH_OF_STAY, min_nights=7, discount=0.1),
+    ]
+
+    nights, totals = quote_stays(
+        100,
+        rules,
+        [
+            (date(2026, 11, 2), date(2026, 11, 5)),
+            (date(2026, 11, 2), date(2026, 11, 9)),
+        ],
+        guests=2,
+    )
+
+    # Mon 100 + Tue override 50 + Wed 100
+    assert nights.tolist() == [3, 7]
+    assert totals[0] == 500.0
+    # 100 + 50 + 100 + 100 + Fri 150 + Sat 150 + 100, minus 10%
+    assert totals[1] == 1350.0
+
+
+def test_seasonal_multiplier_applies_within_dates():
+    rules = [
+        _rule(
+            PricingRuleKind.SEASONAL,
+            start_date=date(2026, 12, 20),
+            end_date=date(2026, 12, 31),
+            multiplier=2.0,
+        )
+    ]
+
+    total = quote_stay(100, rules, date(2026, 12, 18), date(2026, 12, 22))
+
+    assert total == 600.0
+
+
+def test_largest_matching_discount_wins():
+    rules = [
+        _rule(PricingRuleKind.LENGTH_OF_STAY, min_nights=28, discount=0.3),
+        _rule(PricingRuleKind.LENGTH_OF_STAY, min_nights=7, discount=0.1),
+    ]
+    rates = NightlyRates(10, rules, date(2026, 1, 1), date(2026, 3, 1))
+
+    _, totals = rates.quote(
+        [date(2026, 1, 1)] * 3,
+        [date(2026, 1, 3), date(2026, 1, 11), date(2026, 2, 10)],
+    )
+
+    assert totals.tolist() == [20.0, 90.0, 280.0]
+
+
+def test_quote_outside_range_is_rejected():
+    rates = NightlyRates(10, [], date(2026, 1, 1), date(2026, 1, 10))
+    with pytest.raises(ValueError):
+        rates.quote([date(2026, 1, 5)], [date(2026, 1, 12)])
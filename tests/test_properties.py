@@ -20,6 +20,17 @@ async def test_list_properties(client: AsyncClient, test_property):
     assert data["total"] == 1
 
 
+@pytest.mark.asyncio
+async def test_list_properties_serializes_nested_host(
+    client: AsyncClient, test_property
+):
+    response = await client.get("/properties")
+    assert response.headers["content-type"] == "application/json"
+    item = response.json()["items"][0]
+    assert item["user"]["email"] == "host@example.com"
+    assert item["status"] == "available"
+
+
 @pytest.mark.asyncio
 async def test_list_properties_pagination(client: AsyncClient, test_property):
     response = await client.get("/properties?limit=10&offset=0")
@@ -135,3 +146,444 @@ async def test_delete_property(client: AsyncClient, host_token, test_property):
 
     response = await client.get(f"/properties/{test_property.id}")
     assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_delete_property_with_bookings_conflicts(
+    client: AsyncClient, host_token, test_property, test_booking
+):
+    response = await client.delete(
+        f"/properties/{test_property.id}",
+        headers={"Authorization": f"Bearer {host_token}"},
+    )
+    assert response.status_code == 409
+
+
+@pytest.mark.asyncio
+async def test_archive_property_cancels_future_bookings(
+    client: AsyncClient,
+    db_session,
+    host_token,
+    customer_token,
+    test_property,
+    test_booking,
+):
+    from sqlalchemy import select
+
+    from app.models import OutboxMessage
+
+    booked = []
+    for check_in, check_out in (
+        ("2026-11-02", "2026-11-05"),
+        ("2026-12-01", "2026-12-03"),
+    ):
+        response = await client.post(
+            "/bookings",
+            json={
+                "property_id": test_property.id,
+                "guests": 2,
+                "check_in": check_in,
+                "check_out": check_out,
+            },
+            headers={"Authorization": f"Bearer {customer_token}"},
+        )
+        booked.append(response.json()["id"])
+
+    response = await client.post(
+        f"/properties/{test_property.id}/archive",
+        headers={"Authorization": f"Bearer {customer_token}"},
+    )
+    assert response.status_code == 403
+
+    response = await client.post(
+        f"/properties/{test_property.id}/archive",
+        headers={"Authorization": f"Bearer {host_token}"},
+    )
+    assert response.status_code == 200
+    assert response.json() == {
+        "id": test_property.id,
+        "status": "archived",
+        "cancelled_booking_ids": booked,
+    }
+
+    response = await client.get(
+        f"/bookings/{booked[0]}",
+        headers={"Authorization": f"Bearer {customer_token}"},
+    )
+    assert response.json()["status"] == "cancelled"
+    # Bookings in the past are left alone
+    response = await client.get(
+        f"/bookings/{test_booking.id}",
+        headers={"Authorization": f"Bearer {customer_token}"},
+    )
+    assert response.json()["status"] == "pending"
+
+    messages = (
+        await db_session.scalars(
+            select(OutboxMessage).where(
+                OutboxMessage.task_name == "app.celery.tasks.notify_cancelled_bookings"
+            )
+        )
+    ).all()
+    assert [message.payload for message in messages] == [{"booking_ids": booked}]
+
+
+@pytest.mark.asyncio
+async def test_list_properties_sparse_fields(client: AsyncClient, test_property):
+    response = await client.get("/properties?fields=title,city,price")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 1
+    assert data["items"] == [
+        {
+            "id": test_property.id,
+            "title": "Test Property",
+            "city": "Test City",
+            "price": 100.0,
+        }
+    ]
+
+
+@pytest.mark.asyncio
+async def test_list_properties_unknown_field(client: AsyncClient):
+    response = await client.get("/properties?fields=title,user")
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_property_calendar(client: AsyncClient, test_booking, test_property):
+    response = await client.get(
+        f"/properties/{test_property.id}/calendar?from=2024-12-30&to=2025-01-06"
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["from"] == "2024-12-30"
+    assert data["to"] == "2025-01-06"
+    assert data["days"] == "00111100"
+    assert data["blocked"] == [{"start": "2025-01-01", "end": "2025-01-04"}]
+
+
+@pytest.mark.asyncio
+async def test_property_calendar_invalidated_on_cancel(
+    client: AsyncClient, test_booking, test_property, customer_token
+):
+    url = f"/properties/{test_property.id}/calendar?from=2025-01-01&to=2025-01-31"
+    response = await client.get(url)
+    assert response.json()["days"].startswith("1111")
+
+    await client.delete(
+        f"/bookings/{test_booking.id}",
+        headers={"Authorization": f"Bearer {customer_token}"},
+    )
+
+    response = await client.get(url)
+    assert response.json()["days"] == "0" * 31
+    assert response.json()["blocked"] == []
+
+
+@pytest.mark.asyncio
+async def test_property_calendar_invalid_range(client: AsyncClient, test_property):
+    response = await client.get(
+        f"/properties/{test_property.id}/calendar?from=2025-02-01&to=2025-01-01"
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_property_calendar_not_found(client: AsyncClient):
+    response = await client.get(
+        "/properties/999/calendar?from=2025-01-01&to=2025-01-31"
+    )
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_quote_property_stays(client: AsyncClient, test_property, host_token):
+    response = await client.post(
+        f"/properties/{test_property.id}/pricing-rules",
+        json={"kind": "length_of_stay", "min_nights": 7, "discount": 0.1},
+        headers={"Authorization": f"Bearer {host_token}"},
+    )
+    assert response.status_code == 201
+
+    response = await client.post(
+        f"/properties/{test_property.id}/quotes",
+        json={
+            "guests": 2,
+            "stays": [
+                {"check_in": "2026-11-02", "check_out": "2026-11-04"},
+                {"check_in": "2026-11-02", "check_out": "2026-11-12"},
+            ],
+        },
+    )
+    assert response.status_code == 200
+    quotes = response.json()["quotes"]
+    assert [quote["nights"] for quote in quotes] == [2, 10]
+    assert [quote["total_price"] for quote in quotes] == [400.0, 1800.0]
+
+
+@pytest.mark.asyncio
+async def test_quote_rejects_wide_span(client: AsyncClient, test_property):
+    response = await client.post(
+        f"/properties/{test_property.id}/quotes",
+        json={
+            "stays": [
+                {"check_in": "0001-01-01", "check_out": "0001-01-02"},
+                {"check_in": "9999-12-01", "check_out": "9999-12-02"},
+            ],
+        },
+    )
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_add_pricing_rule_requires_owner(
+    client: AsyncClient, test_property, customer_token
+):
+    response = await client.post(
+        f"/properties/{test_property.id}/pricing-rules",
+        json={"kind": "weekend", "multiplier": 1.2},
+        headers={"Authorization": f"Bearer {customer_token}"},
+    )
+    assert response.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_add_pricing_rule_validates_kind_fields(
+    client: AsyncClient, test_property, host_token
+):
+    response = await client.post(
+        f"/properties/{test_property.id}/pricing-rules",
+        json={"kind": "override", "start_date": "2026-12-24"},
+        headers={"Authorization": f"Bearer {host_token}"},
+    )
+    assert response.status_code == 422
+
+
+async def _add_located_property(client, token, title, lat, lon):
+    response = await client.post(
+        "/properties",
+        json={
+            "title": title,
+            "description": "Located property",
+            "address": "Some Address",
+            "price": 100,
+            "city": "Berlin",
+            "beds": 2,
+            "latitude": lat,
+            "longitude": lon,
+        },
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 201
+    return response.json()
+
+
+@pytest.mark.asyncio
+async def test_list_properties_near_point(client: AsyncClient, host_token):
+    await _add_located_property(client, host_token, "Mitte Flat", 52.5200, 13.4050)
+    await _add_located_property(client, host_token, "Kreuzberg Loft", 52.4990, 13.4030)
+    await _add_located_property(client, host_token, "Potsdam House", 52.3906, 13.0645)
+
+    response = await client.get(
+        "/properties", params={"lat": 52.52, "lon": 13.405, "radius_km": 5}
+    )
+    assert response.status_code == 200
+    titles = {item["title"] for item in response.json()["items"]}
+    assert titles == {"Mitte Flat", "Kreuzberg Loft"}
+
+    response = await client.get(
+        "/properties",
+        params={"lat": 52.52, "lon": 13.405, "radius_km": 30, "city": "Berlin"},
+    )
+    assert response.json()["total"] == 3
+
+
+@pytest.mark.asyncio
+async def test_list_properties_in_bounding_box(client: AsyncClient, host_token):
+    await _add_located_property(client, host_token, "Mitte Flat", 52.5200, 13.4050)
+    await _add_located_property(client, host_token, "Potsdam House", 52.3906, 13.0645)
+
+    response = await client.get(
+        "/properties",
+        params={"min_lat": 52.3, "max_lat": 52.45, "min_lon": 12.9, "max_lon": 13.2},
+    )
+    assert response.status_code == 200
+    assert [item["title"] for item in response.json()["items"]] == ["Potsdam House"]
+
+
+@pytest.mark.asyncio
+async def test_list_properties_incomplete_geo_filter(client: AsyncClient):
+    response = await client.get("/properties", params={"lat": 52.52, "lon": 13.405})
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_update_property_coordinates(
+    client: AsyncClient, host_token, test_property
+):
+    response = await client.patch(
+        f"/properties/{test_property.id}",
+        json={"latitude": 48.8566, "longitude": 2.3522},
+        headers={"Authorization": f"Bearer {host_token}"},
+    )
+    assert response.status_code == 200
+
+    response = await client.get(
+        "/properties", params={"lat": 48.85, "lon": 2.35, "radius_km": 2}
+    )
+    assert [item["id"] for item in response.json()["items"]] == [test_property.id]
+
+
+async def _add_described_property(client, token, title, description):
+    response = await client.post(
+        "/properties",
+        json={
+            "title": title,
+            "description": description,
+            "address": "Some Address",
+            "price": 100,
+            "city": "Lisbon",
+            "beds": 2,
+        },
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 201
+    return response.json()
+
+
+@pytest.mark.asyncio
+async def test_list_properties_text_search(client: AsyncClient, host_token):
+    await _add_described_property(
+        client, host_token, "Quiet Studio", "Studio with a sea view"
+    )
+    await _add_described_property(
+        client, host_token, "Sea View Penthouse", "Penthouse near the beach"
+    )
+    await _add_described_property(
+        client, host_token, "Garden House", "House with a garden"
+    )
+
+    response = await client.get("/properties", params={"q": "sea view"})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 2
+    assert data["items"][0]["title"] == "Sea View Penthouse"
+
+    response = await client.get("/properties", params={"q": "garden", "beds": 3})
+    assert response.json()["total"] == 0
+
+
+@pytest.mark.asyncio
+async def test_text_search_follows_updates_and_deletes(client: AsyncClient, host_token):
+    created = await _add_described_property(
+        client, host_token, "Quiet Studio", "Studio in the old town"
+    )
+    headers = {"Authorization": f"Bearer {host_token}"}
+
+    await client.patch(
+        f"/properties/{created['id']}",
+        json={"description": "Studio next to the harbour"},
+        headers=headers,
+    )
+    response = await client.get("/properties", params={"q": "harbour"})
+    assert [item["id"] for item in response.json()["items"]] == [created["id"]]
+    response = await client.get("/properties", params={"q": "old town"})
+    assert response.json()["total"] == 0
+
+    await client.delete(f"/properties/{created['id']}", headers=headers)
+    response = await client.get("/properties", params={"q": "harbour"})
+    assert response.json()["total"] == 0
+
+
+@pytest.mark.asyncio
+async def test_add_property_idempotency_key(client: AsyncClient, host_token):
+    payload = {
+        "title": "Retried Property",
+        "description": "Created once",
+        "address": "Some Address",
+        "price": 100,
+        "city": "Lisbon",
+        "beds": 2,
+    }
+    headers = {"Authorization": f"Bearer {host_token}", "Idempotency-Key": "p-1"}
+
+    first = await client.post("/properties", json=payload, headers=headers)
+    retry = await client.post("/properties", json=payload, headers=headers)
+
+    assert first.status_code == retry.status_code == 201
+    assert retry.json()["id"] == first.json()["id"]
+    assert (await client.get("/properties")).json()["total"] == 1
+
+
+@pytest.mark.asyncio
+async def test_get_properties_by_ids_keeps_order(client: AsyncClient, test_property):
+    missing = test_property.id + 100
+    response = await client.get(
+        "/properties", params={"ids": f"{missing},{test_property.id}"}
+    )
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert [item["id"] for item in items] == [missing, test_property.id]
+    assert items[0] == {"id": missing, "status": "not_found", "item": None}
+    assert items[1]["status"] == "ok"
+    assert items[1]["item"]["title"] == "Test Property"
+
+
+@pytest.mark.asyncio
+async def test_get_properties_by_ids_invalid(client: AsyncClient):
+    response = await client.get("/properties", params={"ids": "1,abc"})
+    assert response.status_code == 400
+
+    too_many = ",".join(str(i) for i in range(1, 102))
+    response = await client.get("/properties", params={"ids": too_many})
+    assert response.status_code == 400
+
+
+def test_json_response_keeps_email_schema_but_skips_revalidation():
+    from datetime import datetime
+
+    from app.responses import json_response
+    from app.schemas import UserResponse
+
+    assert UserResponse.model_json_schema()["properties"]["email"]["format"] == "email"
+    response = json_response(
+        UserResponse,
+        {
+            "id": 1,
+            "first_name": "Host",
+            "last_name": "User",
+            "email": "stored@example.com",
+            "role": "host",
+            "created_at": datetime(2026, 1, 1),
+        },
+    )
+    assert b'"email":"stored@example.com"' in response.body
+
+
+def test_json_response_keeps_response_model_behaviour():
+    from pydantic import BaseModel, EmailStr, computed_field, field_serializer
+
+    from app.responses import json_response
+
+    class Contact(BaseModel):
+        name: str
+        email: EmailStr
+
+        @field_serializer("name")
+        def shout(self, name: str) -> str:
+            return name.upper()
+
+        @computed_field
+        @property
+        def domain(self) -> str:
+            return self.email.split("@")[1]
+
+    class Listing(BaseModel):
+        contacts: list[Contact]
+
+    data = {"contacts": [{"name": "host", "email": "host@example.com"}]}
+    response = json_response(Listing, data)
+    assert response.body == Listing(**data).model_dump_json().encode()
+    assert b'"name":"HOST"' in response.body
+    assert b'"domain":"example.com"' in response.body
@@ -0,0 +1,75 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.worker.publisher import PublisherFull, TaskPublisher
+
+
+@pytest.mark.asyncio
+async def test_publisher_sends_tasks_in_batches():
+    batches = []
+    publisher = TaskPublisher(maxsize=10, batch_size=10, sender=batches.append)
+
+    await publisher.publish("tasks.a", kwargs={"x": 1})
+    await publisher.publish("tasks.b", args=(2,))
+    publisher.stop()
+
+    sent = [task.name for batch in batches for task in batch]
+    assert sent == ["tasks.a", "tasks.b"]
+    assert publisher.metrics()["published"] == 2
+    assert publisher.metrics()["queue_depth"] == 0
+
+
+@pytest.mark.asyncio
+async def test_publisher_coalesces_duplicate_tasks():
+    release = threading.Event()
+    batches = []
+
+    def sender(batch):
+        release.wait(1)
+        batches.append(batch)
+
+    publisher = TaskPublisher(maxsize=10, batch_size=10, sender=sender)
+    await publisher.publish("tasks.first")
+    await asyncio.sleep(0.05)
+    for _ in range(3):
+        await publisher.publish("tasks.relay", coalesce=True)
+    release.set()
+    publisher.stop()
+
+    assert [len(batch) for batch in batches] == [1, 1]
+    assert publisher.metrics()["coalesced"] == 2
+
+
+@pytest.mark.asyncio
+async def test_publisher_applies_backpressure_when_full():
+    release = threading.Event()
+    publisher = TaskPublisher(
+        maxsize=1, batch_size=1, sender=lambda batch: release.wait(1)
+    )
+
+    await publisher.publish("tasks.a")
+    await asyncio.sleep(0.05)
+    await publisher.publish("tasks.b")
+
+    with pytest.raises(PublisherFull):
+        await publisher.publish("tasks.c", timeout=0.05)
+
+    release.set()
+    publisher.stop()
+    assert publisher.metrics()["rejected"] == 1
+    assert publisher.metrics()["published"] == 2
+
+
+@pytest.mark.asyncio
+async def test_publisher_counts_failed_batches():
+    def sender(batch):
+        raise ConnectionError("broker unavailable")
+
+    publisher = TaskPublisher(maxsize=10, batch_size=10, sender=sender)
+    await publisher.publish("tasks.a")
+    publisher.stop()
+
+    assert publisher.metrics()["failed"] == 1
+    assert publisher.metrics()["published"] == 0
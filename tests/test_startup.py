@@ -0,0 +1,58 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+API_IMPORT_BUDGET_MS = float(os.environ.get("API_IMPORT_BUDGET_MS", 1500))
+
+WORKER_ONLY_MODULES = (
+    "celery",
+    "kombu",
+    "reportlab",
+    "smtplib",
+    "email.mime",
+    "redis",
+    "psycopg2",
+    "app.worker.app",
+    "app.worker.tasks",
+)
+
+
+def _import_profile(module: str) -> dict[str, int]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        profile[name.strip()] = int(cumulative)
+    return profile
+
+
+@pytest.fixture(scope="module")
+def api_import_profile() -> dict[str, int]:
+    _import_profile("app.main")
+    return _import_profile("app.main")
+
+
+def test_api_does_not_import_worker_dependencies(api_import_profile):
+    loaded = [
+        name
+        for name in api_import_profile
+        if any(
+            name == module or name.startswith(f"{module}.")
+            for module in WORKER_ONLY_MODULES
+        )
+    ]
+    assert loaded == []
+
+
+def test_api_import_time_within_budget(api_import_profile):
+    import_time_ms = api_import_profile["app.main"] / 1000
+    assert import_time_ms <= API_IMPORT_BUDGET_MS
@@ -0,0 +1,90 @@
+import asyncio
+import json
+from datetime import date
+
+import pytest
+from httpx import AsyncClient
+
+from app.changes import ChangeBus, ChangeEvent
+from app.streams import PropertyEventHub
+
+
+def _change(property_id: int, kind: str = "booking.created") -> ChangeEvent:
+    return ChangeEvent(
+        kind=kind,
+        property_id=property_id,
+        booking_id=1,
+        check_in=date(2026, 11, 2),
+        check_out=date(2026, 11, 5),
+    )
+
+
+@pytest.mark.asyncio
+async def test_stream_receives_events_for_its_property():
+    bus = ChangeBus()
+    hub = PropertyEventHub(bus, queue_size=10)
+    stream = hub.stream(1, heartbeat=5)
+    assert await anext(stream) == ": connected\n\n"
+
+    bus.emit([_change(2), _change(1, "booking.cancelled")])
+    message = await anext(stream)
+    event, data = message.strip().split("\n")
+    assert event == "event: booking.cancelled"
+    assert json.loads(data.removeprefix("data: "))["check_in"] == "2026-11-02"
+
+    assert hub.metrics()["watchers"] == 1
+    await stream.aclose()
+    assert hub.metrics()["watchers"] == 0
+
+
+@pytest.mark.asyncio
+async def test_stream_sends_heartbeat_when_idle():
+    hub = PropertyEventHub(ChangeBus(), queue_size=10)
+    stream = hub.stream(1, heartbeat=0.01)
+    await anext(stream)
+    assert await asyncio.wait_for(anext(stream), 1) == ": heartbeat\n\n"
+    await stream.aclose()
+
+
+@pytest.mark.asyncio
+async def test_slow_watcher_is_told_to_resync():
+    bus = ChangeBus()
+    hub = PropertyEventHub(bus, queue_size=2)
+    stream = hub.stream(1, heartbeat=5)
+    await anext(stream)
+
+    bus.emit([_change(1) for _ in range(5)])
+    assert (await anext(stream)).startswith("event: resync")
+    assert hub.metrics()["overflows"] == 1
+
+    bus.emit([_change(1, "booking.confirmed")])
+    assert (await anext(stream)).startswith("event: booking.confirmed")
+    await stream.aclose()
+
+
+@pytest.mark.asyncio
+async def test_property_events_not_found(client: AsyncClient):
+    response = await client.get("/properties/999/events")
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_bus_resync_tells_every_watcher_to_resync():
+    bus = ChangeBus()
+    hub = PropertyEventHub(bus, queue_size=10)
+    streams = [hub.stream(1, heartbeat=5), hub.stream(2, heartbeat=5)]
+    for stream in streams:
+        await anext(stream)
+
+    # One stream is already waiting for its next event
+    pending = asyncio.create_task(anext(streams[0]))
+    await asyncio.sleep(0)
+
+    bus.resync()
+    assert (await asyncio.wait_for(pending, 1)).startswith("event: resync")
+    assert (await asyncio.wait_for(anext(streams[1]), 1)).startswith("event: resync")
+
+    bus.emit([_change(1)])
+    assert (await anext(streams[0])).startswith("event: booking.created")
+    for stream in streams:
+        await stream.aclose()
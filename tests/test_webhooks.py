@@ -0,0 +1,342 @@
+import json
+import threading
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import httpx
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from app.database import Base
+from app.models import (
+    User,
+    WebhookDeadLetter,
+    WebhookDelivery,
+    WebhookSubscription,
+)
+from app.webhooks import SIGNATURE_HEADER, check_webhook_url, sign, verify
+from app.worker.webhooks import (
+    deliver_due_webhooks,
+    post_webhook,
+    public_transport,
+    retry_delay,
+)
+
+
+class _Receiver(BaseHTTPRequestHandler):
+    status = 200
+    received: list[tuple[dict, bytes]] = []
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.received.append((dict(self.headers), body))
+        self.send_response(self.status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def public_dns():
+    """Resolve every webhook host to a public address without real DNS."""
+    with patch("app.webhooks._resolve", return_value=["93.184.215.14"]):
+        yield
+
+
+@pytest.fixture
+def receiver():
+    _Receiver.status = 200
+    _Receiver.received = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Receiver)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    # The receiver is on loopback, which deliveries normally refuse
+    with patch("app.webhooks.settings.WEBHOOK_ALLOW_PRIVATE_HOSTS", True):
+        yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def sync_db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        host = User(first_name="Host", last_name="One", email="h@x.com", password="x")
+        session.add(host)
+        session.commit()
+        yield session
+
+
+def _subscribe(session: Session, url: str) -> WebhookSubscription:
+    host = session.scalars(select(User)).first()
+    subscription = WebhookSubscription(
+        host_id=host.id,
+        url=url,
+        secret="s3cret",
+        events=["booking.created", "booking.cancelled"],
+    )
+    session.add(subscription)
+    session.flush()
+    for booking_id in (1, 2):
+        session.add(
+            WebhookDelivery(
+                subscription_id=subscription.id,
+                event="booking.created",
+                payload={"booking_id": booking_id, "property_id": 1},
+            )
+        )
+    session.commit()
+    return subscription
+
+
+def test_signature_round_trip():
+    header = sign("s3cret", 1700000000, b'{"events": []}')
+    assert verify("s3cret", header, b'{"events": []}')
+    assert not verify("other", header, b'{"events": []}')
+    assert not verify("s3cret", header, b"{}")
+
+
+def test_retry_delay_is_exponential_and_capped():
+    assert retry_delay(1, 30, 3600) == timedelta(seconds=30)
+    assert retry_delay(3, 30, 3600) == timedelta(seconds=120)
+    assert retry_delay(20, 30, 3600) == timedelta(seconds=3600)
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "http://127.0.0.1/hooks",
+        "http://169.254.169.254/latest/meta-data",
+        "http://10.0.0.5:8080/hooks",
+        "http://[::ffff:192.168.1.1]/hooks",
+        "http://localhost/hooks",
+    ],
+)
+def test_private_webhook_hosts_are_rejected(url):
+    with pytest.raises(ValueError):
+        check_webhook_url(url)
+
+
+def test_post_webhook_rechecks_resolved_address():
+    # The host resolved publicly at subscription time but no longer does
+    with (
+        patch("app.webhooks._resolve", return_value=["10.0.0.5"]),
+        httpx.Client(transport=public_transport()) as client,
+    ):
+        error = post_webhook(client, "https://hooks.example.com/", "s", b"{}")
+    assert "not a public address" in error
+
+
+def test_webhook_connects_to_the_checked_address():
+    # Connecting by name would resolve it again, which a rebinding host can
+    # answer with a private address
+    import httpcore
+
+    connected = []
+
+    def connect_tcp(self, host, port, *args, **kwargs):
+        connected.append((host, port))
+        raise httpcore.ConnectError("unreachable in tests")
+
+    with (
+        patch("app.webhooks._resolve", return_value=["93.184.215.14"]) as resolve,
+        patch("httpcore.SyncBackend.connect_tcp", connect_tcp),
+        httpx.Client(transport=public_transport()) as client,
+    ):
+        error = post_webhook(client, "https://hooks.example.com/", "s", b"{}")
+
+    assert error.startswith("ConnectError")
+    assert connected == [("93.184.215.14", 443)]
+    resolve.assert_called_once_with("hooks.example.com", 443)
+
+
+@pytest.mark.asyncio
+async def test_subscribing_private_url_is_rejected(client: AsyncClient, host_token):
+    response = await client.post(
+        "/webhooks",
+        json={"url": "http://169.254.169.254/latest/meta-data"},
+        headers={"Authorization": f"Bearer {host_token}"},
+    )
+    assert response.status_code == 422
+
+
+def test_deliveries_are_batched_per_endpoint(receiver, sync_db):
+    url = f"http://127.0.0.1:{receiver.server_port}/hooks"
+    _subscribe(sync_db, url)
+
+    with httpx.Client() as client:
+        counts = deliver_due_webhooks(
+            lambda: Session(sync_db.get_bind()), client, datetime.now(), 100, 3
+        )
+
+    assert counts == {"delivered": 2, "retried": 0, "dead": 0}
+    assert len(_Receiver.received) == 1
+    headers, body = _Receiver.received[0]
+    assert verify("s3cret", headers[SIGNATURE_HEADER], body)
+    events = json.loads(body)["events"]
+    assert [event["data"]["booking_id"] for event in events] == [1, 2]
+    assert sync_db.scalars(select(WebhookDelivery)).all() == []
+
+
+def test_failed_deliveries_back_off_then_dead_letter(receiver, sync_db):
+    _Receiver.status = 500
+    url = f"http://127.0.0.1:{receiver.server_port}/hooks"
+    _subscribe(sync_db, url)
+    now = datetime.now()
+
+    def deliver(at):
+        with httpx.Client() as client:
+            return deliver_due_webhooks(
+                lambda: Session(sync_db.get_bind()), client, at, 100, 2
+            )
+
+    assert deliver(now) == {"delivered": 0, "retried": 2, "dead": 0}
+    assert deliver(now) == {"delivered": 0, "retried": 0, "dead": 0}
+
+    sync_db.expire_all()
+    delivery = sync_db.scalars(select(WebhookDelivery)).first()
+    assert delivery.attempts == 1
+    assert delivery.last_error == "HTTP 500"
+
+    assert deliver(delivery.next_attempt_at) == {
+        "delivered": 0,
+        "retried": 0,
+        "dead": 2,
+    }
+    dead = sync_db.scalars(select(WebhookDeadLetter)).all()
+    assert [letter.payload["booking_id"] for letter in dead] == [1, 2]
+    assert sync_db.scalars(select(WebhookDelivery)).all() == []
+
+
+@pytest.mark.asyncio
+async def test_manage_webhook_subscriptions(
+    client: AsyncClient, host_token, customer_token, public_dns
+):
+    headers = {"Authorization": f"Bearer {host_token}"}
+    response = await client.post(
+        "/webhooks",
+        json={"url": "https://channel.example.com/hooks"},
+        headers=headers,
+    )
+    assert response.status_code == 201
+    created = response.json()
+    assert len(created["secret"]) == 64
+    assert created["events"] == ["booking.created", "booking.cancelled"]
+
+    response = await client.get("/webhooks", headers=headers)
+    assert [item["id"] for item in response.json()] == [created["id"]]
+    assert "secret" not in response.json()[0]
+
+    response = await client.post(
+        "/webhooks",
+        json={"url": "https://channel.example.com/hooks"},
+        headers={"Authorization": f"Bearer {customer_token}"},
+    )
+    assert response.status_code == 403
+
+    response = await client.delete(f"/webhooks/{created['id']}", headers=headers)
+    assert response.status_code == 204
+    response = await client.delete(f"/webhooks/{created['id']}", headers=headers)
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_booking_creation_enqueues_webhook_delivery(
+    client: AsyncClient,
+    db_session,
+    test_property,
+    host_token,
+    customer_token,
+    public_dns,
+):
+    await client.post(
+        "/webhooks",
+        json={
+            "url": "https://channel.example.com/hooks",
+            "events": ["booking.created"],
+        },
+        headers={"Authorization": f"Bearer {host_token}"},
+    )
+    response = await client.post(
+        "/bookings",
+        json={
+            "property_id": test_property.id,
+            "guests": 2,
+            "check_in": "2026-11-02",
+            "check_out": "2026-11-05",
+        },
+        headers={"Authorization": f"Bearer {customer_token}"},
+    )
+    assert response.status_code == 201
+
+    deliveries = (await db_session.scalars(select(WebhookDelivery))).all()
+    assert [(d.event, d.payload["booking_id"]) for d in deliveries] == [
+        ("booking.created", response.json()["id"])
+    ]
+
+    await client.delete(
+        f"/bookings/{response.json()['id']}",
+        headers={"Authorization": f"Bearer {customer_token}"},
+    )
+    deliveries = (await db_session.scalars(select(WebhookDelivery))).all()
+    assert len(deliveries) == 1
+
+
+def test_no_transaction_is_open_while_posting(sync_db):
+    _subscribe(sync_db, "https://hooks.example.com/")
+    sessions = []
+
+    def session_factory():
+        session = Session(sync_db.get_bind())
+        sessions.append(session)
+        return session
+
+    def post(client, url, secret, body):
+        assert not any(session.in_transaction() for session in sessions)
+        return None
+
+    with patch("app.worker.webhooks.post_webhook", post), httpx.Client() as client:
+        counts = deliver_due_webhooks(session_factory, client, datetime.now(), 100, 3)
+
+    assert counts == {"delivered": 2, "retried": 0, "dead": 0}
+    assert len(sessions) == 2
+
+
+def test_claimed_deliveries_are_leased_for_webhook_lease():
+    from sqlalchemy.pool import StaticPool
+
+    from app.config import settings
+
+    # Shared across threads: the fake post reads the lease from a worker thread
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(
+            User(first_name="Host", last_name="One", email="h@x.com", password="x")
+        )
+        session.commit()
+        _subscribe(session, "https://hooks.example.com/")
+    now = datetime.now()
+    leased = []
+
+    def post(client, url, secret, body):
+        with Session(engine) as session:
+            leased.extend(
+                session.scalars(select(WebhookDelivery.next_attempt_at)).all()
+            )
+        return None
+
+    with patch("app.worker.webhooks.post_webhook", post), httpx.Client() as client:
+        deliver_due_webhooks(lambda: Session(engine), client, now, 100, 3)
+
+    assert leased == [now + timedelta(seconds=settings.WEBHOOK_LEASE)] * 2
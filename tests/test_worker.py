@@ -0,0 +1,115 @@
+from app.worker.app import app as celery_app
+
+
+def _queue_for(task_name: str) -> str:
+    route = celery_app.amqp.router.route({}, task_name)
+    return route["queue"].name
+
+
+def test_pdf_tasks_are_routed_to_pdf_queue():
+    assert _queue_for("app.celery.tasks.generate_booking_pdf") == "pdf"
+    assert _queue_for("app.celery.tasks.bulk_render_booking_pdfs") == "pdf"
+    assert _queue_for("app.celery.tasks.purge_expired_artifacts") == "pdf"
+
+
+def test_email_tasks_are_routed_to_email_queue():
+    assert _queue_for("app.celery.tasks.send_booking_email") == "email"
+    assert _queue_for("app.celery.tasks.flush_email_batch") == "email"
+    assert _queue_for("app.celery.tasks.notify_cancelled_bookings") == "email"
+
+
+def test_other_tasks_use_default_queue():
+    assert _queue_for("app.celery.tasks.relay_outbox") == "default"
+    assert _queue_for("app.celery.tasks.process_booking_confirmation") == "default"
+
+
+def test_sweep_booking_lifecycle_transitions_in_batches():
+    from datetime import date, datetime, timedelta
+    from unittest.mock import patch
+
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+
+    from app.database import Base
+    from app.models import Booking, BookingStatus, Property, User
+    from app.worker.tasks import sweep_booking_lifecycle
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    today = date.today()
+    with Session(engine) as session:
+        host = User(first_name="Host", last_name="One", email="h@x.com", password="x")
+        session.add(host)
+        session.flush()
+        property = Property(
+            title="Cabin",
+            description="Cabin",
+            address="Road",
+            city="Town",
+            host_id=host.id,
+        )
+        session.add(property)
+        session.flush()
+
+        def booking(status, check_in, check_out, created_at=None):
+            return Booking(
+                property_id=property.id,
+                guest_id=host.id,
+                status=status,
+                check_in=check_in,
+                check_out=check_out,
+                created_at=created_at or datetime.now(),
+            )
+
+        past = [
+            booking(BookingStatus.CONFIRMED, today - timedelta(days=5), today)
+            for _ in range(3)
+        ]
+        future = booking(BookingStatus.CONFIRMED, today, today + timedelta(days=2))
+        stale = booking(
+            BookingStatus.PENDING,
+            today + timedelta(days=3),
+            today + timedelta(days=4),
+            created_at=datetime.now() - timedelta(hours=2),
+        )
+        fresh = booking(
+            BookingStatus.PENDING, today + timedelta(days=5), today + timedelta(days=6)
+        )
+        session.add_all([*past, future, stale, fresh])
+        session.commit()
+        ids = {
+            "past": [b.id for b in past],
+            "future": future.id,
+            "stale": stale.id,
+            "fresh": fresh.id,
+        }
+
+    with (
+        patch("app.database.sync_session", lambda: Session(engine)),
+        patch("app.worker.tasks.settings.BOOKING_SWEEP_BATCH_SIZE", 2),
+    ):
+        assert sweep_booking_lifecycle() == {"completed": 3, "expired": 1}
+
+    with Session(engine) as session:
+        statuses = {b.id: b.status for b in session.query(Booking)}
+    assert {statuses[i] for i in ids["past"]} == {BookingStatus.COMPLETED}
+    assert statuses[ids["future"]] == BookingStatus.CONFIRMED
+    assert statuses[ids["stale"]] == BookingStatus.CANCELLED
+    assert statuses[ids["fresh"]] == BookingStatus.PENDING
+
+
+def test_worker_argv_uses_per_queue_settings():
+    import pytest
+
+    from app.config import settings
+    from app.worker.run import worker_argv
+
+    argv = worker_argv("email")
+    assert "--queues=email" in argv
+    assert f"--pool={settings.EMAIL_WORKER_POOL}" in argv
+    assert f"--concurrency={settings.EMAIL_WORKER_CONCURRENCY}" in argv
+    assert f"--prefetch-multiplier={settings.EMAIL_WORKER_PREFETCH}" in argv
+    assert f"--concurrency={settings.PDF_WORKER_CONCURRENCY}" in worker_argv("pdf")
+
+    with pytest.raises(ValueError):
+        worker_argv("unknown")